@@ -0,0 +1,103 @@
+"""
+Benchmark — page weight and load time with resource blocking on and off.
+
+Loads each listing page with the scraper's CDP block list cleared and then
+applied, with the browser cache disabled, and reads bytes transferred,
+request count and load time from the page's Performance API. Uses the local
+fixture pages by default; pass --live to measure the real search pages.
+
+Usage:
+    python3 benchmarks/bench_blocking.py
+    python3 benchmarks/bench_blocking.py --live --runs 3 --out blocking.json
+
+Install:
+    pip install seleniumbase
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "scraper"))
+
+from blocking import apply_blocking  # noqa: E402
+from fixture_server import serve_fixtures  # noqa: E402
+
+LIVE_URLS = {
+    "linkedin": "https://www.linkedin.com/jobs/search/?keywords=AI+Developer&location=Bangalore",
+    "naukri": "https://www.naukri.com/ai-developer-jobs-in-bangalore",
+}
+
+_PAGE_WEIGHT_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+return {
+  bytes: nav.transferSize + resources.reduce((total, r) => total + r.transferSize, 0),
+  requests: resources.length + 1,
+  load_ms: nav.loadEventEnd - nav.startTime,
+};
+"""
+
+
+def measure(driver, platform, url, blocked, runs):
+    apply_blocking(driver, platform, enabled=blocked)
+    samples = []
+    for _ in range(runs):
+        driver.get("about:blank")
+        driver.get(url)
+        samples.append(driver.execute_script(_PAGE_WEIGHT_JS))
+    return {
+        key: round(statistics.median(s[key] for s in samples), 1)
+        for key in ("bytes", "requests", "load_ms")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--live", action="store_true", help="Measure the real search pages")
+    parser.add_argument("--out", help="Also write results to this file")
+    args = parser.parse_args()
+
+    from seleniumbase import Driver
+
+    server = None
+    if args.live:
+        urls = LIVE_URLS
+    else:
+        server = serve_fixtures()
+        base = f"http://127.0.0.1:{server.server_port}"
+        urls = {p: f"{base}/{p}.html" for p in ("linkedin", "naukri", "indeed")}
+
+    driver = Driver(headless=True)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    results = {}
+
+    try:
+        for platform, url in urls.items():
+            off = measure(driver, platform, url, False, args.runs)
+            on = measure(driver, platform, url, True, args.runs)
+            results[platform] = {
+                "off": off,
+                "on": on,
+                "bytes_saved_pct": round(100 * (1 - on["bytes"] / max(off["bytes"], 1)), 1),
+            }
+            print(f"[{platform}] {results[platform]}", file=sys.stderr)
+    finally:
+        driver.quit()
+        if server:
+            server.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark — bulk vs per-element card extraction.
+
+Serves the saved listing pages in fixtures/ from a local HTTP server, loads
+each one in a headless browser and times both extraction paths, counting the
+WebDriver round trips each one makes. Results go to stdout as JSON.
+
+Usage:
+    python3 benchmarks/bench_extract.py
+    python3 benchmarks/bench_extract.py --runs 50 --out extract.json
+
+Install:
+    pip install seleniumbase
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "scripts"))
+
+from extract_cards import extract_cards_bulk, extract_cards_per_element  # noqa: E402
+from fixture_server import serve_fixtures  # noqa: E402
+
+PLATFORMS = ("linkedin", "naukri", "indeed")
+
+
+def count_round_trips(driver):
+    """Wrap driver.execute so every WebDriver command bumps a counter."""
+    counter = {"n": 0}
+    execute = driver.execute
+
+    def counted(*args, **kwargs):
+        counter["n"] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted
+    return counter
+
+
+def time_path(driver, counter, extract, platform, runs):
+    samples = []
+    counter["n"] = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        cards = extract(driver, platform, 25)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return len(cards), {
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "round_trips": counter["n"] // runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--out", help="Also write results to this file")
+    args = parser.parse_args()
+
+    from seleniumbase import Driver
+
+    server = serve_fixtures()
+    driver = Driver(headless=True)
+    counter = count_round_trips(driver)
+    results = {}
+
+    try:
+        for platform in PLATFORMS:
+            driver.get(f"http://127.0.0.1:{server.server_port}/{platform}.html")
+            cards, bulk = time_path(driver, counter, extract_cards_bulk, platform, args.runs)
+            _, per_element = time_path(
+                driver, counter, extract_cards_per_element, platform, args.runs
+            )
+            results[platform] = {
+                "cards": cards,
+                "bulk": bulk,
+                "per_element": per_element,
+                "speedup": round(per_element["median_ms"] / max(bulk["median_ms"], 0.01), 1),
+            }
+            print(f"[{platform}] {results[platform]}", file=sys.stderr)
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark — browserless HTTP fast path against saved fixture pages.
+
+Serves fixtures/ from a local HTTP server and runs the scraper's HttpEngine
+and parse_cards over each listing page, checking that every fixture card is
+parsed and that the block fixture is detected. Exits non-zero on a mismatch,
+so it doubles as an offline check of the fast path.
+
+Usage:
+    python3 benchmarks/bench_http.py
+    python3 benchmarks/bench_http.py --runs 200 --concurrency 8 --out http.json
+
+Install:
+    pip install -r scraper/requirements.txt
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "scraper"))
+
+from fixture_server import serve_fixtures  # noqa: E402
+from http_engine import HttpEngine, is_block_page, parse_cards  # noqa: E402
+
+PLATFORMS = ("linkedin", "naukri")
+FIXTURE_CARDS = 25
+
+
+async def bench_platform(engine, base, platform, runs, concurrency):
+    url = f"{base}/{platform}.html"
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            status, html = await engine.fetch(url)
+            cards = parse_cards(html, platform, 100, base_url=url)
+            samples.append((time.perf_counter() - started) * 1000)
+            return status, cards
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(runs)))
+    wall = time.perf_counter() - started
+
+    samples.sort()
+    status, cards = results[0]
+    return {
+        "status": status,
+        "cards": len(cards),
+        "complete": sum(all(job.values()) for job in cards),
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "pages_per_sec": round(runs / wall, 1),
+    }
+
+
+async def run(args):
+    server = serve_fixtures()
+    base = f"http://127.0.0.1:{server.server_port}"
+    engine = HttpEngine("bench", max_connections=args.concurrency)
+    results = {}
+    failures = []
+
+    try:
+        for platform in PLATFORMS:
+            result = await bench_platform(engine, base, platform, args.runs, args.concurrency)
+            results[platform] = result
+            print(f"[{platform}] {result}", file=sys.stderr)
+            if result["cards"] != FIXTURE_CARDS:
+                failures.append(f"{platform}: parsed {result['cards']}/{FIXTURE_CARDS} cards")
+
+        status, html = await engine.fetch(f"{base}/blocked.html")
+        results["blocked"] = {"detected": is_block_page(html, status)}
+        if not results["blocked"]["detected"]:
+            failures.append("blocked: block page not detected")
+    finally:
+        await engine.close()
+        server.shutdown()
+
+    return results, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results, failures = asyncio.run(run(args))
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Benchmark — end-to-end scrapers against a local fake job board.
+
+Starts fixture_server as a stand-in for LinkedIn, Naukri and Indeed (with
+optional per-page latency and lazy loading) and points the scrapers at it
+through LINKEDIN_URL / NAUKRI_URL / INDEED_URL, then drives them at each
+concurrency level:
+
+    api      the FastAPI service (scraper/main.py) in a uvicorn subprocess,
+             queried over /scrape-jobs with fresh=true
+    scripts  scripts/scrape_all.py's scrape_all_platforms in a thread pool
+
+and reports requests/sec, p50/p95/p99 latency, errors, the peak RSS of the
+process tree (browsers included) and requests/sec per GB of it. Results are
+JSON tagged with the git commit, so runs can be compared across commits (or
+tab modes) with --compare.
+
+Usage:
+    python3 benchmarks/bench_scrapers.py --engine http --out base.json
+    python3 benchmarks/bench_scrapers.py --concurrency 1,4,8 --latency 0.2 --lazy 10
+    python3 benchmarks/bench_scrapers.py --target both --engine browser --compare base.json
+
+    # throughput per GB: a browser per scrape vs four scrapes per browser
+    python3 benchmarks/bench_scrapers.py --concurrency 4,8 --out browsers.json
+    python3 benchmarks/bench_scrapers.py --concurrency 4,8 --tabs 4 --compare browsers.json
+
+The browser engine and the scripts target need Chrome (see scripts/ and
+scraper/requirements.txt); ``--engine http`` runs the API target without one.
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.join(ROOT, "..", "scraper")
+SCRIPTS_DIR = os.path.join(ROOT, "..", "scripts")
+
+from fixture_server import serve_fixtures  # noqa: E402
+
+TITLES = ("AI Developer", "Data Scientist", "Backend Engineer", "ML Engineer", "DevOps Engineer")
+UNTHROTTLED = {p: {"rate": 1000.0, "burst": 1000} for p in ("linkedin", "naukri")}
+METRICS = (
+    "req_per_sec", "p50_ms", "p95_ms", "p99_ms", "peak_rss_mb", "req_per_sec_per_gb", "errors",
+)
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+def _children() -> dict[int, list[int]]:
+    tree: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # the command name may contain spaces; ppid follows its ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        tree.setdefault(ppid, []).append(int(entry))
+    return tree
+
+
+def tree_rss_mb(pid: int) -> float:
+    """Resident memory of ``pid`` and all of its descendants, in MB."""
+    tree, stack, total = _children(), [pid], 0
+    while stack:
+        current = stack.pop()
+        stack.extend(tree.get(current, ()))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return total / 1024
+
+
+class PeakRss:
+    """Sample a process tree's RSS in the background and keep the maximum."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid, self.interval = pid, interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss_mb(self.pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        else:  # no /proc: fall back to this process's own high-water mark
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted ``samples``."""
+    if not samples:
+        return 0.0
+    rank = int(-(-len(samples) * pct // 100))
+    return samples[max(0, min(len(samples), rank) - 1)]
+
+
+def summarize(concurrency: int, samples: list[float], errors: int, wall: float, rss: float) -> dict:
+    samples.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": errors,
+        "req_per_sec": round(len(samples) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(samples, 50), 1),
+        "p95_ms": round(percentile(samples, 95), 1),
+        "p99_ms": round(percentile(samples, 99), 1),
+        "peak_rss_mb": round(rss, 1),
+        "req_per_sec_per_gb": round(len(samples) / wall / (rss / 1024), 2) if wall and rss else 0.0,
+    }
+
+
+def _query(i: int) -> str:
+    # A distinct title per request, so the cache and single-flight don't
+    # collapse the load into one scrape
+    return f"{TITLES[i % len(TITLES)]} {i}"
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(env: dict) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SCRAPER_DIR, env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base}/health").status_code == 200:
+                return process, base
+        except httpx.TransportError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("API server did not start")
+
+
+async def bench_api(base: str, pid: int, concurrency: int, requests: int, max_results: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+    errors = 0
+
+    async def one(client, i):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.get("/scrape-jobs", params={
+                    "title": _query(i), "location": "Bangalore",
+                    "max_results": max_results, "fresh": "true",
+                })
+                body = response.json()
+                ok = response.status_code == 200 and all(
+                    status["status"] == "ok" for status in body["platforms"].values()
+                )
+            except (httpx.HTTPError, ValueError, KeyError):
+                ok = False
+            samples.append((time.perf_counter() - started) * 1000)
+            errors += not ok
+
+    async with httpx.AsyncClient(base_url=base, timeout=300) as client:
+        with PeakRss(pid) as rss:
+            started = time.perf_counter()
+            await asyncio.gather(*(one(client, i) for i in range(requests)))
+            wall = time.perf_counter() - started
+    return summarize(concurrency, samples, errors, wall, rss.peak)
+
+
+def bench_scripts(scrape_all, concurrency: int, requests: int, max_results: int) -> dict:
+    samples: list[float] = []
+    errors = 0
+
+    def one(i):
+        started = time.perf_counter()
+        jobs = scrape_all(_query(i), "Bangalore", max_results)
+        return (time.perf_counter() - started) * 1000, bool(jobs)
+
+    with PeakRss(os.getpid()) as rss:
+        started = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for future in concurrent.futures.as_completed(
+                [pool.submit(one, i) for i in range(requests)]
+            ):
+                try:
+                    elapsed, ok = future.result()
+                    samples.append(elapsed)
+                    errors += not ok
+                except Exception as e:
+                    print(f"[scripts] Failed: {e}", file=sys.stderr)
+                    errors += 1
+        wall = time.perf_counter() - started
+    return summarize(concurrency, samples, errors, wall, rss.peak)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: dict, baseline: dict):
+    """Print each metric's change against a previous run."""
+    print(f"vs {baseline.get('commit') or 'baseline'}:", file=sys.stderr)
+    for target, rows in results["results"].items():
+        before = {row["concurrency"]: row for row in baseline.get("results", {}).get(target, [])}
+        for row in rows:
+            old = before.get(row["concurrency"])
+            if not old:
+                continue
+            deltas = []
+            for metric in METRICS:
+                if old[metric]:
+                    deltas.append(f"{metric} {(row[metric] - old[metric]) / old[metric]:+.0%}")
+                else:
+                    deltas.append(f"{metric} {old[metric]} -> {row[metric]}")
+            print(f"  [{target} c={row['concurrency']}] " + ", ".join(deltas), file=sys.stderr)
+
+
+def run(args) -> dict:
+    levels = [int(c) for c in args.concurrency.split(",")]
+    targets = ("api", "scripts") if args.target == "both" else (args.target,)
+    board = serve_fixtures(
+        latency=args.latency, jitter=args.jitter, lazy=args.lazy,
+        lazy_delay=args.lazy_delay, total=args.total,
+    )
+    base = f"http://127.0.0.1:{board.server_port}"
+    urls = {"LINKEDIN_URL": base, "NAUKRI_URL": base, "INDEED_URL": base}
+    os.environ.update(urls)
+    results: dict[str, list[dict]] = {}
+
+    try:
+        if "api" in targets:
+            with tempfile.TemporaryDirectory() as tmp:
+                env = {
+                    **os.environ,
+                    "HTTP_ENGINE_PLATFORMS": "linkedin,naukri" if args.engine == "http" else "",
+                    "MAX_BROWSERS": str(max(levels)),
+                    "TABS_PER_BROWSER": str(args.tabs),
+                    "BATCH_DB_PATH": os.path.join(tmp, "batches.db"),
+                    "JOB_STORE_PATH": os.path.join(tmp, "jobs.db"),
+                    # Measure the scraper, not the politeness limits
+                    "RATE_LIMITS": os.getenv("RATE_LIMITS", json.dumps(UNTHROTTLED)),
+                }
+                process, api = start_api(env)
+                try:
+                    for level in levels:
+                        result = asyncio.run(
+                            bench_api(api, process.pid, level, args.requests, args.max_results)
+                        )
+                        results.setdefault("api", []).append(result)
+                        print(f"[api] {result}", file=sys.stderr)
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+
+        if "scripts" in targets:
+            sys.path.insert(0, SCRIPTS_DIR)
+            from scrape_all import scrape_all_platforms
+
+            for level in levels:
+                result = bench_scripts(scrape_all_platforms, level, args.requests, args.max_results)
+                results.setdefault("scripts", []).append(result)
+                print(f"[scripts] {result}", file=sys.stderr)
+    finally:
+        board.shutdown()
+
+    return {
+        "commit": _commit(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--target", choices=("api", "scripts", "both"), default="api")
+    parser.add_argument(
+        "--engine", choices=("http", "browser"), default="browser",
+        help="API engine for LinkedIn and Naukri (scripts always use a browser)",
+    )
+    parser.add_argument(
+        "--tabs", type=int, default=1,
+        help="API scrapes per browser (TABS_PER_BROWSER); 1 is a browser per scrape",
+    )
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma separated levels")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per level")
+    parser.add_argument("--max-results", type=int, default=25)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per listing page")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to")
+    parser.add_argument("--lazy", type=int, default=0, help="Cards rendered before lazy loading")
+    parser.add_argument("--lazy-delay", type=float, default=0.3)
+    parser.add_argument("--total", type=int, default=100, help="Listings per search")
+    parser.add_argument("--out", help="Also write results to this file")
+    parser.add_argument("--compare", help="Print deltas against an earlier --out file")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output)
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
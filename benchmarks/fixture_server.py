@@ -0,0 +1,174 @@
+"""
+Local HTTP server for the saved listing pages in fixtures/.
+
+Paths under /assets/ are synthesized so the pages pull realistic sub-resource
+weight (logos, a web font, a stylesheet and a script) without binary files in
+the repo.
+
+The server also answers the job boards' own search URLs, so the scrapers can
+be pointed at it through LINKEDIN_URL / NAUKRI_URL / INDEED_URL:
+
+    /jobs/search/?keywords=..&start=N                     LinkedIn search
+    /jobs-guest/jobs/api/seeMoreJobPostings/search?start=N  LinkedIn next pages
+    /<title>-jobs-in-<location>[-N]                       Naukri search
+    /jobs?q=..&start=N                                    Indeed search
+
+Every page is built from the platform's fixture, with card IDs rewritten per
+page so pagination sees new listings, and pages past ``total`` cards come
+back empty. ``latency`` (plus up to ``jitter``) delays each listing page, and
+``lazy`` renders only that many cards up front, appending the rest in batches
+of ``lazy`` every ``lazy_delay`` seconds once the page is scrolled near the
+bottom, like the real boards' infinite scroll.
+"""
+
+import functools
+import http.server
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+# extension -> (content type, size in bytes)
+ASSETS = {
+    ".png": ("image/png", 24 * 1024),
+    ".woff2": ("font/woff2", 80 * 1024),
+    ".js": ("application/javascript", 40 * 1024),
+}
+SITE_CSS = b"""
+@font-face { font-family: "Fixture Sans"; src: url("/assets/fixture-sans.woff2") format("woff2"); }
+body { font-family: "Fixture Sans", sans-serif; }
+"""
+
+# platform -> (card start, list close), used to split a fixture into parts
+CARD_MARKERS = {
+    "linkedin": ('<li>\n  <div class="base-card', "</ul>\n<script"),
+    "indeed": ('<li>\n  <div class="cardOutline"', "</ul>\n<script"),
+    "naukri": ('<div class="srp-jobtuple-wrapper"', "</div>\n<script"),
+}
+PAGE_SIZES = {"linkedin": 25, "indeed": 10}
+_NAUKRI_PATH = re.compile(r"^/[\w-]+-jobs-in-[\w-]+?(?:-(\d+))?$")
+_CARD_ID = re.compile(r"(jobs/view/\d+|job-listings-[\w-]+?-\d+|jk=[0-9a-f]+|data-job-id=\"\d+)")
+
+_LAZY_JS = """
+<script>
+(() => {
+  const pending = document.getElementById("lazy-cards");
+  const list = pending.parentNode;
+  const rest = Array.from(pending.content.children);
+  let loading = false;
+  setInterval(() => {
+    if (loading || !rest.length) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 400) return;
+    loading = true;
+    setTimeout(() => {
+      rest.splice(0, %(batch)d).forEach((card) => list.insertBefore(card, pending));
+      loading = false;
+    }, %(delay)d);
+  }, 100);
+})();
+</script>
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _fixture_parts(platform: str) -> tuple[str, list[str], str]:
+    """Split a fixture into (head, cards, tail)."""
+    with open(os.path.join(FIXTURES, f"{platform}.html"), encoding="utf-8") as f:
+        html = f.read()
+    start, close = CARD_MARKERS[platform]
+    first, end = html.index(start), html.rindex(close)
+    cards = [start + card for card in html[first:end].split(start) if card.strip()]
+    return html[:first], cards, html[end:]
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        path, query = parts.path, urllib.parse.parse_qs(parts.query)
+        start = int((query.get("start") or ["0"])[0] or 0)
+
+        if path.startswith("/assets/"):
+            return self._asset(path)
+        if path.rstrip("/") == "/jobs/search":
+            return self._listing("linkedin", start // PAGE_SIZES["linkedin"])
+        if path == "/jobs-guest/jobs/api/seeMoreJobPostings/search":
+            return self._listing("linkedin", start // PAGE_SIZES["linkedin"], fragment=True)
+        if path == "/jobs":
+            return self._listing("indeed", start // PAGE_SIZES["indeed"])
+        match = _NAUKRI_PATH.match(path)
+        if match:
+            return self._listing("naukri", int(match.group(1) or 1) - 1)
+        return super().do_GET()
+
+    def _asset(self, path: str):
+        if path.endswith(".css"):
+            content_type, body = "text/css", SITE_CSS
+        else:
+            content_type, size = ASSETS.get(
+                os.path.splitext(path)[1], ("application/octet-stream", 1024)
+            )
+            body = b"/" * size if content_type.endswith("javascript") else bytes(size)
+        self._send(body, content_type)
+
+    def _listing(self, platform: str, page: int, fragment: bool = False):
+        board = self.server.board
+        head, cards, tail = _fixture_parts(platform)
+        cards = cards[:max(0, board["total"] - page * len(cards))]
+        if page:
+            # Unique IDs per page, so every page holds listings not seen before
+            cards = [
+                _CARD_ID.sub(lambda m: f"{m.group(1)}{page:03d}", card) for card in cards
+            ]
+
+        lazy = board["lazy"]
+        if fragment:
+            html = "".join(cards)
+        elif lazy and len(cards) > lazy:
+            script = _LAZY_JS % {"batch": lazy, "delay": int(board["lazy_delay"] * 1000)}
+            html = (
+                head + "".join(cards[:lazy])
+                + '<template id="lazy-cards">' + "".join(cards[lazy:]) + "</template>\n"
+                + tail.replace("<script", script + "<script", 1)
+            )
+        else:
+            html = head + "".join(cards) + tail
+
+        delay = board["latency"] + random.uniform(0, board["jitter"])
+        if delay:
+            time.sleep(delay)
+        self._send(html.encode(), "text/html; charset=utf-8")
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_fixtures(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    lazy: int = 0,
+    lazy_delay: float = 0.3,
+    total: int = 100,
+):
+    """Serve fixtures/ on an ephemeral localhost port; call .shutdown() when done."""
+    handler = functools.partial(_QuietHandler, directory=FIXTURES)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.board = {
+        "latency": latency, "jitter": jitter, "lazy": lazy,
+        "lazy_delay": lazy_delay, "total": total,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
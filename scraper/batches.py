@@ -0,0 +1,149 @@
+"""
+SQLite-backed queue for asynchronous batch scrapes.
+
+A batch is a list of (title, location, platform, max_results) queries. Each
+query is a row in ``batch_items``; workers claim queued rows one at a time
+and store the finished ScrapeResponse as JSON. Rows left ``running`` by a
+crashed or restarted worker are re-queued on startup, so accepted work is
+never lost. All access happens on the event loop thread; queries are small
+enough to run inline.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL REFERENCES batches(id),
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    result TEXT,
+    error TEXT NOT NULL DEFAULT '',
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS batch_items_status ON batch_items(status, id);
+CREATE INDEX IF NOT EXISTS batch_items_batch ON batch_items(batch_id, position);
+"""
+
+
+class QueueFull(Exception):
+    pass
+
+
+class BatchQueue:
+    def __init__(self, path: str, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        # Work a previous process claimed but never finished goes back in line.
+        self._db.execute(
+            "UPDATE batch_items SET status = 'queued', updated = ? WHERE status = 'running'",
+            (time.time(),),
+        )
+
+    def pending(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM batch_items WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+    def submit(self, queries: list[dict]) -> str:
+        """Enqueue a batch; raises QueueFull if it would exceed ``max_pending``."""
+        if self.pending() + len(queries) > self.max_pending:
+            raise QueueFull(f"batch queue holds at most {self.max_pending} pending queries")
+
+        batch_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute("INSERT INTO batches (id, created) VALUES (?, ?)", (batch_id, now))
+            self._db.executemany(
+                "INSERT INTO batch_items"
+                " (batch_id, position, title, location, platform, max_results, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (batch_id, i, q["title"], q["location"], q["platform"], q["max_results"], now)
+                    for i, q in enumerate(queries)
+                ],
+            )
+        return batch_id
+
+    def claim(self) -> dict | None:
+        """Mark the oldest queued item running and return it, or None."""
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            row = self._db.execute(
+                "SELECT * FROM batch_items WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE batch_items SET status = 'running', updated = ? WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+        return dict(row)
+
+    def complete(self, item_id: int, result: dict):
+        self._db.execute(
+            "UPDATE batch_items SET status = 'done', result = ?, updated = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), item_id),
+        )
+
+    def fail(self, item_id: int, error: str):
+        self._db.execute(
+            "UPDATE batch_items SET status = 'error', error = ?, updated = ? WHERE id = ?",
+            (error, time.time(), item_id),
+        )
+
+    def get(self, batch_id: str) -> dict | None:
+        batch = self._db.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        if batch is None:
+            return None
+
+        rows = self._db.execute(
+            "SELECT * FROM batch_items WHERE batch_id = ? ORDER BY position", (batch_id,)
+        ).fetchall()
+        counts = {"queued": 0, "running": 0, "done": 0, "error": 0}
+        items = []
+        for row in rows:
+            counts[row["status"]] += 1
+            items.append({
+                "title": row["title"],
+                "location": row["location"],
+                "platform": row["platform"],
+                "max_results": row["max_results"],
+                "status": row["status"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"],
+            })
+
+        if counts["queued"] + counts["running"] == 0:
+            status = "done"
+        elif counts["queued"] == len(rows):
+            status = "queued"
+        else:
+            status = "running"
+
+        return {
+            "batch_id": batch_id,
+            "status": status,
+            "created": batch["created"],
+            "total": len(rows),
+            **counts,
+            "items": items,
+        }
+
+    def close(self):
+        self._db.close()
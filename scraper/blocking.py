@@ -0,0 +1,70 @@
+"""
+Resource blocking for scraper browsers via CDP Network.setBlockedURLs.
+
+Listing cards only need HTML, CSS and scripts, so images, fonts, media and
+analytics are blocked by default. Each platform picks the categories it
+blocks, may ``allow`` individual patterns back in, and may ``deny`` extra
+patterns. Overrides come from the RESOURCE_POLICIES env var, e.g.
+'{"naukri": {"allow": ["*.svg"], "deny": ["*chatbot*"]}}'.
+
+Blocking is applied per lease because pooled drivers are shared across
+platforms; applying an empty list clears the previous platform's rules.
+"""
+
+import json
+import os
+import sys
+
+CATEGORIES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+    "trackers": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*clarity.ms*",
+        "*px.ads.linkedin.com*",
+        "*snap.licdn.com*",
+        "*bat.bing.com*",
+        "*scorecardresearch.com*",
+        "*newrelic.com*",
+        "*nr-data.net*",
+    ],
+}
+
+DEFAULT_BLOCK = ("images", "fonts", "media", "trackers")
+
+
+def _default_policy() -> dict:
+    return {"block": DEFAULT_BLOCK, "allow": [], "deny": []}
+
+
+RESOURCE_POLICIES = {
+    "linkedin": _default_policy(),
+    "naukri": _default_policy(),
+}
+for _platform, _overrides in json.loads(os.getenv("RESOURCE_POLICIES", "{}")).items():
+    RESOURCE_POLICIES.setdefault(_platform, _default_policy()).update(_overrides)
+
+
+def blocked_patterns(platform: str) -> list[str]:
+    policy = RESOURCE_POLICIES.get(platform) or _default_policy()
+    allow = set(policy["allow"])
+    patterns = [p for category in policy["block"] for p in CATEGORIES[category]]
+    return [p for p in patterns + list(policy["deny"]) if p not in allow]
+
+
+def apply_blocking(driver, platform: str, enabled: bool = True) -> bool:
+    """Install (or clear) the platform's URL block list on ``driver``."""
+    patterns = blocked_patterns(platform) if enabled else []
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except Exception as e:
+        print(f"[{platform}] Resource blocking unavailable: {e}", file=sys.stderr)
+        return False
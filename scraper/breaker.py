@@ -0,0 +1,133 @@
+"""
+Per-platform request rate limiting and circuit breaking.
+
+``TokenBucket`` spaces out page loads to one job board: ``reserve`` takes a
+token and returns how long the caller must sleep before using it, so both
+executor threads (time.sleep) and the event loop (asyncio.sleep) can share
+one bucket.
+
+``CircuitBreaker`` stops scraping a board that is blocking us. After
+``threshold`` consecutive failed scrapes (blocked, empty, timed out or
+errored) it opens and ``allow`` refuses scrapes for ``open_seconds``. Then
+it goes half-open and lets a single probe through: success closes it,
+failure reopens it for twice as long (up to ``max_open_seconds``). A probe
+that never reports back, e.g. because it was shed or cancelled, is
+replaced after ``probe_timeout``. The breaker is only touched from the
+event loop.
+"""
+
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.delayed = 0
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before it is valid."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self.delayed += 1
+            return -self._tokens / self.rate
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": self.rate, "burst": self.burst, "delayed": self.delayed}
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        threshold: int = 3,
+        open_seconds: float = 60.0,
+        max_open_seconds: float = 900.0,
+        probe_timeout: float = 120.0,
+    ):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_timeout = probe_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.last_failure = ""
+        self._open_for = open_seconds
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+
+        self.trips = 0
+        self.rejected = 0
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a probe through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_for - time.monotonic())
+
+    def allow(self, claim: bool = True) -> bool:
+        """
+        Whether a scrape may run now. In half-open state the first caller
+        becomes the probe; pass ``claim=False`` to ask without claiming.
+        """
+        now = time.monotonic()
+        if self.state == OPEN and now >= self._opened_at + self._open_for:
+            self.state = HALF_OPEN
+            self._probe_started = None
+        if self.state == HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.probe_timeout
+        ):
+            if claim:
+                self._probe_started = now
+            return True
+        if self.state == CLOSED:
+            return True
+        if claim:
+            self.rejected += 1
+        return False
+
+    def record(self, ok: bool, reason: str = ""):
+        if ok:
+            self.state, self.failures = CLOSED, 0
+            self._open_for = self.open_seconds
+            self._probe_started = None
+            return
+
+        self.failures += 1
+        self.last_failure = reason
+        if self.state == HALF_OPEN:
+            self._open(min(self.max_open_seconds, self._open_for * 2))
+        elif self.state == CLOSED and self.failures >= self.threshold:
+            self._open(self.open_seconds)
+
+    def _open(self, seconds: float):
+        self.state = OPEN
+        self._open_for = seconds
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        self.trips += 1
+
+    def stats(self) -> dict:
+        self.allow(claim=False)  # move an expired open breaker to half-open
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "last_failure": self.last_failure,
+            "retry_after": round(self.retry_after(), 1),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
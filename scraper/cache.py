@@ -0,0 +1,143 @@
+"""
+In-process TTL + LRU cache for per-platform scrape results.
+
+Entries are keyed on the normalized query (platform, title, location and the
+max_results bucket). Any entry for the query at least as large as the
+request serves it, sliced down by the caller. An entry younger than ``ttl``
+is fresh; between ``ttl`` and ``ttl + stale_ttl`` it is stale and may be
+served while a background refresh runs; older entries are dropped.
+Filtered queries over an entry use a JobIndex built on first use and kept
+with the entry until it is replaced. The cache is only touched from the
+event loop, so it needs no locking.
+"""
+
+import time
+from collections import OrderedDict
+
+from fields import JobIndex
+
+# Scrapes are run at the bucket size so one entry serves every smaller request.
+# Above the last bucket, sizes round up to a multiple of LARGE_BUCKET.
+RESULT_BUCKETS = (10, 25, 50, 100)
+LARGE_BUCKET = 100
+
+FRESH = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def results_bucket(max_results: int) -> int:
+    for bucket in RESULT_BUCKETS:
+        if max_results <= bucket:
+            return bucket
+    return -(-max_results // LARGE_BUCKET) * LARGE_BUCKET
+
+
+def query_key(platform: str, title: str, location: str, bucket: int) -> tuple:
+    return (platform, normalize(title), normalize(location), bucket)
+
+
+class ResultCache:
+    def __init__(self, ttl: float = 900.0, stale_ttl: float = 3600.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, list[dict], JobIndex | None]] = OrderedDict()
+        self._refreshing: set[tuple] = set()
+        # (platform, title, location) -> bucket sizes cached for it
+        self._sizes: dict[tuple, set[int]] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.indexed = 0
+
+    def lookup(
+        self, platform: str, title: str, location: str, max_results: int,
+        max_age: float | None = None,
+    ) -> tuple[str, tuple, list[dict]]:
+        """
+        Find the best entry for a query: the smallest usable one of at least
+        ``max_results``. Returns (state, key, jobs); on a miss ``key`` is the
+        key the fresh result should be stored under.
+        """
+        own_key = query_key(platform, title, location, results_bucket(max_results))
+        query = own_key[:-1]
+        now = time.monotonic()
+
+        for bucket in sorted(b for b in self._sizes.get(query, ()) if b >= max_results):
+            key = query + (bucket,)
+            stored_at, jobs, _ = self._entries[key]
+            age = now - stored_at
+            if age >= self.ttl + self.stale_ttl:
+                self._drop(key)
+                continue
+            if max_age is not None and age > max_age:
+                continue
+
+            self._entries.move_to_end(key)
+            if age < self.ttl or max_age is not None:
+                self.hits += 1
+                return FRESH, key, jobs
+            self.stale_hits += 1
+            return STALE, key, jobs
+
+        self.misses += 1
+        return MISS, own_key, []
+
+    def put(self, key: tuple, jobs: list[dict]):
+        self._entries[key] = (time.monotonic(), jobs, None)
+        self._entries.move_to_end(key)
+        self._sizes.setdefault(key[:-1], set()).add(key[-1])
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: tuple):
+        del self._entries[key]
+        sizes = self._sizes[key[:-1]]
+        sizes.discard(key[-1])
+        if not sizes:
+            del self._sizes[key[:-1]]
+
+    def index(self, key: tuple) -> JobIndex | None:
+        """The JobIndex over ``key``'s listings; None if it is not cached."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, jobs, index = entry
+        if index is None:
+            index = JobIndex(jobs)
+            self._entries[key] = (stored_at, jobs, index)
+            self.indexed += 1
+        return index
+
+    def begin_refresh(self, key: tuple) -> bool:
+        """Claim the background refresh for ``key``; False if one is running."""
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        self.refreshes += 1
+        return True
+
+    def end_refresh(self, key: tuple):
+        self._refreshing.discard(key)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refreshing": len(self._refreshing),
+            "indexed": self.indexed,
+        }
@@ -0,0 +1,68 @@
+"""
+Single-flight coalescing of identical in-flight scrapes.
+
+Concurrent callers asking for the same key share one running task. Each
+flight is tagged with a size (the max_results bucket it scrapes); a caller
+joins any flight at least as large as it needs. A larger caller may wait on
+a smaller flight and reuse its result only if ``covers`` says the result is
+already complete, e.g. the listing ran out before the smaller limit.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: dict[tuple, dict[int, asyncio.Task]] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.upgraded = 0
+
+    async def run(
+        self,
+        key: tuple,
+        size: int,
+        factory: Callable[[], Awaitable[Any]],
+        covers: Callable[[Any, int, int], bool],
+    ) -> Any:
+        while True:
+            flights = self._flights.get(key, {})
+            larger = [s for s in flights if s >= size]
+            if larger:
+                self.coalesced += 1
+                return await asyncio.shield(flights[min(larger)])
+            if not flights:
+                break
+
+            smaller = max(flights)
+            try:
+                result = await asyncio.shield(flights[smaller])
+            except Exception:
+                continue
+            if covers(result, smaller, size):
+                self.coalesced += 1
+                self.upgraded += 1
+                return result
+
+        # Shielded so a disconnecting leader does not cancel work others share.
+        task = asyncio.ensure_future(factory())
+        self._flights.setdefault(key, {})[size] = task
+        self.leaders += 1
+        task.add_done_callback(lambda _: self._forget(key, size, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: tuple, size: int, task: asyncio.Task):
+        flights = self._flights.get(key)
+        if flights and flights.get(size) is task:
+            del flights[size]
+            if not flights:
+                del self._flights[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": sum(len(f) for f in self._flights.values()),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "upgraded": self.upgraded,
+        }
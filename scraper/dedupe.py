@@ -0,0 +1,227 @@
+"""
+Cross-platform deduplication of job listings.
+
+The same posting often shows up on several boards with slightly different
+text ("Sr. AI Developer" at "Acme Technologies Pvt Ltd", Bengaluru vs
+"Senior AI Developer" at "ACME Technologies", Bangalore). Listings are
+normalized, then MinHash signatures over title and company tokens are
+bucketed by LSH bands, so each new listing is compared only against the
+few earlier listings that share a band instead of all of them. A
+candidate is a duplicate when its title tokens overlap by at least
+``THRESHOLD`` (Jaccard), both name the same company, and it shares a city
+(or either side names none). Two listings from the same board are only the
+same posting when their canonical URLs match; a board doesn't list one
+posting twice under different URLs.
+
+Each group collapses into its first listing, with a ``sources`` list of
+every (source, url) it was seen under and salary, experience and posted
+filled in from whichever listing has them.
+"""
+
+import hashlib
+import re
+import urllib.parse
+
+NUM_PERM = 32
+BANDS = 8  # NUM_PERM / BANDS rows per band
+THRESHOLD = 0.75
+
+_MERSENNE = (1 << 61) - 1
+_PERMS = [
+    (
+        int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest()) % _MERSENNE | 1,
+        int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest()) % _MERSENNE,
+    )
+    for i in range(NUM_PERM)
+]
+
+# Query parameters that identify a posting rather than track a click.
+KEEP_PARAMS = {"jk", "vjk", "currentJobId"}
+
+_NON_WORD = re.compile(r"[^\w]+")
+_LOCATION_SPLIT = re.compile(r"[,/|;()]|\s-\s|\bor\b|\band\b")
+
+TITLE_ALIASES = {
+    "sr": "senior",
+    "jr": "junior",
+    "snr": "senior",
+    "engg": "engineer",
+    "eng": "engineer",
+    "dev": "developer",
+    "mgr": "manager",
+    "ml": "machine learning",
+}
+COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "llp", "llc", "inc", "incorporated",
+    "corp", "corporation", "co", "company", "plc", "gmbh", "pte", "sa", "ag",
+}
+CITY_ALIASES = {
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "bombay": "mumbai",
+    "navi mumbai": "mumbai",
+    "new delhi": "delhi",
+    "delhi ncr": "delhi",
+    "madras": "chennai",
+    "calcutta": "kolkata",
+    "thiruvananthapuram": "trivandrum",
+    "kochi": "cochin",
+    "mysuru": "mysore",
+    "vizag": "visakhapatnam",
+}
+# Location parts that say nothing about the city.
+LOCATION_NOISE = {
+    "india", "in", "remote", "hybrid", "on site", "onsite", "work from home",
+    "karnataka", "maharashtra", "tamil nadu", "telangana", "haryana",
+    "uttar pradesh", "west bengal", "kerala", "gujarat",
+}
+# Words LinkedIn wraps around city names ("Greater Bengaluru Area").
+LOCATION_FILLER = {"greater", "area", "metropolitan", "region"}
+# Text fields with their parsed counterparts (see fields.structure)
+MERGE_FIELDS = (
+    "salary", "experience", "posted",
+    "salary_min", "salary_max", "exp_min", "exp_max", "posted_at",
+)
+
+
+def canonical_url(url: str) -> str:
+    parts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.urlencode(
+        [(k, v) for k, v in urllib.parse.parse_qsl(parts.query) if k in KEEP_PARAMS]
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, query, "")
+    )
+
+
+def _words(text: str) -> list[str]:
+    return _NON_WORD.sub(" ", text.lower()).split()
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(TITLE_ALIASES.get(w, w) for w in _words(title))
+
+
+def normalize_company(company: str) -> str:
+    words = _words(company)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def normalize_location(location: str) -> frozenset[str]:
+    """The set of canonical cities a location string names."""
+    cities = set()
+    for part in _LOCATION_SPLIT.split(location.lower()):
+        part = " ".join(w for w in _words(part) if w not in LOCATION_FILLER)
+        if part and part not in LOCATION_NOISE:
+            cities.add(CITY_ALIASES.get(part, part))
+    return frozenset(cities)
+
+
+def _same_company(a: str, b: str) -> bool:
+    # "acme" and "acme technologies" are the same employer; "acme" and "apex" are not.
+    # A listing without a company can't be told apart from any other.
+    if not a or not b:
+        return False
+    a_words, b_words = set(a.split()), set(b.split())
+    return a_words <= b_words or b_words <= a_words
+
+
+def _tokens(title: str, company: str) -> set[str]:
+    return {f"t:{w}" for w in title.split()} | {f"c:{w}" for w in company.split()}
+
+
+def _signature(tokens: set[str]) -> tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest())
+        for t in tokens
+    ] or [0]
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS)
+
+
+def _bands(signature: tuple[int, ...]) -> list[tuple]:
+    rows = NUM_PERM // BANDS
+    return [(i, signature[i * rows:(i + 1) * rows]) for i in range(BANDS)]
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class Deduper:
+    """
+    Incremental dedupe: ``add`` each listing as it arrives; ``jobs`` holds
+    the merged records in first-seen order.
+    """
+
+    def __init__(self, threshold: float = THRESHOLD):
+        self.threshold = threshold
+        self.jobs: list[dict] = []
+        self._urls: dict[str, int] = {}
+        self._keys: list[tuple] = []  # (title words, company, cities) per record
+        self._buckets: dict[tuple, list[int]] = {}
+
+    def _match(self, signature, words, company, cities, source) -> int | None:
+        candidates = {i for band in _bands(signature) for i in self._buckets.get(band, ())}
+        best, best_score = None, 0.0
+        for i in sorted(candidates):
+            other_words, other_company, other_cities = self._keys[i]
+            if not _same_company(company, other_company):
+                continue
+            # Same-board listings under the same URL were found by add's URL lookup
+            if any(s["source"] == source for s in self.jobs[i]["sources"]):
+                continue
+            if cities and other_cities and not cities & other_cities:
+                continue
+            score = _jaccard(words, other_words)
+            if score >= self.threshold and score > best_score:
+                best, best_score = i, score
+        return best
+
+    def add(self, job: dict) -> bool:
+        """Add a listing; returns True if it started a new record."""
+        url = job.get("url", "")
+        source = job.get("source", "")
+        canonical = canonical_url(url) if url else ""
+        index = self._urls.get(canonical) if canonical else None
+
+        if index is None:
+            title = normalize_title(job.get("title", ""))
+            company = normalize_company(job.get("company", ""))
+            cities = normalize_location(job.get("location", ""))
+            words = frozenset(title.split())
+            signature = _signature(_tokens(title, company))
+            index = self._match(signature, words, company, cities, source)
+
+        if index is None:
+            record = dict(job)
+            record["sources"] = [{"source": source, "url": url}]
+            index = len(self.jobs)
+            self.jobs.append(record)
+            self._keys.append((words, company, cities))
+            for band in _bands(signature):
+                self._buckets.setdefault(band, []).append(index)
+            if canonical:
+                self._urls[canonical] = index
+            return True
+
+        record = self.jobs[index]
+        if not any(s["url"] == url and s["source"] == source for s in record["sources"]):
+            record["sources"].append({"source": source, "url": url})
+        for field in MERGE_FIELDS:
+            # 0 years of experience is a value, not a gap
+            if record.get(field) in (None, "") and job.get(field) not in (None, ""):
+                record[field] = job[field]
+        if canonical:
+            self._urls[canonical] = index
+        return False
+
+
+def dedupe_jobs(jobs: list[dict], threshold: float = THRESHOLD) -> list[dict]:
+    """Merge near-duplicate listings; returns the merged records in order."""
+    deduper = Deduper(threshold)
+    for job in jobs:
+        deduper.add(job)
+    return deduper.jobs
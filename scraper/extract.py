@@ -0,0 +1,198 @@
+"""
+Card extraction driven by a declarative per-platform selector map.
+
+Each platform names a card selector and, per field, a CSS selector (comma
+separated fallbacks allowed) plus the properties to read in order, where
+"text" means the rendered text. ``extract_cards`` reads every card in a
+single execute_script round trip; if that fails it falls back to the
+per-element WebDriver path driven by the same map. The API and the
+standalone scripts in ../scripts both use this module.
+
+``wait_for_cards`` replaces fixed sleeps: it polls the card count (scrolling,
+and clicking the platform's "see more" button if it has one, to trigger lazy
+loading) until there are enough cards, the count stops growing, or the
+platform's deadline passes. Policies can be overridden with
+the WAIT_POLICIES env var, e.g. '{"naukri": {"timeout": 15}}'.
+
+``FINISHERS`` turn a platform's extracted cards into listings (source,
+canonical URLs, parsed fields), whether the page came from a browser, the
+HTTP path or a replayed snapshot.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+
+from fields import structure
+
+SELECTORS = {
+    "linkedin": {
+        "card": ".base-card",
+        "more": "button.infinite-scroller__show-more-button",
+        "fields": {
+            "title": (".base-search-card__title", ("text",)),
+            "company": (".base-search-card__subtitle", ("text",)),
+            "location": (".job-search-card__location", ("text",)),
+            "url": ("a.base-card__full-link", ("href",)),
+            "posted": ("time", ("datetime", "text")),
+        },
+    },
+    "naukri": {
+        "card": ".srp-jobtuple-wrapper, .jobTuple",
+        "fields": {
+            "title": (".title, a.title", ("text",)),
+            "url": (".title, a.title", ("href",)),
+            "company": (".comp-name, .subTitle a", ("text",)),
+            "location": (".locWdth, .loc-wrap .loc", ("text",)),
+            "experience": (".exp-wrap .expwdth, .experience", ("text",)),
+            "salary": (".sal-wrap .salwdth, .salary", ("text",)),
+            "posted": (".job-post-day, .jobTupleFooter .type span", ("text",)),
+        },
+    },
+    "indeed": {
+        "card": ".job_seen_beacon, .resultContent",
+        "fields": {
+            "title": ("h2.jobTitle a, .jobTitle span", ("text",)),
+            "company": ("[data-testid='company-name'], .companyName", ("text",)),
+            "location": ("[data-testid='text-location'], .companyLocation", ("text",)),
+            "url": ("h2.jobTitle a, a.jcs-JobTitle", ("href",)),
+            "snippet": (".job-snippet, [data-testid='job-snippet']", ("text",)),
+        },
+    },
+}
+
+# timeout: hard deadline; settle: seconds without new cards (after a scroll)
+# before giving up on reaching the target; poll: seconds between checks.
+WAIT_POLICIES = {
+    "linkedin": {"timeout": 10.0, "settle": 1.5, "poll": 0.5, "scroll_px": 800},
+    "naukri": {"timeout": 12.0, "settle": 1.5, "poll": 0.5, "scroll_px": 600},
+    "indeed": {"timeout": 12.0, "settle": 1.5, "poll": 0.5, "scroll_px": 600},
+}
+for _platform, _overrides in json.loads(os.getenv("WAIT_POLICIES", "{}")).items():
+    WAIT_POLICIES.setdefault(_platform, {}).update(_overrides)
+
+_COUNT_AND_SCROLL_JS = """
+const [cardSelector, target, scrollPx, moreSelector] = arguments;
+const count = document.querySelectorAll(cardSelector).length;
+if (count && count < target) {
+  window.scrollBy(0, scrollPx);
+  const more = moreSelector && document.querySelector(moreSelector);
+  if (more && more.offsetParent !== null && !more.disabled) more.click();
+}
+return count;
+"""
+
+_BULK_JS = """
+const [cardSelector, fields, limit] = arguments;
+const cards = Array.from(document.querySelectorAll(cardSelector)).slice(0, limit);
+return JSON.stringify(cards.map((card) => {
+  const job = {};
+  for (const [name, [selector, props]] of Object.entries(fields)) {
+    const el = card.querySelector(selector);
+    let value = "";
+    if (el) {
+      for (const prop of props) {
+        value = prop === "text" ? el.innerText
+          : (typeof el[prop] === "string" ? el[prop] : el.getAttribute(prop));
+        if (value) break;
+      }
+    }
+    job[name] = (value || "").trim();
+  }
+  return job;
+}));
+"""
+
+
+def wait_for_cards(driver, platform: str, target: int, cancel=None) -> tuple[int, float]:
+    """
+    Wait until ``target`` cards exist, loading stalls, the deadline passes,
+    or ``cancel`` (a threading.Event) is set.
+    Returns the last card count and the seconds spent waiting.
+    """
+    policy = WAIT_POLICIES[platform]
+    selector = SELECTORS[platform]["card"]
+    started = time.monotonic()
+    deadline = started + policy["timeout"]
+    last_count, last_change, scrolled = -1, started, False
+
+    while True:
+        count = driver.execute_script(
+            _COUNT_AND_SCROLL_JS, selector, target, policy["scroll_px"],
+            SELECTORS[platform].get("more", ""),
+        )
+        now = time.monotonic()
+        if count >= target or now >= deadline:
+            break
+        if cancel is not None and cancel.is_set():
+            break
+        if count != last_count:
+            last_count, last_change, scrolled = count, now, False
+        elif scrolled and now - last_change >= policy["settle"]:
+            break
+        scrolled = scrolled or count > 0
+        time.sleep(policy["poll"])
+
+    return count, time.monotonic() - started
+
+
+def extract_cards_bulk(driver, platform: str, limit: int) -> list[dict]:
+    spec = SELECTORS[platform]
+    return json.loads(driver.execute_script(_BULK_JS, spec["card"], spec["fields"], limit))
+
+
+def extract_cards_per_element(driver, platform: str, limit: int) -> list[dict]:
+    """One WebDriver round trip per field; slow, but tolerant of script failures."""
+    spec = SELECTORS[platform]
+    jobs = []
+
+    for card in driver.find_elements("css selector", spec["card"])[:limit]:
+        job = {}
+        for name, (selector, props) in spec["fields"].items():
+            value = ""
+            try:
+                el = card.find_element("css selector", selector)
+                for prop in props:
+                    value = el.text if prop == "text" else el.get_attribute(prop)
+                    if value:
+                        break
+            except Exception:
+                pass
+            job[name] = (value or "").strip()
+        jobs.append(job)
+
+    return jobs
+
+
+def extract_cards(driver, platform: str, limit: int) -> list[dict]:
+    try:
+        return extract_cards_bulk(driver, platform, limit)
+    except Exception as e:
+        print(f"[{platform}] Bulk extraction failed, falling back: {e}", file=sys.stderr)
+        # A shared-browser tab (see tabs.py) must stay current while its elements are read
+        with getattr(driver, "exclusive", contextlib.nullcontext)():
+            return extract_cards_per_element(driver, platform, limit)
+
+
+def finish_linkedin(cards: list[dict], now: float | None = None) -> list[dict]:
+    jobs = []
+    for job in cards:
+        job["url"] = job["url"].split("?")[0]
+        job.update(source="linkedin", salary="", experience="")
+        if job["title"]:
+            jobs.append(structure(job, now))
+    return jobs
+
+
+def finish_naukri(cards: list[dict], now: float | None = None) -> list[dict]:
+    jobs = []
+    for job in cards:
+        job["source"] = "naukri"
+        if job["title"]:
+            jobs.append(structure(job, now))
+    return jobs
+
+
+FINISHERS = {"linkedin": finish_linkedin, "naukri": finish_naukri}
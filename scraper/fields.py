@@ -0,0 +1,227 @@
+"""
+Numeric salary, experience and posted fields parsed from listing text.
+
+Boards give these as free text ("₹ 10-15 Lacs PA", "5-10 Yrs", "3 days
+ago"). ``structure`` adds numeric ranges next to the text, using
+precompiled patterns and memoized parsers, since the same few strings
+repeat across thousands of listings:
+
+    salary_min / salary_max   INR per year
+    exp_min / exp_max         years (exp_max is None for "5+ years")
+    posted_at                 epoch seconds (relative dates count from the scrape)
+
+Fields that can't be parsed are None. ``JobIndex`` keeps a result list's
+listings sorted by each numeric field, so filters and sorts over a cached
+result are bisects instead of full scans.
+"""
+
+import bisect
+import functools
+import math
+import re
+import time
+from datetime import datetime, timezone
+
+_NUMBER = r"(\d+(?:,\d+)*(?:\.\d+)?)"
+_SALARY_AMOUNT = re.compile(
+    _NUMBER + r"\s*(k|l|lpa|lakhs?|lacs?|cr|crores?)?\b", re.IGNORECASE
+)
+_SALARY_UNITS = {
+    "k": 1e3, "l": 1e5, "lpa": 1e5, "lakh": 1e5, "lakhs": 1e5, "lac": 1e5, "lacs": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+}
+_SALARY_PERIODS = [
+    (re.compile(r"\b(?:per\s+|a\s+|/\s*)?(?:hour|hr)\b", re.IGNORECASE), 2080),
+    (re.compile(r"\b(?:per\s+|a\s+|/\s*)?day\b", re.IGNORECASE), 260),
+    (re.compile(r"\b(?:per\s+|a\s+|/\s*)?week\b", re.IGNORECASE), 52),
+    (re.compile(r"\b(?:per\s+|a\s+|/\s*)?(?:month|mon|pm)\b|p\.m\.", re.IGNORECASE), 12),
+]
+_OTHER_CURRENCY = re.compile(r"[$€£]|\b(?:usd|eur|gbp)\b", re.IGNORECASE)
+
+_EXP_RANGE = re.compile(_NUMBER + r"\s*(?:-|–|to)\s*" + _NUMBER)
+_EXP_PLUS = re.compile(_NUMBER + r"\s*\+")
+_EXP_SINGLE = re.compile(_NUMBER + r"\s*(?:yrs?|years?)", re.IGNORECASE)
+_FRESHER = re.compile(r"\bfreshers?\b", re.IGNORECASE)
+
+_AGO = re.compile(
+    r"(\d+|an?)\+?\s*(minute|min|hour|hr|day|week|month|year)s?\b", re.IGNORECASE
+)
+_AGO_SECONDS = {
+    "minute": 60, "min": 60, "hour": 3600, "hr": 3600, "day": 86400,
+    "week": 7 * 86400, "month": 30 * 86400, "year": 365 * 86400,
+}
+_JUST_NOW = re.compile(r"just now|today|moments? ago|few (?:minutes|hours) ago", re.IGNORECASE)
+_YESTERDAY = re.compile(r"yesterday", re.IGNORECASE)
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", ""))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_salary(text: str) -> tuple[int | None, int | None]:
+    """INR per year as (min, max); (None, None) if undisclosed or not INR."""
+    if not text or _OTHER_CURRENCY.search(text):
+        return None, None
+    amounts = _SALARY_AMOUNT.findall(text)[:2]
+    if not amounts:
+        return None, None
+    # "10-15 Lacs": a unit on the last number applies to the ones before it
+    last_unit = amounts[-1][1].lower()
+    values = [_number(n) * _SALARY_UNITS.get((unit or last_unit).lower(), 1) for n, unit in amounts]
+    per_year = next((factor for pattern, factor in _SALARY_PERIODS if pattern.search(text)), 1)
+    values = [int(v * per_year) for v in values]
+    return min(values), max(values)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_experience(text: str) -> tuple[float | None, float | None]:
+    """Years as (min, max); max is None for open ranges like "5+ years"."""
+    if not text:
+        return None, None
+    if match := _EXP_RANGE.search(text):
+        low, high = _number(match[1]), _number(match[2])
+        return min(low, high), max(low, high)
+    if match := _EXP_PLUS.search(text):
+        return _number(match[1]), None
+    if match := _EXP_SINGLE.search(text):
+        return _number(match[1]), _number(match[1])
+    if _FRESHER.search(text):
+        return 0.0, 0.0
+    return None, None
+
+
+@functools.lru_cache(maxsize=1024)
+def _posted_offset(text: str) -> float | None:
+    """Seconds before the scrape that a relative date ("3 days ago") means."""
+    if _JUST_NOW.search(text):
+        return 0.0
+    if _YESTERDAY.search(text):
+        return 86400.0
+    if match := _AGO.search(text):
+        count = 1 if match[1].lower() in ("a", "an") else int(match[1])
+        return float(count * _AGO_SECONDS[match[2].lower()])
+    return None
+
+
+def parse_posted(text: str, now: float | None = None) -> float | None:
+    """Epoch seconds for an ISO date/datetime or a relative date, else None."""
+    if not text:
+        return None
+    if _ISO_DATE.match(text):
+        try:
+            posted = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if posted.tzinfo is None:
+            posted = posted.replace(tzinfo=timezone.utc)
+        return posted.timestamp()
+    offset = _posted_offset(text)
+    if offset is None:
+        return None
+    return (time.time() if now is None else now) - offset
+
+
+def posted_date(job: dict, now: float | None = None) -> str:
+    """
+    ``job``'s posted date as YYYY-MM-DD, from posted_at or else its posted
+    text, so relative and ISO dates compare as strings; "" if unknown.
+    """
+    posted_at = job.get("posted_at")
+    if posted_at is None:
+        posted_at = parse_posted(job.get("posted", ""), now)
+    return "" if posted_at is None else time.strftime("%Y-%m-%d", time.gmtime(posted_at))
+
+
+def structure(job: dict, now: float | None = None) -> dict:
+    """Add the numeric fields to ``job`` (in place) and return it."""
+    job["salary_min"], job["salary_max"] = parse_salary(job.get("salary", ""))
+    job["exp_min"], job["exp_max"] = parse_experience(job.get("experience", ""))
+    job["posted_at"] = parse_posted(job.get("posted", ""), now)
+    return job
+
+
+def parse_exp_range(text: str) -> tuple[float, float]:
+    """Parse an exp_range filter: "2-5", "3" (exactly) or "3-" (3 or more)."""
+    low, sep, high = text.partition("-")
+    error = ValueError(f"exp_range must look like 2-5, 3 or 3-, not {text!r}")
+    try:
+        low_value = float(low) if low.strip() else 0.0
+        high_value = float(high) if high.strip() else (float("inf") if sep else low_value)
+    except ValueError:
+        raise error from None
+    # float() also takes "nan" and "inf"; only an omitted maximum is open-ended
+    if not math.isfinite(low_value) or (high.strip() and not math.isfinite(high_value)):
+        raise error
+    if high_value < low_value:
+        raise ValueError("exp_range minimum is above its maximum")
+    return low_value, high_value
+
+
+class JobIndex:
+    """A result list's listings, sorted by each numeric field for filtering."""
+
+    def __init__(self, jobs: list[dict]):
+        self.jobs = jobs
+        self._sorted: dict[str, tuple[list[float], list[int]]] = {}
+        for field in ("salary_max", "exp_min", "posted_at"):
+            pairs = sorted(
+                (job[field], i) for i, job in enumerate(jobs) if job.get(field) is not None
+            )
+            self._sorted[field] = ([v for v, _ in pairs], [i for _, i in pairs])
+
+    def _at_least(self, field: str, value: float) -> set[int]:
+        values, order = self._sorted[field]
+        return set(order[bisect.bisect_left(values, value):])
+
+    def select(
+        self,
+        min_salary: int | None = None,
+        exp_range: tuple[float, float] | None = None,
+        posted_within: float | None = None,
+        sort: str = "relevance",
+        now: float | None = None,
+    ) -> list[dict]:
+        """
+        Listings whose salary reaches ``min_salary``, whose experience range
+        overlaps ``exp_range`` and that were posted within ``posted_within``
+        seconds; listings missing a filtered field are dropped. Ordered by
+        ``sort``: board order, highest salary, least experience or newest.
+        """
+        keep: set[int] | None = None
+
+        def narrow(indices: set[int]):
+            nonlocal keep
+            keep = indices if keep is None else keep & indices
+
+        if min_salary is not None:
+            narrow(self._at_least("salary_max", min_salary))
+        if posted_within is not None:
+            cutoff = (time.time() if now is None else now) - posted_within
+            narrow(self._at_least("posted_at", cutoff))
+        if exp_range is not None:
+            low, high = exp_range
+            values, order = self._sorted["exp_min"]
+            candidates = order[:bisect.bisect_right(values, high)]
+            narrow({
+                i for i in candidates
+                if (self.jobs[i]["exp_max"] if self.jobs[i]["exp_max"] is not None else float("inf"))
+                >= low
+            })
+
+        if sort == "relevance":
+            indices = range(len(self.jobs)) if keep is None else sorted(keep)
+        else:
+            field = {"salary": "salary_max", "experience": "exp_min", "posted": "posted_at"}[sort]
+            _, order = self._sorted[field]
+            ranked = order if sort == "experience" else order[::-1]
+            # Listings without the sort field go last, in board order
+            missing = [i for i in range(len(self.jobs)) if self.jobs[i].get(field) is None]
+            indices = [i for i in [*ranked, *missing] if keep is None or i in keep]
+        return [self.jobs[i] for i in indices]
+
+
+def select_jobs(jobs: list[dict], **filters) -> list[dict]:
+    """JobIndex(jobs).select(**filters) for lists that aren't cached."""
+    return JobIndex(jobs).select(**filters)
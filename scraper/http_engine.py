@@ -0,0 +1,83 @@
+"""
+Browserless fast path: pooled async HTTP + selectolax parsing.
+
+Many listing pages (LinkedIn guest search in particular) are server
+rendered, so a plain GET returns the same cards the browser would show.
+Cards are parsed with the selector maps from ``extract`` so both engines
+produce identical dicts. Callers escalate to the browser when the page is
+blocked or yields no cards.
+"""
+
+import re
+import urllib.parse
+
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+
+from extract import SELECTORS
+
+# Status codes and page markers that mean we were served a challenge or
+# login wall instead of listings (LinkedIn uses 999 for bot blocks).
+BLOCK_STATUSES = {401, 403, 429, 999}
+BLOCK_MARKERS = re.compile(
+    r"captcha|challenge-platform|authwall|unusual traffic|access denied"
+    r"|are you a robot|verify you are human",
+    re.IGNORECASE,
+)
+
+
+def is_block_page(html: str, status: int = 200) -> bool:
+    return status in BLOCK_STATUSES or bool(BLOCK_MARKERS.search(html))
+
+
+def _text(node) -> str:
+    return " ".join(node.text(deep=True, separator=" ").split())
+
+
+def parse_cards(html: str, platform: str, limit: int, base_url: str = "") -> list[dict]:
+    """Parse listing cards from raw HTML, mirroring extract_cards_bulk."""
+    spec = SELECTORS[platform]
+    jobs = []
+
+    for card in LexborHTMLParser(html).css(spec["card"])[:limit]:
+        job = {}
+        for name, (selector, props) in spec["fields"].items():
+            value = ""
+            el = card.css_first(selector)
+            if el is not None:
+                for prop in props:
+                    value = _text(el) if prop == "text" else (el.attributes.get(prop) or "")
+                    if value and prop == "href":
+                        value = urllib.parse.urljoin(base_url, value)
+                    if value:
+                        break
+            job[name] = value.strip()
+        jobs.append(job)
+
+    return jobs
+
+
+class HttpEngine:
+    """Shared keep-alive client; create once per process and close on shutdown."""
+
+    def __init__(self, user_agent: str, timeout: float = 15.0, max_connections: int = 20):
+        self.client = httpx.AsyncClient(
+            headers={
+                "User-Agent": user_agent,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+    async def fetch(self, url: str) -> tuple[int, str]:
+        response = await self.client.get(url)
+        return response.status_code, response.text
+
+    async def close(self):
+        await self.client.aclose()
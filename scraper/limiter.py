@@ -0,0 +1,266 @@
+"""
+Adaptive concurrency limit for browser scrapes, with a bounded wait queue.
+
+The limit moves between ``min_limit`` and ``max_limit`` AIMD style. A
+scrape that finishes within ``target_latency`` seconds per page, while the
+container has memory and CPU headroom and other scrapes are waiting, adds
+1/limit (about +1 per round of scrapes). A slow scrape, memory headroom
+below ``min_memory`` or CPU load above ``max_cpu`` multiplies it by
+``backoff``, at most once per ``cooldown`` seconds.
+
+Callers wait for a slot in a FairQueue (see scheduler.py): interactive
+before batch, then weighted fair shares across client keys, with optional
+per-client caps on running scrapes. When ``max_queue`` callers are already
+waiting, ``acquire`` raises Overloaded (429) at once; a caller that waits
+longer than ``max_wait`` gets Overloaded (503) instead. Either way it
+carries a Retry-After estimate from the queue length and recent scrape
+times, so clients back off instead of piling up executor threads.
+
+All methods run on the event loop thread.
+"""
+
+import asyncio
+import os
+import time
+
+from scheduler import INTERACTIVE, FairQueue
+
+_STATS_INTERVAL = 1.0  # seconds between resource readings
+
+
+class Overloaded(Exception):
+    def __init__(self, message: str, retry_after: float, status_code: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def memory_headroom() -> float | None:
+    """Fraction of the container's (or else the host's) memory still free."""
+    # cgroup v2, then v1; an unlimited cgroup falls through to /proc/meminfo
+    for limit_path, usage_path in (
+        ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+        ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+    ):
+        limit, usage = _read(limit_path), _read(usage_path)
+        if limit and usage and limit.isdigit() and int(limit) < 1 << 60:
+            return max(0.0, 1 - int(usage) / int(limit))
+
+    meminfo = _read("/proc/meminfo")
+    if not meminfo:
+        return None
+    fields = {}
+    for line in meminfo.splitlines():
+        name, _, value = line.partition(":")
+        fields[name] = int(value.split()[0])
+    if not fields.get("MemTotal") or "MemAvailable" not in fields:
+        return None
+    return fields["MemAvailable"] / fields["MemTotal"]
+
+
+def _cpu_count() -> float:
+    quota = (_read("/sys/fs/cgroup/cpu.max") or "max").split()
+    if quota[0] != "max" and len(quota) == 2:
+        return int(quota[0]) / int(quota[1])
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def cpu_load() -> float | None:
+    """One-minute load average per available CPU (1.0 = fully busy)."""
+    try:
+        return os.getloadavg()[0] / _cpu_count()
+    except OSError:
+        return None
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        target_latency: float = 20.0,
+        min_memory: float = 0.15,
+        max_cpu: float = 0.9,
+        backoff: float = 0.5,
+        cooldown: float = 10.0,
+        max_queue: int = 20,
+        max_wait: float = 20.0,
+        on_decrease=None,
+        clients: dict[str, dict] | None = None,
+        max_per_client: int = 0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit or initial, min_limit)
+        self.target_latency = target_latency
+        self.min_memory = min_memory
+        self.max_cpu = max_cpu
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._on_decrease = on_decrease
+
+        self._limit = float(min(max(initial, min_limit), self.max_limit))
+        self._active = 0
+        self._running: dict[str, int] = {}  # active slots per client
+        self._waiters = FairQueue(clients, max_per_client)
+        self._last_decrease = 0.0
+        self._latency = 0.0  # EWMA of scrape seconds, for Retry-After
+        self._memory: float | None = None
+        self._cpu: float | None = None
+        self._read_at = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+        self.shed = {"queue_full": 0, "wait_timeout": 0}
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self, position: int | None = None) -> float:
+        """Seconds until a new caller (or the waiter at ``position``) would likely get a slot."""
+        ahead = len(self._waiters) if position is None else position
+        rounds = (ahead + 1) / max(1, self.limit)
+        return max(1.0, rounds * (self._latency or self.target_latency))
+
+    # -- slots ----------------------------------------------------------------
+    def _start(self, client: str):
+        self._active += 1
+        self._running[client] = self._running.get(client, 0) + 1
+
+    async def acquire(self, client: str = "", priority: str = INTERACTIVE) -> dict:
+        """
+        Wait for a slot for ``client`` at ``priority``. Returns where the
+        caller joined the queue, {"position", "wait" (estimated seconds)},
+        with position 0 and wait 0 when a slot was free.
+        """
+        cap = self._waiters.cap(client)
+        if (
+            self._active < self.limit and not self._waiters
+            and not (cap and self._running.get(client, 0) >= cap)
+        ):
+            self._start(client)
+            return {"position": 0, "wait": 0.0}
+        if len(self._waiters) >= self.max_queue:
+            self.shed["queue_full"] += 1
+            raise Overloaded(
+                f"{len(self._waiters)} scrapes already waiting for a browser",
+                self.retry_after(), 429,
+            )
+
+        waiter = self._waiters.push(asyncio.get_running_loop().create_future(), client, priority)
+        self._wake()  # a free slot that capped clients ahead could not take
+        if waiter.future.done():
+            return {"position": 0, "wait": 0.0}
+        position = self._waiters.position(waiter)
+        queued = {"position": position + 1, "wait": round(self.retry_after(position), 1)}
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await waiter.future
+            return queued
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._hand_off(client)  # the slot arrived as we gave up; pass it on
+            else:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                self.shed["wait_timeout"] += 1
+                raise Overloaded(
+                    f"no browser freed up within {self.max_wait:g}s",
+                    self.retry_after(), 503,
+                ) from None
+            raise
+
+    def release(self, client: str = "", elapsed: float | None = None):
+        """
+        Free ``client``'s slot. ``elapsed`` is the scrape's seconds per page;
+        leave it out for scrapes that failed, which say nothing about load.
+        """
+        if elapsed is not None:
+            self._adjust(elapsed)
+        self._hand_off(client)
+
+    def _hand_off(self, client: str):
+        self._active -= 1
+        self._running[client] -= 1
+        if not self._running[client]:
+            del self._running[client]
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._active < self.limit:
+            waiter = self._waiters.pop(self._running)
+            if waiter is None:
+                break  # everyone waiting is at their client's cap
+            if not waiter.future.done():
+                self._start(waiter.client)
+                waiter.future.set_result(None)
+
+    # -- AIMD -----------------------------------------------------------------
+    def _read_resources(self):
+        now = time.monotonic()
+        if now - self._read_at >= _STATS_INTERVAL:
+            self._memory, self._cpu = memory_headroom(), cpu_load()
+            self._read_at = now
+
+    def _adjust(self, elapsed: float):
+        self._latency = elapsed if not self._latency else 0.8 * self._latency + 0.2 * elapsed
+        self._read_resources()
+        pressured = (
+            elapsed > self.target_latency
+            or (self._memory is not None and self._memory < self.min_memory)
+            or (self._cpu is not None and self._cpu > self.max_cpu)
+        )
+        now = time.monotonic()
+
+        if pressured:
+            if now - self._last_decrease < self.cooldown:
+                return
+            limit = max(self.min_limit, self._limit * self.backoff)
+            if int(limit) < self.limit:
+                self.decreases += 1
+                self._last_decrease = now
+                if self._on_decrease:
+                    self._on_decrease(int(limit))
+            self._limit = limit
+        elif self._waiters and self._limit < self.max_limit:
+            limit = min(self.max_limit, self._limit + 1 / self.limit)
+            if int(limit) > self.limit:
+                self.increases += 1
+            self._limit = limit
+            self._wake()
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "queues": self._waiters.stats(),
+            "running": dict(self._running),
+            "latency": round(self._latency, 2),
+            "memory_headroom": None if self._memory is None else round(self._memory, 3),
+            "cpu_load": None if self._cpu is None else round(self._cpu, 2),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "shed": dict(self.shed),
+        }
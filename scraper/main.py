@@ -10,89 +10,342 @@ Test:
 """
 
 import asyncio
+import contextvars
+import functools
+import json
+import math
 import os
 import sys
+import threading
+import time
 import urllib.parse
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager, contextmanager
 from enum import Enum
 
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from batches import BatchQueue, QueueFull
+from blocking import apply_blocking
+from breaker import CircuitBreaker, TokenBucket
+from cache import MISS, STALE, ResultCache, normalize, query_key, results_bucket
+from coalesce import SingleFlight
+from dedupe import Deduper, dedupe_jobs
+from extract import SELECTORS, extract_cards, finish_linkedin, finish_naukri, wait_for_cards
+from fields import JobIndex, parse_exp_range, select_jobs, structure
+from http_engine import BLOCK_STATUSES, HttpEngine, is_block_page, parse_cards
+from limiter import AdaptiveLimiter, Overloaded
+from metrics import (
+    BROWSER_LIMIT,
+    BROWSER_QUEUE,
+    BROWSER_SHED,
+    BROWSER_WAIT_SECONDS,
+    BROWSERS_REAPED,
+    CARDS_KEPT,
+    EXECUTOR_BUSY,
+    EXECUTOR_SIZE,
+    PHASE_SECONDS,
+    REQUEST_SECONDS,
+    REQUESTS,
+    SCRAPE_SECONDS,
+    count_cards,
+    render,
+)
+from paginate import paginate, paginate_async
+from pool import DriverPool
+from rank import Ranker
+from reaper import Reaper
+from scheduler import BATCH, INTERACTIVE, PRIORITIES
+from snapshots import SnapshotStore
+from store import JobStore
+from tabs import TabPool
 
 # ---------------------------------------------------------------------------
 # Config
 # ---------------------------------------------------------------------------
 MAX_CONCURRENT_BROWSERS = int(os.getenv("MAX_BROWSERS", "2"))
+# The browser limit starts at MAX_BROWSERS and adapts between these bounds
+# (see limiter.py); set both to MAX_BROWSERS for a fixed limit.
+MIN_BROWSERS = int(os.getenv("MIN_BROWSERS", "1"))
+MAX_BROWSERS_LIMIT = int(os.getenv("MAX_BROWSERS_LIMIT", str(max(MAX_CONCURRENT_BROWSERS, 4))))
+TARGET_PAGE_SECONDS = float(os.getenv("TARGET_PAGE_SECONDS", "20"))
+MIN_MEMORY_HEADROOM = float(os.getenv("MIN_MEMORY_HEADROOM", "0.15"))
+MAX_CPU_LOAD = float(os.getenv("MAX_CPU_LOAD", "0.9"))
+BROWSER_QUEUE_MAX = int(os.getenv("BROWSER_QUEUE_MAX", "20"))
+BROWSER_QUEUE_WAIT = float(os.getenv("BROWSER_QUEUE_WAIT", "20"))
+# Browser slots are shared fairly across clients, told apart by CLIENT_HEADER
+# (else their IP), interactive before batch (see scheduler.py). CLIENTS sets
+# per-client weight, default priority and cap on concurrent browser scrapes,
+# e.g. CLIENTS='{"n8n": {"weight": 1, "priority": "batch", "max_browsers": 1}}'.
+CLIENT_HEADER = os.getenv("CLIENT_HEADER", "X-Client-Id")
+CLIENTS = json.loads(os.getenv("CLIENTS", "{}"))
+MAX_BROWSERS_PER_CLIENT = int(os.getenv("MAX_BROWSERS_PER_CLIENT", "0"))  # 0: no cap
 DEFAULT_MAX_RESULTS = 10
+MAX_RESULTS_LIMIT = int(os.getenv("MAX_RESULTS_LIMIT", "500"))
+MAX_PAGES = int(os.getenv("MAX_PAGES", "20"))
+PAGE_TIMEOUT = float(os.getenv("PAGE_TIMEOUT", "15"))
+HTTP_PAGE_WINDOW = int(os.getenv("HTTP_PAGE_WINDOW", "3"))
+# Job board origins; overridable so benchmarks can point at a local fake board.
+LINKEDIN_URL = os.getenv("LINKEDIN_URL", "https://www.linkedin.com").rstrip("/")
+NAUKRI_URL = os.getenv("NAUKRI_URL", "https://www.naukri.com").rstrip("/")
+# Cards per result page, used to size page waits, timeouts and HTTP offsets.
+PAGE_SIZES = {"linkedin": 25, "naukri": 20}
+# Incremental scrapes load this many more cards at a time, checking each
+# batch for a listing the previous run already returned.
+INCREMENTAL_STEP = int(os.getenv("INCREMENTAL_STEP", "5"))
+# Platforms whose results can be sorted newest first, so incremental scrapes
+# stop at the first known listing; the others skip known listings instead.
+NEWEST_FIRST = {"linkedin"}
 IS_DOCKER = os.path.exists("/.dockerenv") or os.getenv("DOCKER", "")
+POOL_MAX_PAGES = int(os.getenv("POOL_MAX_PAGES", "50"))
+POOL_MAX_AGE_MINUTES = float(os.getenv("POOL_MAX_AGE_MINUTES", "30"))
+POOL_PREWARM = int(os.getenv("POOL_PREWARM", "0"))
+# Above 1, scrapes share browsers: each gets a tab in one of
+# ceil(MAX_BROWSERS_LIMIT / TABS_PER_BROWSER) Chromiums (see tabs.py).
+TABS_PER_BROWSER = int(os.getenv("TABS_PER_BROWSER", "1"))
+PLATFORM_TIMEOUT = float(os.getenv("PLATFORM_TIMEOUT", "60"))
+TAB_TIMEOUT = float(os.getenv("TAB_TIMEOUT", str(PLATFORM_TIMEOUT)))
+# Hard limit on one browser lease. Past it the supervisor kills the browser,
+# so a scrape thread hung in a WebDriver call fails and frees its slot.
+SCRAPE_DEADLINE = float(
+    os.getenv("SCRAPE_DEADLINE", str(PLATFORM_TIMEOUT + PAGE_TIMEOUT * MAX_PAGES))
+)
+# Resident MB for the API plus its browsers above which new launches wait
+# (then get 503); 0 disables. See reaper.py.
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+REAPER_INTERVAL = float(os.getenv("REAPER_INTERVAL", "5"))
+# Page loads per second (and burst) allowed per job board, overridable like
+# RATE_LIMITS='{"linkedin": {"rate": 0.2, "burst": 3}}'.
+RATE_LIMITS = {"linkedin": {"rate": 0.5, "burst": 5}, "naukri": {"rate": 1.0, "burst": 5}}
+for _platform, _overrides in json.loads(os.getenv("RATE_LIMITS", "{}")).items():
+    RATE_LIMITS.setdefault(_platform, {}).update(_overrides)
+# Consecutive failed scrapes that open a platform's circuit breaker, and how
+# long it stays open before probing (doubling per failed probe, up to the max).
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", "3"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "60"))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv("BREAKER_MAX_OPEN_SECONDS", "900"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "900"))
+CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+HTTP_ENGINE_PLATFORMS = {
+    p.strip() for p in os.getenv("HTTP_ENGINE_PLATFORMS", "linkedin").split(",") if p.strip()
+}
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "1") == "1"
+BATCH_DB_PATH = os.getenv("BATCH_DB_PATH", "batches.db")
+BATCH_QUEUE_MAX = int(os.getenv("BATCH_QUEUE_MAX", "1000"))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(MAX_CONCURRENT_BROWSERS)))
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "jobs.db")
+STORE_MAX_AGE = float(os.getenv("STORE_MAX_AGE", "86400"))
+# When set, every results page scraped is kept here for replay.py (see snapshots.py).
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "")
+LOG_JSON = os.getenv("LOG_FORMAT", "text") == "json"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/131.0.0.0 Safari/537.36"
+)
+
+executor = ThreadPoolExecutor(max_workers=MAX_BROWSERS_LIMIT)
+browser_limiter: AdaptiveLimiter
+driver_pool: DriverPool
+tab_pool: TabPool | None = None
+reaper: Reaper
+http_engine: HttpEngine
+batch_queue: BatchQueue
+batch_ready: asyncio.Event
+job_store: JobStore
+snapshot_store: SnapshotStore | None = None
+result_cache = ResultCache(CACHE_TTL, CACHE_STALE_TTL, CACHE_MAX_ENTRIES)
+in_flight = SingleFlight()
+ranker = Ranker()
+rate_limits = {p: TokenBucket(**limits) for p, limits in RATE_LIMITS.items()}
+breakers = {
+    p: CircuitBreaker(
+        BREAKER_THRESHOLD, BREAKER_OPEN_SECONDS, BREAKER_MAX_OPEN_SECONDS,
+        probe_timeout=2 * PLATFORM_TIMEOUT,
+    )
+    for p in RATE_LIMITS
+}
+_background_tasks: set[asyncio.Task] = set()
+# Extra fields handlers attach to the current request's JSON log line.
+_request_log: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "request_log", default=None
+)
+# (client key, priority class) that browser slots are scheduled under.
+_scrape_client: contextvars.ContextVar[tuple[str, str]] = contextvars.ContextVar(
+    "scrape_client", default=("", INTERACTIVE)
+)
+# Furthest back in the browser queue the current request's scrapes joined.
+_queue_report: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "queue_report", default=None
+)
+
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+def _log(scope: str, message: str, **fields):
+    """Log to stderr as "[scope] message", or as one JSON object with LOG_FORMAT=json."""
+    if LOG_JSON:
+        record = {"ts": round(time.time(), 3), "scope": scope, "message": message, **fields}
+        print(json.dumps(record, ensure_ascii=False, default=str), file=sys.stderr)
+    else:
+        print(f"[{scope}] {message}", file=sys.stderr)
+
 
-executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BROWSERS)
-browser_semaphore: asyncio.Semaphore
+def _log_fields(**fields):
+    """Attach fields to the current request's log line, if JSON logging is on."""
+    record = _request_log.get()
+    if record is not None:
+        record.update(fields)
 
 
 # ---------------------------------------------------------------------------
 # Browser — two modes: Docker (raw selenium) vs Local (SeleniumBase UC)
 # ---------------------------------------------------------------------------
-@contextmanager
-def get_browser():
+def _launch_browser(page_load_strategy: str = "normal"):
     """
     Docker: uses raw selenium with the system-installed Chromium + chromedriver.
     Local:  uses SeleniumBase UC mode for stealth.
     """
-    driver = None
-    try:
-        if IS_DOCKER:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-
-            options = Options()
-            options.binary_location = os.getenv("CHROME_BIN", "/usr/bin/chromium")
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument(
-                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/131.0.0.0 Safari/537.36"
-            )
+    if IS_DOCKER:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
 
-            service = Service(os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver"))
-            driver = webdriver.Chrome(service=service, options=options)
-            yield driver
-        else:
-            from seleniumbase import SB
-            with SB(uc=True, headless=True) as sb:
-                yield sb.driver
-    finally:
-        if IS_DOCKER and driver:
-            driver.quit()
+        options = Options()
+        options.binary_location = os.getenv("CHROME_BIN", "/usr/bin/chromium")
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-agent={USER_AGENT}")
+        options.page_load_strategy = page_load_strategy
 
+        service = Service(os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver"))
+        return webdriver.Chrome(service=service, options=options)
 
-import time
+    from seleniumbase import Driver
+    return Driver(uc=True, headless=True, page_load_strategy=page_load_strategy)
+
+
+def _timed_launch(page_load_strategy: str = "normal"):
+    with reaper.launch(), PHASE_SECONDS.time(platform="pool", phase="launch"):
+        driver = _launch_browser(page_load_strategy)
+    reaper.track(driver)
+    return driver
 
 
-def _wait_and_scroll(driver, seconds=3, scrolls=3):
-    time.sleep(seconds)
-    for _ in range(scrolls):
-        driver.execute_script("window.scrollBy(0, 800);")
-        time.sleep(1)
+@contextmanager
+def get_browser(platform: str = ""):
+    """
+    Lease a warm driver from the pool; it is reset and returned on exit.
+    In tab mode this is a fresh tab in a shared browser instead, and one
+    past the scrape deadline is closed rather than its whole browser killed.
+    """
+    started = time.monotonic()
+    with (tab_pool or driver_pool).lease() as driver, reaper.lease(
+        driver, on_overdue=getattr(driver, "abandon", None)
+    ):
+        PHASE_SECONDS.observe(
+            time.monotonic() - started, platform=platform, phase="lease", outcome="ok"
+        )
+        yield driver
 
 
 # ---------------------------------------------------------------------------
 # App lifecycle
 # ---------------------------------------------------------------------------
+async def _supervise():
+    """Sweep the browser processes every REAPER_INTERVAL seconds (see reaper.py)."""
+    while True:
+        await asyncio.sleep(REAPER_INTERVAL)
+        try:
+            events = await asyncio.to_thread(reaper.sweep)
+        except Exception as e:
+            _log("reaper", f"Sweep failed: {e}")
+            continue
+        for event in events:
+            if event["reason"] == "abandoned":
+                _log("reaper", f"Closed {event['leases']} tab(s) past the scrape deadline")
+                continue
+            BROWSERS_REAPED.inc(len(event["pids"]), reason=event["reason"])
+            _log("reaper", f"Reaped {len(event['pids'])} {event['reason']} process(es)", **event)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global browser_semaphore
-    browser_semaphore = asyncio.Semaphore(MAX_CONCURRENT_BROWSERS)
+    global browser_limiter, driver_pool, tab_pool, http_engine, batch_queue, batch_ready, job_store
+    global snapshot_store, reaper
+    EXECUTOR_SIZE.set(MAX_BROWSERS_LIMIT)
+    reaper = Reaper(
+        MEMORY_BUDGET_MB,
+        deadline=SCRAPE_DEADLINE,
+        max_wait=BROWSER_QUEUE_WAIT,
+        # Idle pooled browsers are the memory that is cheapest to give back
+        on_pressure=lambda: driver_pool.trim(0),
+    )
+    driver_pool = DriverPool(
+        _timed_launch,
+        size=MAX_BROWSERS_LIMIT,
+        max_pages=POOL_MAX_PAGES,
+        max_age=POOL_MAX_AGE_MINUTES * 60,
+        origins=(LINKEDIN_URL, NAUKRI_URL),
+    )
+    if TABS_PER_BROWSER > 1:
+        tab_pool = TabPool(
+            functools.partial(_timed_launch, "none"),
+            browsers=-(-MAX_BROWSERS_LIMIT // TABS_PER_BROWSER),
+            tabs_per_browser=TABS_PER_BROWSER,
+            tab_timeout=TAB_TIMEOUT,
+            max_tabs=POOL_MAX_PAGES,
+            max_age=POOL_MAX_AGE_MINUTES * 60,
+        )
+    browser_limiter = AdaptiveLimiter(
+        MAX_CONCURRENT_BROWSERS,
+        min_limit=MIN_BROWSERS,
+        max_limit=MAX_BROWSERS_LIMIT,
+        target_latency=TARGET_PAGE_SECONDS,
+        min_memory=MIN_MEMORY_HEADROOM,
+        max_cpu=MAX_CPU_LOAD,
+        max_queue=BROWSER_QUEUE_MAX,
+        max_wait=BROWSER_QUEUE_WAIT,
+        # Idle drivers above the new limit only hold memory
+        on_decrease=lambda limit: executor.submit(driver_pool.trim, limit),
+        clients=CLIENTS,
+        max_per_client=MAX_BROWSERS_PER_CLIENT,
+    )
+    BROWSER_LIMIT.set(browser_limiter.limit)
+    http_engine = HttpEngine(USER_AGENT, timeout=HTTP_TIMEOUT)
+    batch_queue = BatchQueue(BATCH_DB_PATH, max_pending=BATCH_QUEUE_MAX)
+    batch_ready = asyncio.Event()
+    batch_ready.set()  # drain anything left over from a previous run
+    job_store = JobStore(JOB_STORE_PATH)
+    if SNAPSHOT_DIR:
+        snapshot_store = SnapshotStore(SNAPSHOT_DIR)
+    workers = [asyncio.create_task(_batch_worker()) for _ in range(BATCH_WORKERS)]
+    workers.append(asyncio.create_task(_supervise()))
+    if POOL_PREWARM and tab_pool is None:
+        executor.submit(driver_pool.warm, POOL_PREWARM)
     yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    batch_queue.close()
+    job_store.close()
+    if snapshot_store is not None:
+        snapshot_store.close()
     executor.shutdown(wait=False)
+    driver_pool.close()
+    if tab_pool is not None:
+        tab_pool.close()
+    await http_engine.close()
 
 
 app = FastAPI(
@@ -102,14 +355,80 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Queue-Position", "X-Queue-Wait"],
 )
 
 
+@app.middleware("http")
+async def schedule_requests(request: Request, call_next):
+    """
+    Tag the request's scrapes with its client and priority (X-Priority, else
+    the client's configured one) and report where they queued for a browser
+    as X-Queue-Position (0: no wait) and X-Queue-Wait (estimated seconds).
+    Streamed responses send their headers before any scrape queues.
+    """
+    client = request.headers.get(CLIENT_HEADER) or (request.client.host if request.client else "")
+    priority = request.headers.get("X-Priority") or CLIENTS.get(client, {}).get("priority")
+    client_token = _scrape_client.set((client, priority if priority in PRIORITIES else INTERACTIVE))
+    report: dict = {}
+    report_token = _queue_report.set(report)
+    try:
+        response = await call_next(request)
+    finally:
+        _scrape_client.reset(client_token)
+        _queue_report.reset(report_token)
+    if report:
+        response.headers["X-Queue-Position"] = str(report["position"])
+        response.headers["X-Queue-Wait"] = f"{report['wait']:g}"
+    return response
+
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """Count and time every request; with LOG_FORMAT=json, log one line per request."""
+    started = time.monotonic()
+    record: dict | None = {} if LOG_JSON else None
+    token = _request_log.set(record)
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.monotonic() - started
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUESTS.inc(path=path, status=status)
+        REQUEST_SECONDS.observe(elapsed, path=path)
+        if record is not None:
+            _log(
+                "request",
+                f"{request.method} {request.url.path} {status}",
+                method=request.method,
+                path=request.url.path,
+                query=str(request.url.query),
+                status=status,
+                elapsed_ms=round(elapsed * 1000, 1),
+                **record,
+            )
+        _request_log.reset(token)
+
+
 # ---------------------------------------------------------------------------
 # Models
 # ---------------------------------------------------------------------------
@@ -119,6 +438,11 @@ class Platform(str, Enum):
     all = "all"
 
 
+class JobSource(BaseModel):
+    source: str
+    url: str
+
+
 class JobListing(BaseModel):
     title: str
     company: str
@@ -128,129 +452,727 @@ class JobListing(BaseModel):
     posted: str = ""
     salary: str = ""
     experience: str = ""
+    # Parsed from the text fields above; None when missing or unparseable
+    salary_min: int | None = None  # INR per year
+    salary_max: int | None = None
+    exp_min: float | None = None  # years
+    exp_max: float | None = None
+    posted_at: float | None = None  # epoch seconds
+    sources: list[JobSource] = []  # every board a deduped listing was found on
+
+
+class PlatformStatus(BaseModel):
+    status: str  # ok | blocked | timeout | error | overloaded | circuit_open
+    count: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+    cache: str = ""  # hit | stale | miss | store
+    wait: float = 0.0  # seconds spent waiting for cards to render
+    engine: str = ""  # http | browser
+    pages: int = 0
+    caught_up: bool = False  # incremental scrape reached an already-known listing
+    # overloaded / circuit_open: seconds until a browser is likely free or
+    # the platform is retried
+    retry_after: int = 0
+
+
+class Watermark(BaseModel):
+    updated: float  # when the query last ran incrementally
+    posted: str = ""  # newest posted date seen so far
+    known: int = 0  # URLs remembered for the next run
 
 
 class ScrapeResponse(BaseModel):
     query: dict
     total_found: int
     jobs: list[JobListing]
+    platforms: dict[str, PlatformStatus] = {}
+    watermarks: dict[str, Watermark] = {}  # incremental mode only
+
+
+class StoredJob(JobListing):
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+
+
+class SearchResponse(BaseModel):
+    query: dict
+    total_found: int
+    served: str  # index | live
+    jobs: list[StoredJob]
+    platforms: dict[str, PlatformStatus] = {}
+
+
+class RankQuery(BaseModel):
+    title: str
+    location: str
+    platform: Platform = Platform.all
+    max_results: int = Field(25, ge=1, le=MAX_RESULTS_LIMIT)
+
+
+class RankRequest(BaseModel):
+    resume_text: str = Field(..., min_length=1, max_length=100_000)
+    jobs: list[JobListing] = Field([], max_length=20_000)
+    query: RankQuery | None = None  # scraped (through the cache) and ranked with ``jobs``
+    top_k: int = Field(10, ge=1, le=500)
+    method: str = Field("bm25", pattern="^(bm25|tfidf)$")
+
+
+class RankedJob(JobListing):
+    score: float
+    matched: list[str] = []  # resume terms that contributed most to the score
+
+
+class RankResponse(BaseModel):
+    method: str
+    total_ranked: int
+    jobs: list[RankedJob]
+    platforms: dict[str, PlatformStatus] = {}
+
+
+class BatchQuery(BaseModel):
+    title: str
+    location: str
+    platform: Platform = Platform.all
+    max_results: int = Field(DEFAULT_MAX_RESULTS, ge=1, le=MAX_RESULTS_LIMIT)
+
+
+class BatchRequest(BaseModel):
+    queries: list[BatchQuery] = Field(..., min_length=1, max_length=500)
+
+
+class BatchAccepted(BaseModel):
+    batch_id: str
+    total: int
+    status: str = "queued"
 
 
 # ---------------------------------------------------------------------------
-# LinkedIn scraper
+# Paginated browser scrape
 # ---------------------------------------------------------------------------
-def _scrape_linkedin(title: str, location: str, max_results: int) -> list[dict]:
-    jobs = []
-    params = urllib.parse.urlencode({"keywords": title, "location": location})
-    url = f"https://www.linkedin.com/jobs/search/?{params}"
+def _scrape_pages(
+    driver, platform: str, page_url, finish, max_results: int,
+    cancel: threading.Event | None = None, known: frozenset[str] | None = None,
+    on_page=None,
+) -> tuple[list[dict], dict]:
+    """
+    Walk result pages in one leased driver, deduping on URL as it goes,
+    taking a token from the platform's rate limit before every page load.
+    ``page_url(page, offset)`` builds each page's URL. Platforms with a
+    "see more" button may load past one page in place, so their waits are
+    not capped at the page size. With ``known`` URLs (incremental mode),
+    cards on NEWEST_FIRST platforms are loaded INCREMENTAL_STEP at a time
+    and scrolling and paging stop at the first known one; elsewhere known
+    cards are skipped. ``on_page`` gets each page's new jobs as they are
+    collected (see paginate).
+    """
+    waited = 0.0
+    newest_first = platform in NEWEST_FIRST
+    # Skipped known cards don't count towards max_results, so read past them
+    limit = max_results if newest_first else max_results + len(known or ())
 
-    try:
-        with get_browser() as driver:
-            driver.get(url)
-            _wait_and_scroll(driver)
+    def wait(target: int) -> int:
+        nonlocal waited
+        with PHASE_SECONDS.time(platform=platform, phase="wait"):
+            count, page_waited = wait_for_cards(driver, platform, target, cancel)
+        waited += page_waited
+        return count
 
-            cards = driver.find_elements("css selector", ".base-card")
+    def extract(limit: int) -> list[dict]:
+        with PHASE_SECONDS.time(platform=platform, phase="extract"):
+            cards = extract_cards(driver, platform, limit)
+        count_cards(platform, cards)
+        return finish(cards)
 
-            for card in cards[:max_results]:
-                job = {"source": "linkedin", "salary": "", "experience": ""}
+    def captured(jobs: list[dict]) -> list[dict]:
+        if snapshot_store is not None:
+            try:
+                html, url = driver.page_source, driver.current_url
+            except Exception as e:
+                _log(platform, f"Snapshot capture failed: {e}")
+            else:
+                snapshot_store.capture(platform, url, html, "browser", cards=len(jobs))
+        return jobs
 
-                try:
-                    el = card.find_element("css selector", ".base-search-card__title")
-                    job["title"] = el.text.strip()
-                except Exception:
-                    job["title"] = ""
+    def fetch_page(page: int, offset: int) -> list[dict]:
+        if page and cancel is not None and cancel.is_set():
+            return []
+        delay = rate_limits[platform].reserve()
+        if delay:
+            PHASE_SECONDS.observe(delay, platform=platform, phase="rate_limit", outcome="ok")
+            time.sleep(delay)
+        with PHASE_SECONDS.time(platform=platform, phase="navigate"):
+            driver.get(page_url(page, offset))
+        target = limit - offset
+        if "more" not in SELECTORS[platform]:
+            target = min(target, PAGE_SIZES[platform])
+        if not known or not newest_first:
+            wait(target)
+            return captured(extract(limit))
 
-                try:
-                    el = card.find_element("css selector", ".base-search-card__subtitle")
-                    job["company"] = el.text.strip()
-                except Exception:
-                    job["company"] = ""
+        want = 0
+        while True:
+            want = min(target, want + INCREMENTAL_STEP)
+            count = wait(want)
+            jobs = extract(want)
+            if count < want or want >= target or any(j["url"] in known for j in jobs):
+                return captured(jobs)
 
-                try:
-                    el = card.find_element("css selector", ".job-search-card__location")
-                    job["location"] = el.text.strip()
-                except Exception:
-                    job["location"] = ""
+    jobs, pages, caught_up = paginate(
+        fetch_page, max_results, MAX_PAGES, known or frozenset(), on_page,
+        newest_first=newest_first,
+    )
+    # An empty first page stops paging, so the driver is still showing it
+    blocked = not jobs and not caught_up and _showing_block_page(driver)
+    if blocked:
+        _log(platform, "Got a block page", url=page_url(0, 0))
+    return jobs, {"wait": waited, "pages": pages, "caught_up": caught_up, "blocked": blocked}
 
-                try:
-                    el = card.find_element("css selector", "a.base-card__full-link")
-                    job["url"] = el.get_attribute("href").split("?")[0]
-                except Exception:
-                    job["url"] = ""
 
-                try:
-                    el = card.find_element("css selector", "time")
-                    job["posted"] = el.get_attribute("datetime") or el.text.strip()
-                except Exception:
-                    job["posted"] = ""
+def _showing_block_page(driver) -> bool:
+    try:
+        return is_block_page(driver.page_source)
+    except Exception:
+        return False
 
-                if job["title"]:
-                    jobs.append(job)
 
-    except Exception as e:
-        print(f"[linkedin] Error: {e}", file=sys.stderr)
+# ---------------------------------------------------------------------------
+# LinkedIn scraper
+# ---------------------------------------------------------------------------
+def _linkedin_url(title: str, location: str, start: int = 0, newest: bool = False) -> str:
+    query = {"keywords": title, "location": location}
+    if newest:
+        query["sortBy"] = "DD"  # date posted, newest first
+    if start:
+        query["start"] = start
+    return f"{LINKEDIN_URL}/jobs/search/?{urllib.parse.urlencode(query)}"
 
-    return jobs
+
+def _linkedin_page_url(
+    title: str, location: str, page: int, offset: int, newest: bool = False
+) -> str:
+    # Later pages come from the guest endpoint the search page's "see more" calls.
+    if not page:
+        return _linkedin_url(title, location, newest=newest)
+    query = {"keywords": title, "location": location, "start": offset}
+    if newest:
+        query["sortBy"] = "DD"
+    params = urllib.parse.urlencode(query)
+    return f"{LINKEDIN_URL}/jobs-guest/jobs/api/seeMoreJobPostings/search?{params}"
+
+
+def _scrape_linkedin(
+    title: str, location: str, max_results: int, cancel: threading.Event | None = None,
+    known: frozenset[str] | None = None, on_page=None,
+) -> tuple[list[dict], dict]:
+    with get_browser("linkedin") as driver:
+        apply_blocking(driver, "linkedin", BLOCK_RESOURCES)
+        return _scrape_pages(
+            driver,
+            "linkedin",
+            lambda page, offset: _linkedin_url(title, location, offset, known is not None),
+            finish_linkedin,
+            max_results,
+            cancel,
+            known,
+            on_page,
+        )
 
 
 # ---------------------------------------------------------------------------
 # Naukri scraper
 # ---------------------------------------------------------------------------
-def _scrape_naukri(title: str, location: str, max_results: int) -> list[dict]:
-    jobs = []
+def _naukri_url(title: str, location: str, page: int = 0) -> str:
     title_slug = title.lower().replace(" ", "-")
     location_slug = location.lower().replace(" ", "-")
-    url = f"https://www.naukri.com/{title_slug}-jobs-in-{location_slug}"
+    suffix = f"-{page + 1}" if page else ""
+    return f"{NAUKRI_URL}/{title_slug}-jobs-in-{location_slug}{suffix}"
+
+
+def _naukri_page_url(
+    title: str, location: str, page: int, offset: int, newest: bool = False
+) -> str:
+    # Naukri's result URLs can't ask for a date sort; incremental scrapes
+    # skip known listings instead (see NEWEST_FIRST)
+    return _naukri_url(title, location, page)
+
+
+def _scrape_naukri(
+    title: str, location: str, max_results: int, cancel: threading.Event | None = None,
+    known: frozenset[str] | None = None, on_page=None,
+) -> tuple[list[dict], dict]:
+    with get_browser("naukri") as driver:
+        apply_blocking(driver, "naukri", BLOCK_RESOURCES)
+        return _scrape_pages(
+            driver,
+            "naukri",
+            lambda page, offset: _naukri_url(title, location, page),
+            finish_naukri,
+            max_results,
+            cancel,
+            known,
+            on_page,
+        )
+
 
+SCRAPERS = {
+    Platform.linkedin: _scrape_linkedin,
+    Platform.naukri: _scrape_naukri,
+}
+
+# (page url builder, card post-processor) for the browserless HTTP path.
+FAST_PATHS = {
+    Platform.linkedin: (_linkedin_page_url, finish_linkedin),
+    Platform.naukri: (_naukri_page_url, finish_naukri),
+}
+
+
+async def _fetch_page(platform: Platform, url: str, limit: int) -> list[dict]:
+    """Fetch and parse one page over HTTP; [] on failure, block or no cards."""
+    _, finish = FAST_PATHS[platform]
+    delay = rate_limits[platform.value].reserve()
+    if delay:
+        PHASE_SECONDS.observe(delay, platform=platform.value, phase="rate_limit", outcome="ok")
+        await asyncio.sleep(delay)
     try:
-        with get_browser() as driver:
-            driver.get(url)
-            _wait_and_scroll(driver)
+        with PHASE_SECONDS.time(platform=platform.value, phase="fetch"):
+            status, html = await http_engine.fetch(url)
+    except Exception as e:
+        _log(platform.value, f"HTTP fetch failed: {e}", url=url)
+        return []
 
-            cards = driver.find_elements("css selector", ".srp-jobtuple-wrapper, .jobTuple")
+    if status in BLOCK_STATUSES:
+        _log(platform.value, f"HTTP {status} for {url}", url=url, status=status)
+        if snapshot_store is not None:
+            snapshot_store.capture(platform.value, url, html, "http", status)
+        return []
 
-            for card in cards[:max_results]:
-                job = {"source": "naukri", "posted": ""}
+    with PHASE_SECONDS.time(platform=platform.value, phase="parse"):
+        cards = parse_cards(html, platform.value, limit, base_url=url)
+    count_cards(platform.value, cards)
+    jobs = finish(cards)
+    if snapshot_store is not None:
+        snapshot_store.capture(platform.value, url, html, "http", status, len(jobs))
+    if not jobs and is_block_page(html, status):
+        _log(platform.value, f"HTTP path got a block page for {url}", url=url)
+    return jobs
 
-                try:
-                    el = card.find_element("css selector", ".title, a.title")
-                    job["title"] = el.text.strip()
-                    job["url"] = el.get_attribute("href") or ""
-                except Exception:
-                    job["title"] = ""
-                    job["url"] = ""
 
-                try:
-                    el = card.find_element("css selector", ".comp-name, .subTitle a")
-                    job["company"] = el.text.strip()
-                except Exception:
-                    job["company"] = ""
+async def _fetch_platform(
+    platform: Platform, title: str, location: str, max_results: int,
+    known: frozenset[str] | None = None, on_page=None,
+) -> tuple[list[dict], int, bool]:
+    """
+    Try the HTTP fast path, fetching up to HTTP_PAGE_WINDOW pages at once
+    (one at a time in incremental mode, which usually stops on page one).
+    Returns no jobs, and not caught up, when the caller should escalate to
+    the browser: request failure, a block page, or a first page with no cards.
+    """
+    build_url, _ = FAST_PATHS[platform]
+    newest = known is not None
+    newest_first = platform.value in NEWEST_FIRST
+    limit = max_results if newest_first else max_results + len(known or ())
 
-                try:
-                    el = card.find_element("css selector", ".locWdth, .loc-wrap .loc")
-                    job["location"] = el.text.strip()
-                except Exception:
-                    job["location"] = ""
+    async def fetch_page(page: int, offset: int) -> list[dict]:
+        url = build_url(title, location, page, offset, newest)
+        return await _fetch_page(platform, url, limit)
 
-                try:
-                    el = card.find_element("css selector", ".exp-wrap .expwdth, .experience")
-                    job["experience"] = el.text.strip()
-                except Exception:
-                    job["experience"] = ""
+    jobs, pages, caught_up = await paginate_async(
+        fetch_page,
+        max_results,
+        MAX_PAGES,
+        PAGE_SIZES[platform.value],
+        1 if newest and newest_first else HTTP_PAGE_WINDOW,
+        known or frozenset(),
+        on_page,
+        newest_first,
+    )
+    if not jobs and not caught_up:
+        _log(platform.value, "HTTP path found nothing, escalating")
+    return jobs, pages, caught_up
+
+
+# ---------------------------------------------------------------------------
+# Per-platform runner
+# ---------------------------------------------------------------------------
+def _tracked(fn):
+    """Run ``fn`` in an executor thread, counted as busy while it runs."""
+    with EXECUTOR_BUSY.track():
+        return fn()
+
+
+async def _acquire_browser_slot(platform: Platform) -> str:
+    """Wait for a browser slot as the current client; returns the client key."""
+    client, priority = _scrape_client.get()
+    started = time.monotonic()
+    try:
+        with BROWSER_QUEUE.track():
+            queued = await browser_limiter.acquire(client, priority)
+    except Overloaded as e:
+        BROWSER_SHED.inc(platform=platform.value, status=str(e.status_code))
+        _log(platform.value, f"Shed: {e}", retry_after=round(e.retry_after, 1), client=client)
+        raise
+    BROWSER_WAIT_SECONDS.observe(time.monotonic() - started, platform=platform.value)
+    report = _queue_report.get()
+    if report is not None and queued["position"] >= report.get("position", 0):
+        report.update(queued)
+    return client
+
+
+def _release_browser_slot(client: str, started: float, future: asyncio.Future):
+    """Free the slot, feeding the scrape's seconds per page to the limiter."""
+    elapsed = None
+    if not future.cancelled() and future.exception() is None:
+        _, timings = future.result()
+        elapsed = (time.monotonic() - started) / max(1, timings["pages"])
+    browser_limiter.release(client, elapsed)
+    BROWSER_LIMIT.set(browser_limiter.limit)
 
-                try:
-                    el = card.find_element("css selector", ".sal-wrap .salwdth, .salary")
-                    job["salary"] = el.text.strip()
-                except Exception:
-                    job["salary"] = ""
 
-                if job["title"]:
-                    jobs.append(job)
+def _shed(e: Overloaded) -> PlatformStatus:
+    """The status of a platform turned away by the browser limiter."""
+    return PlatformStatus(status="overloaded", error=str(e), retry_after=math.ceil(e.retry_after))
 
+
+def _observed(
+    platform: Platform, started: float, jobs: list[dict], status: PlatformStatus
+) -> tuple[list[dict], PlatformStatus]:
+    """
+    Record a finished platform scrape's latency, outcome and kept listings,
+    and count it for or against the platform's circuit breaker.
+    """
+    outcome = status.status if jobs or status.status != "ok" else "empty"
+    breakers[platform.value].record(outcome == "ok" or status.caught_up, outcome)
+    SCRAPE_SECONDS.observe(
+        time.monotonic() - started,
+        platform=platform.value,
+        engine=status.engine or "browser",
+        outcome=outcome,
+    )
+    CARDS_KEPT.inc(len(jobs), platform=platform.value)
+    return jobs, status
+
+
+async def _run_platform(
+    platform: Platform, title: str, location: str, max_results: int,
+    cancel: threading.Event | None = None, known: frozenset[str] | None = None,
+    on_page=None,
+) -> tuple[list[dict], PlatformStatus]:
+    """
+    Scrape one platform with its own deadline, trying the HTTP fast path
+    first when enabled. Browser scrapes take their own browser slot, which
+    is only released once the worker thread has actually finished, so a
+    timed-out scrape still counts against the browser limit until it exits.
+    Raises Overloaded when no slot frees up in time.
+    Setting ``cancel`` makes the worker stop waiting and release its driver;
+    passing ``known`` URLs scrapes incrementally (see _scrape_pages), and
+    ``on_page`` is called (possibly from the worker thread) with each
+    page's new jobs.
+    While the platform's circuit breaker is open nothing is scraped and the
+    status is "circuit_open".
+    """
+    breaker = breakers[platform.value]
+    if not breaker.allow():
+        return [], PlatformStatus(
+            status="circuit_open",
+            error=f"{platform.value} is failing ({breaker.last_failure}); scraping paused",
+            retry_after=math.ceil(breaker.retry_after()),
+        )
+
+    loop = asyncio.get_event_loop()
+    started = time.monotonic()
+    extra_pages = -(-max_results // PAGE_SIZES[platform.value]) - 1
+    timeout = PLATFORM_TIMEOUT + PAGE_TIMEOUT * extra_pages
+
+    try:
+        async with asyncio.timeout(timeout):
+            if platform.value in HTTP_ENGINE_PLATFORMS:
+                jobs, pages, caught_up = await _fetch_platform(
+                    platform, title, location, max_results, known, on_page
+                )
+                if jobs or caught_up:
+                    return _observed(platform, started, jobs, PlatformStatus(
+                        status="ok",
+                        count=len(jobs),
+                        elapsed=time.monotonic() - started,
+                        engine="http",
+                        pages=pages,
+                        caught_up=caught_up,
+                    ))
+
+            client = await _acquire_browser_slot(platform)
+            slot_started = time.monotonic()
+            future = loop.run_in_executor(
+                executor,
+                _tracked,
+                functools.partial(
+                    SCRAPERS[platform], title, location, max_results,
+                    cancel=cancel, known=known, on_page=on_page,
+                ),
+            )
+            future.add_done_callback(functools.partial(_release_browser_slot, client, slot_started))
+            jobs, timings = await asyncio.shield(future)
+    except Overloaded:
+        raise
+    except TimeoutError:
+        _log(platform.value, f"Timed out after {timeout:.0f}s")
+        return _observed(platform, started, [], PlatformStatus(
+            status="timeout", elapsed=time.monotonic() - started
+        ))
     except Exception as e:
-        print(f"[naukri] Error: {e}", file=sys.stderr)
+        _log(platform.value, f"Error: {e}")
+        return _observed(platform, started, [], PlatformStatus(
+            status="error", elapsed=time.monotonic() - started, error=str(e)
+        ))
 
-    return jobs
+    return _observed(platform, started, jobs, PlatformStatus(
+        status="blocked" if timings["blocked"] else "ok",
+        count=len(jobs),
+        elapsed=time.monotonic() - started,
+        wait=timings["wait"],
+        engine="browser",
+        pages=timings["pages"],
+        caught_up=timings["caught_up"],
+    ))
+
+
+def _covers(result: tuple[list[dict], PlatformStatus], have: int, want: int) -> bool:
+    # A smaller scrape is only reusable when the listing ran out before its limit.
+    jobs, status = result
+    return status.status == "ok" and len(jobs) < have
+
+
+async def _run_platform_once(
+    platform: Platform, title: str, location: str, max_results: int
+) -> tuple[list[dict], PlatformStatus]:
+    """Run _run_platform, sharing one scrape among identical concurrent queries."""
+    key = (platform.value, normalize(title), normalize(location))
+    jobs, status = await in_flight.run(
+        key,
+        max_results,
+        lambda: _run_platform(platform, title, location, max_results),
+        _covers,
+    )
+    return jobs, status.model_copy()
+
+
+async def _refresh_cached(key: tuple, platform: Platform, title: str, location: str):
+    # Nobody is waiting on a background refresh
+    _scrape_client.set(("refresh", BATCH))
+    _queue_report.set(None)
+    try:
+        jobs, status = await _run_platform_once(platform, title, location, key[-1])
+        if status.status == "ok" and jobs:
+            result_cache.put(key, jobs)
+            job_store.upsert(jobs)
+    except Overloaded:
+        pass  # still stale; the next hit tries again
+    finally:
+        result_cache.end_refresh(key)
+
+
+def _select(key: tuple | None, jobs: list[dict], filters: dict | None) -> list[dict]:
+    """Apply /scrape-jobs filters, through the cache entry's index when ``key`` is cached."""
+    if not filters:
+        return jobs
+    index = result_cache.index(key) if key is not None else None
+    return (index or JobIndex(jobs)).select(**filters)
+
+
+def _serve_degraded(
+    platform: Platform, title: str, location: str, max_results: int, status: PlatformStatus,
+    filters: dict | None = None,
+) -> tuple[list[dict], PlatformStatus]:
+    """
+    Answer for a platform whose breaker is open with whatever is on hand:
+    a cache entry of any age still held, else matching stored listings.
+    """
+    state, key, jobs = result_cache.lookup(platform.value, title, location, max_results)
+    if state == MISS:
+        # Filters apply after the store search, so give them more to choose from
+        fetch = MAX_RESULTS_LIMIT if filters else max_results
+        jobs = job_store.search(title, location, [platform.value], STORE_MAX_AGE, fetch)
+        # Relative posted dates were relative to when the listing was first seen
+        jobs = [structure(job, job["first_seen"]) for job in jobs]
+        state, key = ("store" if jobs else MISS), None
+    jobs = _select(key, jobs, filters)[:max_results]
+    status.count, status.cache = len(jobs), state
+    return jobs, status
+
+
+async def _scrape_platform(
+    platform: Platform, title: str, location: str, max_results: int,
+    fresh: bool = False, max_age: float | None = None,
+    cancel: threading.Event | None = None, filters: dict | None = None, on_page=None,
+) -> tuple[list[dict], PlatformStatus]:
+    """
+    Serve one platform from the result cache when possible. Stale entries
+    are returned immediately and refreshed in the background; misses scrape
+    at the cache bucket size so smaller follow-up queries are hits too.
+    Cancellable scrapes are not coalesced: one client going away must not
+    abort a scrape other waiters share. A platform whose circuit breaker is
+    open is served degraded (see _serve_degraded). ``filters`` (JobIndex.select
+    arguments) apply to the whole bucket before it is cut to max_results.
+    ``on_page`` is passed on to cancellable scrapes (see _run_platform).
+    """
+    state, key, jobs = MISS, None, []
+    if not fresh:
+        state, key, jobs = result_cache.lookup(
+            platform.value, title, location, max_results, max_age
+        )
+
+    if state != MISS:
+        if state == STALE and result_cache.begin_refresh(key):
+            task = asyncio.create_task(_refresh_cached(key, platform, title, location))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        jobs = _select(key, jobs, filters)[:max_results]
+        return jobs, PlatformStatus(status="ok", count=len(jobs), cache=state)
+
+    if key is None:
+        key = query_key(platform.value, title, location, results_bucket(max_results))
+    if cancel is None:
+        jobs, status = await _run_platform_once(platform, title, location, key[-1])
+    else:
+        jobs, status = await _run_platform(
+            platform, title, location, key[-1], cancel, on_page=on_page
+        )
+    if status.status == "circuit_open":
+        return _serve_degraded(platform, title, location, max_results, status, filters)
+    cached = status.status == "ok" and jobs
+    if cached:
+        result_cache.put(key, jobs)
+        job_store.upsert(jobs)
+    jobs = _select(key if cached else None, jobs, filters)[:max_results]
+    status.count = len(jobs)
+    status.cache = MISS
+    return jobs, status
+
+
+async def _scrape_new(
+    platform: Platform, title: str, location: str, max_results: int,
+    filters: dict | None = None,
+) -> tuple[list[dict], PlatformStatus]:
+    """
+    Incremental scrape: only listings newer than the query's watermark.
+    Bypasses the cache and coalescing, since the answer depends on what
+    this query has already returned; the watermark only advances on success.
+    """
+    mark = job_store.watermark(platform.value, title, location)
+    known = frozenset(mark["urls"]) if mark else frozenset()
+    jobs, status = await _run_platform(platform, title, location, max_results, known=known)
+    if status.status == "ok":
+        job_store.upsert(jobs)
+        job_store.advance(platform.value, title, location, jobs)
+    if filters:
+        # Filtered out listings still count as seen for the watermark
+        jobs = select_jobs(jobs, **filters)
+        status.count = len(jobs)
+    return jobs, status
+
+
+async def _scrape_query(
+    title: str, location: str, platform: Platform, max_results: int,
+    fresh: bool = False, max_age: float | None = None, dedupe: bool = True,
+    incremental: bool = False, filters: dict | None = None,
+) -> ScrapeResponse:
+    """
+    Scrape the requested platforms concurrently. A platform turned away by
+    the browser limiter gets an "overloaded" status next to the others'
+    results; Overloaded is only raised (429/503) when every platform was.
+    If a platform fails outright, the others are cancelled.
+    """
+    platforms = [p for p in SCRAPERS if platform in (Platform.all, p)]
+    shed: list[Overloaded] = []
+
+    async def run(p: Platform) -> tuple[list[dict], PlatformStatus]:
+        try:
+            if incremental:
+                return await _scrape_new(p, title, location, max_results, filters)
+            return await _scrape_platform(
+                p, title, location, max_results, fresh, max_age, filters=filters
+            )
+        except Overloaded as e:
+            shed.append(e)
+            return [], _shed(e)
+
+    tasks = [asyncio.create_task(run(p)) for p in platforms]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    if len(shed) == len(platforms):
+        raise min(shed, key=lambda e: e.retry_after)
+
+    all_jobs: list[dict] = []
+    statuses: dict[str, PlatformStatus] = {}
+    watermarks: dict[str, Watermark] = {}
+    for p, (jobs, status) in zip(platforms, results):
+        all_jobs.extend(jobs)
+        statuses[p.value] = status
+        mark = job_store.watermark(p.value, title, location) if incremental else None
+        if mark:
+            watermarks[p.value] = Watermark(
+                updated=mark["updated"], posted=mark["posted"], known=len(mark["urls"])
+            )
+
+    if dedupe:
+        all_jobs = dedupe_jobs(all_jobs)
+    if filters and filters["sort"] != "relevance" and len(platforms) > 1:
+        all_jobs = select_jobs(all_jobs, sort=filters["sort"])  # merge the per-platform orders
+    _log_fields(
+        total_found=len(all_jobs),
+        platforms={
+            p: {"status": st.status, "count": st.count, "elapsed": round(st.elapsed, 3),
+                "engine": st.engine, "cache": st.cache}
+            for p, st in statuses.items()
+        },
+    )
+
+    return ScrapeResponse(
+        query={"title": title, "location": location, "platform": platform.value},
+        total_found=len(all_jobs),
+        jobs=all_jobs,
+        platforms=statuses,
+        watermarks=watermarks,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Batch worker
+# ---------------------------------------------------------------------------
+async def _batch_worker():
+    """Drain the batch queue through the same cache, coalescing and browser slots."""
+    _scrape_client.set(("batch", BATCH))
+    while True:
+        item = batch_queue.claim()
+        if item is None:
+            batch_ready.clear()
+            await batch_ready.wait()
+            continue
+
+        try:
+            while True:
+                try:
+                    response = await _scrape_query(
+                        item["title"], item["location"], Platform(item["platform"]),
+                        item["max_results"],
+                    )
+                except Overloaded as e:
+                    # Claimed work is never dropped; wait for browsers to free up
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                shed = [s for s in response.platforms.values() if s.status == "overloaded"]
+                if not shed:
+                    break
+                # Platforms that finished are cache hits on the retry
+                await asyncio.sleep(max(1, min(s.retry_after for s in shed)))
+            batch_queue.complete(item["id"], response.model_dump())
+        except Exception as e:
+            _log("batch", f"Query {item['id']} failed: {e}", item=item["id"])
+            batch_queue.fail(item["id"], str(e))
 
 
 # ---------------------------------------------------------------------------
@@ -258,7 +1180,27 @@ def _scrape_naukri(title: str, location: str, max_results: int) -> list[dict]:
 # ---------------------------------------------------------------------------
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "pool": driver_pool.stats(),
+        "tabs": tab_pool.stats() if tab_pool is not None else None,
+        "browsers": browser_limiter.stats(),
+        "processes": reaper.stats(),
+        "breakers": {p: breaker.stats() for p, breaker in breakers.items()},
+        "rate_limits": {p: bucket.stats() for p, bucket in rate_limits.items()},
+        "cache": result_cache.stats(),
+        "coalescing": in_flight.stats(),
+        "batch_pending": batch_queue.pending(),
+        "jobs_indexed": job_store.count(),
+        "ranker": ranker.stats(),
+        "snapshots": snapshot_store.stats() if snapshot_store is not None else None,
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of scrape phase latencies, counters and queue gauges."""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/scrape-jobs", response_model=ScrapeResponse)
@@ -266,26 +1208,244 @@ async def scrape_jobs(
     title: str = Query(..., description="Job title", examples=["AI Developer"]),
     location: str = Query(..., description="Location", examples=["Bangalore"]),
     platform: Platform = Query(Platform.all, description="Platform to scrape"),
-    max_results: int = Query(DEFAULT_MAX_RESULTS, ge=1, le=25),
+    max_results: int = Query(DEFAULT_MAX_RESULTS, ge=1, le=MAX_RESULTS_LIMIT),
+    fresh: bool = Query(False, description="Bypass the result cache"),
+    max_age: float | None = Query(
+        None, ge=0, description="Oldest cached result to accept, in seconds"
+    ),
+    dedupe: bool = Query(True, description="Merge the same posting across platforms"),
+    incremental: bool = Query(
+        False, description="Only listings new since this query's last incremental run"
+    ),
+    min_salary: int | None = Query(
+        None, ge=0, description="Only listings paying up to at least this much, in INR a year"
+    ),
+    exp_range: str | None = Query(
+        None, description="Years of experience the listing must overlap: 2-5, 3 or 3-",
+        examples=["2-5"],
+    ),
+    posted_within: float | None = Query(
+        None, ge=0, description="Only listings posted within this many seconds"
+    ),
+    sort: str = Query("relevance", pattern="^(relevance|salary|experience|posted)$"),
 ):
-    async with browser_semaphore:
-        loop = asyncio.get_event_loop()
-        all_jobs: list[dict] = []
+    """
+    Scrape (or serve from cache) listings for a query. The salary,
+    experience and posted filters use the parsed numeric fields, so
+    listings that don't state a filtered field are left out; they are
+    applied before max_results, over everything cached for the query.
+    """
+    filters = None
+    if min_salary is not None or exp_range or posted_within is not None or sort != "relevance":
+        try:
+            exp = parse_exp_range(exp_range) if exp_range else None
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        filters = {
+            "min_salary": min_salary, "exp_range": exp,
+            "posted_within": posted_within, "sort": sort,
+        }
+    return await _scrape_query(
+        title, location, platform, max_results, fresh, max_age, dedupe, incremental, filters
+    )
 
-        if platform in (Platform.all, Platform.linkedin):
-            linkedin_jobs = await loop.run_in_executor(
-                executor, _scrape_linkedin, title, location, max_results
-            )
-            all_jobs.extend(linkedin_jobs)
 
-        if platform in (Platform.all, Platform.naukri):
-            naukri_jobs = await loop.run_in_executor(
-                executor, _scrape_naukri, title, location, max_results
+@app.get("/scrape-jobs/stream")
+async def scrape_jobs_stream(
+    title: str = Query(..., description="Job title", examples=["AI Developer"]),
+    location: str = Query(..., description="Location", examples=["Bangalore"]),
+    platform: Platform = Query(Platform.all, description="Platform to scrape"),
+    max_results: int = Query(DEFAULT_MAX_RESULTS, ge=1, le=MAX_RESULTS_LIMIT),
+    fresh: bool = Query(False, description="Bypass the result cache"),
+    max_age: float | None = Query(
+        None, ge=0, description="Oldest cached result to accept, in seconds"
+    ),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    dedupe: bool = Query(True, description="Merge the same posting across platforms"),
+):
+    """
+    Stream results as they are scraped: a start event per platform, job
+    events for each result page as soon as it is extracted, a done or error
+    event per platform, and a final summary shaped like ScrapeResponse.
+    With dedupe on, duplicates of an already streamed listing are not sent
+    again; their sources show up in the summary. Disconnecting cancels the
+    remaining browser work so drivers go back to the pool early.
+    """
+    platforms = [p for p in SCRAPERS if platform in (Platform.all, p)]
+    cancel = threading.Event()
+    events: asyncio.Queue = asyncio.Queue()
+    deduper = Deduper()
+    loop = asyncio.get_running_loop()
+    sent: dict[Platform, set[str]] = {p: set() for p in platforms}
+    streamed: list[dict] = []
+
+    async def run(p: Platform):
+        def on_page(jobs: list[dict]):
+            # Called from the scrape's worker thread on the browser path
+            loop.call_soon_threadsafe(events.put_nowait, ("page", (p, jobs)))
+
+        try:
+            await events.put(("start", {"platform": p.value}))
+            try:
+                jobs, status = await _scrape_platform(
+                    p, title, location, max_results, fresh, max_age, cancel, on_page=on_page
+                )
+            except Overloaded as e:
+                jobs, status = [], _shed(e)
+            except Exception as e:
+                _log(p.value, f"Stream scrape failed: {e}")
+                jobs, status = [], PlatformStatus(status="error", error=str(e))
+            # Cache hits arrive whole; anything already streamed is skipped
+            await events.put(("page", (p, jobs)))
+            kind = "done" if status.status == "ok" else "error"
+            await events.put((kind, {"platform": p.value, **status.model_dump()}))
+            return status
+        finally:
+            await events.put((None, None))
+
+    def unsent(p: Platform, jobs: list[dict]):
+        for job in jobs:
+            if len(sent[p]) >= max_results:
+                return
+            if job["url"] in sent[p]:
+                continue
+            sent[p].add(job["url"])
+            streamed.append(job)
+            if dedupe:
+                if not deduper.add(job):
+                    continue
+                job = deduper.jobs[-1]
+            yield JobListing(**job).model_dump()
+
+    def encode(kind: str, data: dict) -> str:
+        if fmt == "sse":
+            return f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        return json.dumps({"event": kind, "data": data}, ensure_ascii=False) + "\n"
+
+    async def stream():
+        tasks = [asyncio.create_task(run(p)) for p in platforms]
+        try:
+            running = len(tasks)
+            while running:
+                kind, data = await events.get()
+                if kind is None:
+                    running -= 1
+                elif kind == "page":
+                    for job in unsent(*data):
+                        yield encode("job", job)
+                else:
+                    yield encode(kind, data)
+
+            statuses = {p.value: task.result() for p, task in zip(platforms, tasks)}
+            all_jobs = deduper.jobs if dedupe else streamed
+
+            summary = ScrapeResponse(
+                query={"title": title, "location": location, "platform": platform.value},
+                total_found=len(all_jobs),
+                jobs=all_jobs,
+                platforms=statuses,
             )
-            all_jobs.extend(naukri_jobs)
+            yield encode("summary", summary.model_dump())
+        finally:
+            cancel.set()
+            for task in tasks:
+                task.cancel()
 
-    return ScrapeResponse(
-        query={"title": title, "location": location, "platform": platform.value},
-        total_found=len(all_jobs),
-        jobs=all_jobs,
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+@app.get("/jobs/search", response_model=SearchResponse)
+async def search_jobs(
+    q: str = Query(..., description="Words to match in title, company or location"),
+    location: str = Query("", description="City; aliases such as Bengaluru match too"),
+    platform: Platform = Query(Platform.all, description="Source to search"),
+    max_results: int = Query(DEFAULT_MAX_RESULTS, ge=1, le=MAX_RESULTS_LIMIT),
+    max_age: float = Query(
+        STORE_MAX_AGE, ge=0, description="Only listings seen within this many seconds"
+    ),
+    min_results: int | None = Query(
+        None, ge=0, description="Scrape live below this many hits (default max_results)"
+    ),
+    dedupe: bool = Query(True, description="Merge the same posting across platforms"),
+):
+    """
+    Ranked search over every listing scraped so far. When the index has
+    fewer than ``min_results`` recent enough hits and a location is given,
+    falls back to a live scrape of ``q`` in ``location``, whose results are
+    indexed for next time.
+    """
+    sources = None if platform == Platform.all else [platform.value]
+    # Over-fetch so merging duplicates still leaves max_results listings.
+    fetch = max_results * 2 if dedupe else max_results
+    jobs = job_store.search(q, location, sources, max_age, fetch)
+    jobs = [structure(job, job["first_seen"]) for job in jobs]
+    if dedupe:
+        jobs = dedupe_jobs(jobs)
+    jobs = jobs[:max_results]
+    wanted = max_results if min_results is None else min_results
+    query = {"q": q, "location": location, "platform": platform.value}
+
+    if len(jobs) >= wanted or not location:
+        return SearchResponse(query=query, total_found=len(jobs), served="index", jobs=jobs)
+
+    live = await _scrape_query(q, location, platform, max_results, dedupe=dedupe)
+    return SearchResponse(
+        query=query,
+        total_found=live.total_found,
+        served="live",
+        jobs=[StoredJob(**job.model_dump()) for job in live.jobs],
+        platforms=live.platforms,
+    )
+
+
+@app.post("/rank", response_model=RankResponse)
+async def rank_jobs(request: RankRequest):
+    """
+    Rank listings against a resume and return the top_k with scores, so
+    only a short list needs an LLM pass. Listings come from ``jobs``,
+    from scraping ``query``, or both.
+    """
+    if not request.jobs and request.query is None:
+        raise HTTPException(status_code=422, detail="Pass jobs, a query, or both")
+
+    jobs = [job.model_dump() for job in request.jobs]
+    platforms: dict[str, PlatformStatus] = {}
+    if request.query is not None:
+        q = request.query
+        scraped = await _scrape_query(q.title, q.location, q.platform, q.max_results)
+        jobs.extend(job.model_dump() for job in scraped.jobs)
+        platforms = scraped.platforms
+
+    # Fitting a large uncached corpus takes long enough to keep off the loop
+    ranked = await asyncio.to_thread(
+        ranker.rank, request.resume_text, jobs, request.top_k, request.method
+    )
+    _log_fields(ranked=len(jobs), method=request.method)
+    return RankResponse(
+        method=request.method,
+        total_ranked=len(jobs),
+        jobs=[RankedJob(**jobs[i], score=round(score, 4), matched=matched)
+              for i, score, matched in ranked],
+        platforms=platforms,
     )
+
+
+@app.post("/scrape-batches", response_model=BatchAccepted, status_code=202)
+async def create_batch(request: BatchRequest):
+    queries = [q.model_dump(mode="json") for q in request.queries]
+    try:
+        batch_id = batch_queue.submit(queries)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    batch_ready.set()
+    return BatchAccepted(batch_id=batch_id, total=len(queries))
+
+
+@app.get("/scrape-batches/{batch_id}")
+async def get_batch(batch_id: str):
+    """Progress plus the ScrapeResponse of every finished query so far."""
+    batch = batch_queue.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Unknown batch")
+    return batch
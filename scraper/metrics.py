@@ -0,0 +1,211 @@
+"""
+Minimal Prometheus metrics for the scraper API.
+
+Counters, gauges and histograms keyed by label values, rendered in the
+Prometheus text exposition format by ``render`` for the /metrics endpoint.
+Everything is thread-safe, since scrapes record phases from executor
+threads.
+
+The scraper's metrics are defined at the bottom so every module records
+into the same registry.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 120.0)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], le: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labels
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_labels(self.labelnames, key)} {value}"
+                for key, value in sorted(self._values.items())
+            ]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self._samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, n = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, n + 1)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the block's duration. ``outcome`` is set to "ok", or to
+        "error" if the block raises, unless the caller passes one.
+        """
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            labels.setdefault("outcome", outcome)
+            self.observe(time.monotonic() - started, **labels)
+
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, n) in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, str(bound))} {count}")
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, '+Inf')} {n}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Scraper metrics
+# ---------------------------------------------------------------------------
+PHASE_SECONDS = Histogram(
+    "scraper_phase_seconds",
+    "Time spent in one phase of a scrape"
+    " (lease, launch, rate_limit, navigate, wait, extract, fetch, parse)",
+    ("platform", "phase", "outcome"),
+)
+SCRAPE_SECONDS = Histogram(
+    "scraper_platform_seconds",
+    "End-to-end time of one platform scrape",
+    ("platform", "engine", "outcome"),
+)
+CARDS_FOUND = Counter(
+    "scraper_cards_found_total", "Cards extracted from result pages", ("platform",)
+)
+CARDS_KEPT = Counter(
+    "scraper_cards_kept_total",
+    "Listings a platform scrape returned, after dropping untitled and repeated cards"
+    " (before cross-platform dedupe)",
+    ("platform",),
+)
+SELECTOR_MISSES = Counter(
+    "scraper_selector_misses_total",
+    "Extracted cards with an empty field, by field",
+    ("platform", "field"),
+)
+BROWSER_QUEUE = Gauge(
+    "scraper_browser_queue_depth", "Scrapes waiting for a browser slot"
+)
+BROWSER_LIMIT = Gauge(
+    "scraper_browser_limit", "Current adaptive limit on concurrent browser scrapes"
+)
+BROWSER_SHED = Counter(
+    "scraper_browser_shed_total",
+    "Scrapes turned away because the browser queue was full or the wait too long",
+    ("platform", "status"),
+)
+BROWSER_WAIT_SECONDS = Histogram(
+    "scraper_browser_wait_seconds", "Time spent waiting for a browser slot", ("platform",)
+)
+BROWSERS_REAPED = Counter(
+    "scraper_browser_processes_reaped_total",
+    "Browser processes killed or waited on by the supervisor",
+    ("reason",),
+)
+EXECUTOR_BUSY = Gauge(
+    "scraper_executor_busy", "Executor threads currently running a browser scrape"
+)
+EXECUTOR_SIZE = Gauge("scraper_executor_workers", "Executor threads available to scrapes")
+REQUESTS = Counter(
+    "scraper_http_requests_total", "API requests served", ("path", "status")
+)
+REQUEST_SECONDS = Histogram(
+    "scraper_http_request_seconds", "API request latency", ("path",)
+)
+
+
+def count_cards(platform: str, cards: list[dict]):
+    """Record extracted cards and which of their fields came back empty."""
+    CARDS_FOUND.inc(len(cards), platform=platform)
+    misses: dict[str, int] = {}
+    for card in cards:
+        for field, value in card.items():
+            if not value:
+                misses[field] = misses.get(field, 0) + 1
+    for field, count in misses.items():
+        SELECTOR_MISSES.inc(count, platform=platform, field=field)
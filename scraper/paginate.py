@@ -0,0 +1,127 @@
+"""
+Pagination with incremental URL dedupe.
+
+``fetch_page(page, offset)`` returns the jobs on one result page, where
+``page`` is the zero-based page number and ``offset`` the number of unique
+jobs collected so far (LinkedIn's ``start=`` is offset based, Naukri's
+numbered pages are not). Paging stops once ``target`` unique jobs are
+collected, a page adds nothing new, or ``max_pages`` is reached.
+
+In incremental mode the caller passes the URLs it already has as ``known``.
+When listings are sorted newest first, the first known URL marks where the
+previous run left off: everything before it is kept and paging stops there
+("caught up"). Boards that can't sort by date (``newest_first=False``)
+interleave new listings with known ones, so known URLs are skipped instead
+and paging goes on past pages of known listings; the scan is caught up if
+it skipped any.
+
+``on_page``, if given, is called with each page's newly added jobs as soon
+as they are merged, so callers can stream results before paging ends.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+def merge_new(
+    jobs: list[dict], seen: set[str], batch: list[dict], known: frozenset[str] = frozenset(),
+    newest_first: bool = True,
+) -> tuple[int, bool]:
+    """
+    Append jobs whose URL has not been seen yet, up to the first known one
+    (or skipping known ones, unless ``newest_first``). Returns how many were
+    added and whether a known URL was reached.
+    """
+    added = 0
+    reached = False
+    for job in batch:
+        url = job.get("url", "")
+        if url in known:
+            if newest_first:
+                return added, True
+            reached = True
+            continue
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        jobs.append(job)
+        added += 1
+    return added, reached
+
+
+def _done(added: int, reached: bool, newest_first: bool) -> bool:
+    # Without a date sort, a page of known listings may come before new ones
+    return (reached and newest_first) or not (added or reached)
+
+
+def _report(on_page, jobs: list[dict], added: int, target: int):
+    start = len(jobs) - added
+    if on_page is not None and added and start < target:
+        on_page(jobs[start:target])
+
+
+def paginate(
+    fetch_page: Callable[[int, int], list[dict]],
+    target: int,
+    max_pages: int,
+    known: frozenset[str] = frozenset(),
+    on_page: Callable[[list[dict]], None] | None = None,
+    newest_first: bool = True,
+) -> tuple[list[dict], int, bool]:
+    """Page through one browser session. Returns (jobs, pages fetched, caught up)."""
+    jobs: list[dict] = []
+    seen: set[str] = set()
+    pages = 0
+    caught_up = False
+
+    for page in range(max_pages):
+        batch = fetch_page(page, len(jobs))
+        pages += 1
+        added, reached = merge_new(jobs, seen, batch, known, newest_first)
+        caught_up = caught_up or reached
+        _report(on_page, jobs, added, target)
+        if _done(added, reached, newest_first) or len(jobs) >= target:
+            break
+
+    return jobs[:target], pages, caught_up
+
+
+async def paginate_async(
+    fetch_page: Callable[[int, int], Awaitable[list[dict]]],
+    target: int,
+    max_pages: int,
+    page_size: int,
+    window: int = 3,
+    known: frozenset[str] = frozenset(),
+    on_page: Callable[[list[dict]], None] | None = None,
+    newest_first: bool = True,
+) -> tuple[list[dict], int, bool]:
+    """
+    Page-number based pagination with up to ``window`` pages in flight.
+    Pages are fetched concurrently but merged in order, so an empty page
+    still ends the scan at the right place. Offsets passed to
+    ``fetch_page`` are estimated as ``page * page_size``.
+    """
+    jobs: list[dict] = []
+    seen: set[str] = set()
+    pages = 0
+    caught_up = False
+    needed = min(max_pages, -(-target // page_size))
+    page = 0
+
+    while page < max_pages and len(jobs) < target:
+        count = max(1, min(window, needed - page))
+        batch_pages = range(page, min(page + count, max_pages))
+        results = await asyncio.gather(
+            *(fetch_page(p, p * page_size) for p in batch_pages)
+        )
+        for batch in results:
+            pages += 1
+            added, reached = merge_new(jobs, seen, batch, known, newest_first)
+            caught_up = caught_up or reached
+            _report(on_page, jobs, added, target)
+            if _done(added, reached, newest_first) or len(jobs) >= target:
+                return jobs[:target], pages, caught_up
+        page += count
+
+    return jobs[:target], pages, caught_up
@@ -0,0 +1,206 @@
+"""
+Warm Chromium driver pool.
+
+Drivers are launched lazily (up to ``size``) and leased to scrape threads.
+Between leases a driver is reset to a single about:blank tab with no cookies
+and no storage for ``origins``, and it is recycled after ``max_pages`` leases
+or ``max_age`` seconds. A driver that can't be reset is quit, so session
+state never carries over to the next lease.
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "created", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created = time.monotonic()
+        self.pages = 0
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[pool] Quit failed: {e}", file=sys.stderr)
+
+
+class DriverPool:
+    def __init__(
+        self, launch, size: int, max_pages: int = 50, max_age: float = 1800.0,
+        origins: tuple[str, ...] = (),
+    ):
+        self._launch = launch
+        self.size = size
+        self.origins = origins
+        self.max_pages = max_pages
+        self.max_age = max_age
+
+        self._cond = threading.Condition()
+        self._idle: list[_PooledDriver] = []
+        self._busy = 0
+        self._closed = False
+
+        self.launches = 0
+        self.recycles = 0
+        self.health_failures = 0
+
+    # -- leasing ------------------------------------------------------------
+    @contextmanager
+    def lease(self, timeout: float | None = None):
+        """Borrow a driver; it is reset and returned to the pool on exit."""
+        entry = self._acquire(timeout)
+        try:
+            yield entry.driver
+        finally:
+            self._release(entry)
+
+    def warm(self, count: int):
+        """Launch up to ``count`` drivers ahead of the first request."""
+        entries = []
+        try:
+            for _ in range(min(count, self.size)):
+                entries.append(self._acquire(timeout=0))
+        except TimeoutError:
+            pass
+        finally:
+            for entry in entries:
+                self._release(entry, used=False)
+
+    def _acquire(self, timeout: float | None) -> _PooledDriver:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("driver pool is closed")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._busy + len(self._idle) < self.size:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("no browser available")
+                self._cond.wait(remaining)
+            self._busy += 1
+
+        if entry is not None:
+            if self._expired(entry):
+                self._recycle(entry)
+                entry = None
+            elif not self._healthy(entry):
+                _quit(entry.driver)
+                entry = None
+
+        if entry is None:
+            try:
+                entry = _PooledDriver(self._launch())
+            except Exception:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self.launches += 1
+
+        return entry
+
+    def _release(self, entry: _PooledDriver, used: bool = True):
+        if used:
+            entry.pages += 1
+
+        keep = False
+        if self._expired(entry):
+            self._recycle(entry)
+        elif self._reset(entry.driver):
+            keep = True
+        else:
+            _quit(entry.driver)
+
+        with self._cond:
+            self._busy -= 1
+            if keep and not self._closed:
+                self._idle.append(entry)
+                keep = False
+            self._cond.notify()
+
+        # Pool was closed while this driver was leased out.
+        if keep:
+            _quit(entry.driver)
+
+    # -- driver maintenance ---------------------------------------------------
+    def _expired(self, entry: _PooledDriver) -> bool:
+        return (
+            entry.pages >= self.max_pages
+            or time.monotonic() - entry.created >= self.max_age
+        )
+
+    def _recycle(self, entry: _PooledDriver):
+        _quit(entry.driver)
+        with self._cond:
+            self.recycles += 1
+
+    def _healthy(self, entry: _PooledDriver) -> bool:
+        try:
+            return entry.driver.execute_script("return 1;") == 1
+        except Exception as e:
+            print(f"[pool] Health check failed: {e}", file=sys.stderr)
+            with self._cond:
+                self.health_failures += 1
+            return False
+
+    def _reset(self, driver) -> bool:
+        """Close extra tabs, park the driver on about:blank and clear cookies and storage."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get("about:blank")
+            # Over CDP, since WebDriver's delete_all_cookies only reaches the
+            # current page's origin, which is about:blank by now
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in self.origins:
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+            return True
+        except Exception as e:
+            print(f"[pool] Reset failed: {e}", file=sys.stderr)
+            return False
+
+    def trim(self, keep: int):
+        """Quit idle drivers until at most ``keep`` are launched."""
+        with self._cond:
+            excess = max(0, self._busy + len(self._idle) - keep)
+            drop, self._idle = self._idle[:excess], self._idle[excess:]
+        for entry in drop:
+            _quit(entry.driver)
+
+    # -- lifecycle ------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": self._busy,
+                "launches": self.launches,
+                "recycles": self.recycles,
+                "health_failures": self.health_failures,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for entry in idle:
+            _quit(entry.driver)
@@ -0,0 +1,173 @@
+"""
+Resume-to-job relevance ranking with sparse BM25 / TF-IDF.
+
+Listings are tokenized by field (title words count ``FIELD_WEIGHTS`` times
+as much as company or location words) into one SciPy CSR term matrix per
+corpus, with BM25 or L2-normalized TF-IDF weights precomputed. Ranking a
+resume then builds one query vector over that vocabulary and scores every
+listing with a single sparse matrix-vector product. Only the top ``k`` are
+sorted.
+
+Fitted corpora are cached by a digest of their listings' text, so ranking
+several resumes against the same search results (or re-ranking a cached
+scrape) skips tokenizing and fitting altogether.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from dedupe import TITLE_ALIASES
+
+FIELD_WEIGHTS = {"title": 3.0, "company": 1.0, "location": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MATCHED_TERMS = 5  # top contributing terms reported per ranked listing
+
+# Keeps tech tokens such as c++, c#, node.js and .net intact.
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*|\.net\b")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our the to was "
+    "were will with we you your i my me this that these those using used work worked "
+    "working years year experience job role team".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        alias = TITLE_ALIASES.get(token)
+        tokens.extend(alias.split() if alias else (token,))
+    return tokens
+
+
+def _digest(jobs: list[dict]) -> str:
+    h = hashlib.sha1()
+    for job in jobs:
+        for field in FIELD_WEIGHTS:
+            h.update(job.get(field, "").encode())
+            h.update(b"\x1f")
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+class _Corpus:
+    """Vocabulary, idf and per-method document weight matrices for one job list."""
+
+    def __init__(self, jobs: list[dict]):
+        self.vocab: dict[str, int] = {}
+        rows, cols, values = [], [], []
+        for i, job in enumerate(jobs):
+            counts: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(job.get(field, "")):
+                    counts[token] += weight
+            for token, tf in counts.items():
+                rows.append(i)
+                cols.append(self.vocab.setdefault(token, len(self.vocab)))
+                values.append(tf)
+
+        n, size = len(jobs), len(self.vocab)
+        self.terms = np.array(list(self.vocab), dtype=object)
+        tf = csr_matrix((values, (rows, cols)), shape=(n, size), dtype=np.float64)
+        df = np.bincount(tf.indices, minlength=size)
+        # BM25 idf, shifted so terms in most listings still count a little
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5))
+
+        lengths = np.asarray(tf.sum(axis=1)).ravel()
+        norm = np.repeat(lengths / (lengths.mean() or 1.0), np.diff(tf.indptr))
+        bm25 = tf.copy()
+        bm25.data = (
+            bm25.data * (BM25_K1 + 1)
+            / (bm25.data + BM25_K1 * (1 - BM25_B + BM25_B * norm))
+            * self.idf[bm25.indices]
+        )
+
+        tfidf = tf.copy()
+        tfidf.data = np.log1p(tfidf.data) * self.idf[tfidf.indices]
+        row_norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        tfidf.data /= np.repeat(np.where(row_norms > 0, row_norms, 1.0), np.diff(tfidf.indptr))
+
+        self.weights = {"bm25": bm25, "tfidf": tfidf}
+
+    def query(self, text: str, method: str) -> np.ndarray:
+        vector = np.zeros(len(self.vocab))
+        for token, count in Counter(tokenize(text)).items():
+            index = self.vocab.get(token)
+            if index is not None:
+                # Sublinear, so a resume repeating one skill doesn't drown out the rest
+                vector[index] = 1 + math.log(count)
+        if method == "tfidf":
+            vector *= self.idf
+            length = np.linalg.norm(vector)
+            if length:
+                vector /= length
+        return vector
+
+
+class Ranker:
+    def __init__(self, max_corpora: int = 32):
+        self.max_corpora = max_corpora
+        self._corpora: OrderedDict[str, _Corpus] = OrderedDict()
+        self._lock = threading.Lock()
+        self.fits = 0
+        self.hits = 0
+
+    def _corpus(self, jobs: list[dict]) -> _Corpus:
+        key = _digest(jobs)
+        with self._lock:
+            corpus = self._corpora.get(key)
+            if corpus is not None:
+                self._corpora.move_to_end(key)
+                self.hits += 1
+                return corpus
+
+        corpus = _Corpus(jobs)
+        with self._lock:
+            self.fits += 1
+            self._corpora[key] = corpus
+            while len(self._corpora) > self.max_corpora:
+                self._corpora.popitem(last=False)
+        return corpus
+
+    def rank(
+        self, resume: str, jobs: list[dict], k: int = 10, method: str = "bm25"
+    ) -> list[tuple[int, float, list[str]]]:
+        """
+        The ``k`` listings that best match ``resume``, best first, as
+        (index into ``jobs``, score, top matched terms). Listings sharing no
+        term with the resume are left out.
+        """
+        if not jobs:
+            return []
+        corpus = self._corpus(jobs)
+        query = corpus.query(resume, method)
+        matrix = corpus.weights[method]
+        scores = matrix @ query
+
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]  # ties keep input order
+
+        ranked = []
+        for i in top:
+            start, end = matrix.indptr[i], matrix.indptr[i + 1]
+            columns = matrix.indices[start:end]
+            contributions = matrix.data[start:end] * query[columns]
+            best = np.argsort(-contributions)[:MATCHED_TERMS]
+            matched = [str(corpus.terms[columns[j]]) for j in best if contributions[j] > 0]
+            ranked.append((int(i), float(scores[i]), matched))
+        return ranked
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"corpora": len(self._corpora), "fits": self.fits, "hits": self.hits}
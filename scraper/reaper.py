@@ -0,0 +1,331 @@
+"""
+Supervision of the Chromium / chromedriver processes the scrapers launch.
+
+A scrape thread that raises or hangs inside a WebDriver call can leave its
+browser running with nobody to quit it, and every leftover Chromium holds
+a few hundred MB until the container is OOM-killed. ``Reaper`` tracks the
+process tree of each launched driver, rooted at chromedriver and also at
+the browser when it is launched separately (SeleniumBase's UC mode starts
+Chrome as a child of this process). On every ``sweep`` (run off the event
+loop every few seconds) it reads /proc to:
+
+- reap zombies among this process's children (in Docker the API is PID 1,
+  so crashed Chromium helpers get reparented to it and are never waited on),
+- kill what is left of a tree once all of its driver's roots have exited,
+- kill browser processes descended from this one that belong to no tracked
+  driver and are older than ``orphan_grace`` (launches in flight are younger),
+- kill the whole tree of a driver leased past its hard ``deadline``, which
+  makes the hung WebDriver call fail so the scrape thread exits and frees
+  its browser slot (a lease with an ``on_overdue`` callback, such as a tab
+  in a shared browser, gets that called instead),
+- measure the resident memory of this process and all its descendants.
+
+With a ``budget_mb``, ``launch`` holds new browser launches while that
+memory plus one more browser (the average tracked tree, measured) would
+exceed the budget, after asking ``on_pressure`` to free idle browsers. A
+launch still over budget after ``max_wait`` raises Overloaded (503).
+
+Without /proc (macOS dev machines) sweeps find nothing and the budget is
+never enforced.
+"""
+
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from limiter import Overloaded
+
+_BROWSER = re.compile(r"chrom", re.IGNORECASE)  # chrome, chromium, chromedriver
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+DEFAULT_BROWSER_MB = 300.0  # assumed size of a browser before one is measured
+
+
+def _scan() -> dict[int, tuple]:
+    """pid -> (ppid, name, state, start ticks, rss MB) for every process."""
+    procs = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return procs
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The name may contain spaces and parentheses; fields resume after the last ")"
+        name = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        try:
+            procs[int(entry)] = (
+                int(fields[1]), name, fields[0], int(fields[19]), int(fields[21]) * _PAGE_KB / 1024
+            )
+        except (IndexError, ValueError):
+            continue
+    return procs
+
+
+def _uptime() -> float:
+    try:
+        with open("/proc/uptime") as f:
+            return float(f.read().split()[0])
+    except OSError:
+        return 0.0
+
+
+def _descendants(children: dict[int, list[int]], pid: int) -> list[int]:
+    found, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(children.get(current, ()))
+    return found
+
+
+def driver_pids(driver) -> tuple[int, ...]:
+    """
+    The root processes behind a WebDriver (or tab): chromedriver, plus the
+    browser when it isn't chromedriver's child (``browser_pid``, UC mode).
+    """
+    driver = getattr(driver, "browser_driver", driver)
+    service = getattr(driver, "service", None)
+    pids = (
+        getattr(getattr(service, "process", None), "pid", None),
+        getattr(driver, "browser_pid", None),
+    )
+    return tuple(dict.fromkeys(pid for pid in pids if isinstance(pid, int)))
+
+
+class Reaper:
+    def __init__(
+        self,
+        budget_mb: float = 0.0,
+        deadline: float = 360.0,
+        orphan_grace: float = 60.0,
+        max_wait: float = 20.0,
+        on_pressure=None,
+    ):
+        self.budget_mb = budget_mb
+        self.deadline = deadline
+        self.orphan_grace = orphan_grace
+        self.max_wait = max_wait
+        self._on_pressure = on_pressure
+        self.pid = os.getpid()
+
+        self._cond = threading.Condition()
+        # Drivers are keyed by their first root pid
+        self._roots: dict[int, tuple[int, ...]] = {}
+        # driver -> {pid: start ticks} of the trees last seen under its roots
+        self._trees: dict[int, dict[int, int]] = {}
+        # driver -> [deadline, on_overdue] per lease
+        self._leases: dict[int, list[list]] = {}
+        self._unmeasured = 0  # launches since the last sweep measured memory
+        self.rss_mb = 0.0
+        self.browser_mb = DEFAULT_BROWSER_MB
+
+        self.sweeps = 0
+        self.reaped = {"zombie": 0, "orphan": 0, "deadline": 0}
+        self.abandoned = 0  # overdue leases handed to their on_overdue
+        self.queued = 0
+        self.refused = 0
+
+    # -- launches and leases --------------------------------------------------
+    def _projected(self) -> float:
+        return self.rss_mb + (self._unmeasured + 1) * self.browser_mb
+
+    @contextmanager
+    def launch(self):
+        """Hold a browser launch until it fits the memory budget."""
+        if self.budget_mb:
+            self._admit()
+        try:
+            yield
+        except BaseException:
+            if self.budget_mb:
+                with self._cond:
+                    self._unmeasured -= 1
+            raise
+
+    def _admit(self):
+        deadline = time.monotonic() + self.max_wait
+        with self._cond:
+            over = self._projected() > self.budget_mb
+        if over and self._on_pressure:
+            self._on_pressure()
+        with self._cond:
+            if self._projected() > self.budget_mb:
+                self.queued += 1
+            while self._projected() > self.budget_mb:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.refused += 1
+                    raise Overloaded(
+                        f"browser memory at {self.rss_mb:.0f} of {self.budget_mb:.0f} MB",
+                        self.max_wait, 503,
+                    )
+                self._cond.wait(remaining)
+            self._unmeasured += 1
+
+    def track(self, driver):
+        """Start supervising a freshly launched driver's process tree."""
+        roots = driver_pids(driver)
+        if roots:
+            with self._cond:
+                self._roots[roots[0]] = roots
+                self._trees.setdefault(roots[0], {})
+
+    @contextmanager
+    def lease(self, driver, on_overdue=None):
+        """
+        Kill ``driver``'s browser if the block is still running after
+        ``deadline``, or call ``on_overdue`` (once, from a sweep) instead
+        when the browser is shared with other leases.
+        """
+        roots = driver_pids(driver)
+        if not roots:
+            yield
+            return
+        pid = roots[0]
+        entry = [time.monotonic() + self.deadline, on_overdue]
+        with self._cond:
+            self._leases.setdefault(pid, []).append(entry)
+        try:
+            yield
+        finally:
+            with self._cond:
+                entries = self._leases.get(pid, [])
+                if any(e is entry for e in entries):
+                    entries[:] = [e for e in entries if e is not entry]
+                if not entries:
+                    self._leases.pop(pid, None)
+
+    # -- sweeping -------------------------------------------------------------
+    def _kill(self, pids: list[int], reason: str, events: list[dict]):
+        killed = []
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                killed.append(pid)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if killed:
+            self.reaped[reason] += len(killed)
+            events.append({"reason": reason, "pids": killed})
+
+    def sweep(self) -> list[dict]:
+        """One supervision pass; returns what was reaped, for logging."""
+        procs = _scan()
+        if not procs:
+            return []
+        events: list[dict] = []
+        children: dict[int, list[int]] = {}
+        for pid, (ppid, *_) in procs.items():
+            children.setdefault(ppid, []).append(pid)
+
+        def alive(pid: int, start: int) -> bool:
+            return pid in procs and procs[pid][3] == start and procs[pid][2] != "Z"
+
+        zombies = [
+            pid for pid, (ppid, _, state, _, _) in procs.items()
+            if state == "Z" and ppid == self.pid
+        ]
+        for pid in zombies:
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    self.reaped["zombie"] += 1
+                    events.append({"reason": "zombie", "pids": [pid]})
+            except ChildProcessError:
+                pass
+
+        now = time.monotonic()
+        overdue, abandon = set(), []
+        with self._cond:
+            trees = {key: dict(tree) for key, tree in self._trees.items()}
+            roots = {key: self._roots.get(key, (key,)) for key in trees}
+            for key, entries in self._leases.items():
+                for entry in entries:
+                    if entry[0] > now:
+                        continue
+                    if entry[1] is None:
+                        overdue.add(key)
+                    else:
+                        abandon.append(entry[1])
+                        entry[0] = float("inf")  # handed over once
+        for on_overdue in abandon:
+            try:
+                on_overdue()
+            except Exception as e:
+                print(f"[reaper] Abandoning an overdue lease failed: {e}", file=sys.stderr)
+        if abandon:
+            self.abandoned += len(abandon)
+            events.append({"reason": "abandoned", "pids": [], "leases": len(abandon)})
+
+        owned: set[int] = set()
+        sizes = []
+        for key, tree in trees.items():
+            live = [root for root in roots[key] if root in procs and procs[root][2] != "Z"]
+            if live:
+                # A live driver: refresh what belongs to it
+                tree = {
+                    pid: procs[pid][3] for root in live for pid in _descendants(children, root)
+                }
+                trees[key] = tree
+                owned.update(tree)
+                sizes.append(sum(procs[pid][4] for pid in tree))
+                if key in overdue:
+                    self._kill(list(tree), "deadline", events)
+                continue
+            # The driver exited (quit, crashed or killed); nothing of its tree should outlive it
+            self._kill([pid for pid, start in tree.items() if alive(pid, start)], "orphan", events)
+            trees[key] = None
+
+        # Browser processes of ours that no tracked driver accounts for
+        uptime = _uptime()
+        strays = []
+        for pid in _descendants(children, self.pid)[1:]:
+            ppid, name, state, start, _ = procs[pid]
+            if pid in owned or state == "Z" or not _BROWSER.search(name):
+                continue
+            if ppid in strays or (uptime and uptime - start / _CLOCK_TICKS >= self.orphan_grace):
+                strays.append(pid)
+        self._kill(strays, "orphan", events)
+
+        rss = sum(procs[pid][4] for pid in _descendants(children, self.pid) if pid in procs)
+        with self._cond:
+            for key, tree in trees.items():
+                if tree is None:
+                    self._trees.pop(key, None)
+                    self._roots.pop(key, None)
+                    self._leases.pop(key, None)
+                elif key in self._trees:
+                    self._trees[key] = tree
+            self.rss_mb = rss
+            if sizes:
+                self.browser_mb = sum(sizes) / len(sizes)
+            self._unmeasured = 0
+            self.sweeps += 1
+            self._cond.notify_all()
+        return events
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "browsers": len(self._trees),
+                "leased": len(self._leases),
+                "rss_mb": round(self.rss_mb, 1),
+                "budget_mb": self.budget_mb or None,
+                "browser_mb": round(self.browser_mb, 1),
+                "deadline": self.deadline,
+                "sweeps": self.sweeps,
+                "reaped": dict(self.reaped),
+                "abandoned_leases": self.abandoned,
+                "queued_launches": self.queued,
+                "refused_launches": self.refused,
+            }
@@ -0,0 +1,144 @@
+"""
+Re-run card extraction over captured snapshots, without a browser.
+
+Reads the pages a SNAPSHOT_DIR capture stored (see snapshots.py), parses
+them with the same selector map, selectolax parser and per-platform
+finish step as the HTTP fast path across a process pool, and writes one
+JSON line per listing with the parsed salary, experience and posted
+fields (relative dates count from when the page was captured). Use it to
+backfill a newly added field, or to try a selector change against
+thousands of real pages before shipping it: ``--selectors`` merges
+overrides into SELECTORS for the run only.
+
+A summary goes to stderr: per platform, pages and listings replayed, how
+often each field came out non-empty, and regressions, i.e. pages where
+replay found fewer listings than the live scrape did.
+
+Usage:
+    python replay.py snapshots/ --out jobs.jsonl
+    python replay.py snapshots/ --platform naukri --since 86400 --workers 8
+    python replay.py snapshots/ --selectors '{"naukri": {"fields": {"salary": [".sal", ["text"]]}}}'
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from extract import FINISHERS, SELECTORS
+from fields import structure
+from http_engine import parse_cards
+from snapshots import list_snapshots, read_snapshot
+
+REGRESSIONS_SHOWN = 20
+
+
+def _apply_selectors(overrides: dict):
+    """Merge ``{"platform": {"card": ..., "fields": {name: [selector, props]}}}`` into SELECTORS."""
+    for platform, spec in overrides.items():
+        current = SELECTORS.setdefault(platform, {"card": "", "fields": {}})
+        for key, value in spec.items():
+            if key == "fields":
+                current["fields"].update(
+                    {name: (selector, tuple(props)) for name, (selector, props) in value.items()}
+                )
+            else:
+                current[key] = value
+
+
+def _replay(snapshot: dict) -> tuple[dict, list[dict]]:
+    """Parse one snapshot in a worker process; errors come back as a failed page."""
+    try:
+        html = read_snapshot(snapshot["path"])
+        cards = parse_cards(html, snapshot["platform"], sys.maxsize, base_url=snapshot["url"])
+    except Exception as e:
+        return {**snapshot, "error": str(e)}, []
+    finish = FINISHERS.get(snapshot["platform"])
+    if finish is not None:
+        jobs = finish(cards, snapshot["captured_at"])
+    else:
+        jobs = [
+            structure({**card, "source": snapshot["platform"]}, snapshot["captured_at"])
+            for card in cards if card.get("title")
+        ]
+    for job in jobs:
+        job["snapshot"] = snapshot["digest"]
+    return snapshot, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("root", help="Snapshot directory (the scraper's SNAPSHOT_DIR)")
+    parser.add_argument("--platform")
+    parser.add_argument("--since", type=float, help="Only pages captured within this many seconds")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=16, help="Pages per worker task")
+    parser.add_argument("--selectors", help="JSON selector overrides, or @file.json")
+    parser.add_argument("--out", help="Write listings as JSON lines here (default: discard)")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.selectors:
+        if args.selectors.startswith("@"):
+            with open(args.selectors[1:]) as f:
+                overrides = json.load(f)
+        else:
+            overrides = json.loads(args.selectors)
+
+    since = time.time() - args.since if args.since is not None else None
+    snapshots = list_snapshots(args.root, args.platform, since, args.limit)
+    summary: dict[str, dict] = {}
+    regressions, failed = [], []
+    started = time.perf_counter()
+    out = open(args.out, "w") if args.out else None
+    try:
+        with ProcessPoolExecutor(
+            args.workers, initializer=_apply_selectors, initargs=(overrides,)
+        ) as pool:
+            for snapshot, jobs in pool.map(_replay, snapshots, chunksize=args.chunk):
+                if "error" in snapshot:
+                    failed.append({"digest": snapshot["digest"], "error": snapshot["error"]})
+                    continue
+                stats = summary.setdefault(
+                    snapshot["platform"], {"pages": 0, "listings": 0, "filled": {}}
+                )
+                stats["pages"] += 1
+                stats["listings"] += len(jobs)
+                for job in jobs:
+                    for field, value in job.items():
+                        if value not in (None, ""):
+                            stats["filled"][field] = stats["filled"].get(field, 0) + 1
+                    if out:
+                        out.write(json.dumps(job) + "\n")
+                if len(jobs) < snapshot["cards"]:
+                    regressions.append({
+                        "digest": snapshot["digest"], "platform": snapshot["platform"],
+                        "url": snapshot["url"], "live": snapshot["cards"], "replay": len(jobs),
+                    })
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    for stats in summary.values():
+        stats["filled"] = {
+            field: round(count / stats["listings"], 3)
+            for field, count in sorted(stats["filled"].items())
+        } if stats["listings"] else {}
+    print(json.dumps({
+        "pages": len(snapshots),
+        "elapsed": round(elapsed, 2),
+        "pages_per_sec": round(len(snapshots) / elapsed, 1) if elapsed else None,
+        "platforms": summary,
+        "regressions": len(regressions),
+        "regressed_pages": regressions[:REGRESSIONS_SHOWN],
+        "failed": failed[:REGRESSIONS_SHOWN],
+    }, indent=2), file=sys.stderr)
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Wait queue for browser slots: priority classes, then fair shares per client.
+
+Waiters are served strictly by priority class (every interactive waiter
+before any batch one). Within a class, clients share slots by weighted fair
+queuing: each waiter gets a virtual finish tag of ``max(class clock,
+client's last tag) + 1 / weight`` when it joins, and the waiter with the
+smallest tag goes next (ties go to whoever joined first). A client queuing
+50 scrapes therefore gets every other slot against a client queuing one,
+not the next 50; a client with weight 2 gets twice the slots of one with
+weight 1 while both are waiting.
+Waiters of a client already running ``cap`` scrapes are passed over until
+one of its scrapes finishes. A client's own waiters are served FIFO.
+
+Like the limiter that owns it, the queue is only touched from the event loop.
+"""
+
+import collections
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)  # in dispatch order
+
+
+class Waiter:
+    __slots__ = ("future", "client", "priority", "tag", "seq")
+
+    def __init__(self, future, client: str, priority: str, tag: float, seq: int):
+        self.future = future
+        self.client = client
+        self.priority = priority
+        self.tag = tag
+        self.seq = seq  # enqueue order, breaking ties between equal tags
+
+    @property
+    def order(self) -> tuple[float, int]:
+        return self.tag, self.seq
+
+
+class FairQueue:
+    def __init__(self, clients: dict[str, dict] | None = None, default_cap: int = 0):
+        """
+        ``clients`` maps a client key to optional "weight" (default 1) and
+        "max_browsers" (its cap; default ``default_cap``, 0 for none).
+        """
+        self.clients = clients or {}
+        self.default_cap = default_cap
+        self._queues: dict[str, dict[str, collections.deque[Waiter]]] = {
+            p: {} for p in PRIORITIES
+        }
+        self._clock = {p: 0.0 for p in PRIORITIES}
+        self._last_tag: dict[tuple[str, str], float] = {}
+        self._size = 0
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def weight(self, client: str) -> float:
+        return float(self.clients.get(client, {}).get("weight", 1.0))
+
+    def cap(self, client: str) -> int:
+        return int(self.clients.get(client, {}).get("max_browsers", self.default_cap))
+
+    def push(self, future, client: str, priority: str) -> Waiter:
+        key = (priority, client)
+        tag = max(self._clock[priority], self._last_tag.get(key, 0.0)) + 1 / self.weight(client)
+        self._last_tag[key] = tag
+        self._seq += 1
+        waiter = Waiter(future, client, priority, tag, self._seq)
+        self._queues[priority].setdefault(client, collections.deque()).append(waiter)
+        self._size += 1
+        return waiter
+
+    def pop(self, running: dict[str, int]) -> Waiter | None:
+        """The next waiter whose client is under its cap, given ``running`` scrapes per client."""
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            best = None
+            for client, queue in queues.items():
+                cap = self.cap(client)
+                if cap and running.get(client, 0) >= cap:
+                    continue
+                if best is None or queue[0].order < best.order:
+                    best = queue[0]
+            if best is not None:
+                self._clock[priority] = best.tag
+                self._discard(best)
+                return best
+        return None
+
+    def remove(self, waiter: Waiter):
+        queue = self._queues[waiter.priority].get(waiter.client)
+        if queue and waiter in queue:
+            self._discard(waiter)
+
+    def _discard(self, waiter: Waiter):
+        queues = self._queues[waiter.priority]
+        queue = queues[waiter.client]
+        queue.remove(waiter)
+        self._size -= 1
+        if not queue:
+            del queues[waiter.client]
+            # An idle client starts again from the class clock, not its old tag
+            if self._last_tag.get((waiter.priority, waiter.client), 0.0) <= self._clock[waiter.priority]:
+                self._last_tag.pop((waiter.priority, waiter.client), None)
+
+    def position(self, waiter: Waiter) -> int:
+        """How many waiters are ahead of ``waiter`` (ignoring caps)."""
+        ahead = 0
+        for priority in PRIORITIES:
+            for queue in self._queues[priority].values():
+                if priority != waiter.priority:
+                    ahead += len(queue)
+                else:
+                    ahead += sum(1 for w in queue if w.order < waiter.order)
+            if priority == waiter.priority:
+                return ahead
+        return ahead
+
+    def stats(self) -> dict:
+        return {
+            p: {client: len(queue) for client, queue in queues.items()}
+            for p, queues in self._queues.items()
+        }
@@ -0,0 +1,169 @@
+"""
+Content-addressed store of fetched listing pages, for offline re-extraction.
+
+With capture on, every results page a scrape loads (the rendered DOM on the
+browser path, the raw response on the HTTP path) is handed to ``capture``,
+which queues it for a background writer thread so scrapes never wait on
+disk. Each page is stored once, gzipped, under the root at
+``objects/<sha256[:2]>/<sha256>.html.gz``; identical pages (re-scrapes of
+an unchanged board) share a file. A row per capture in ``snapshots.db``
+records the platform, page URL, engine, HTTP status and how many listings
+the live extraction found, which replay.py compares against to catch
+selector regressions.
+
+When the writer falls behind by ``max_pending`` pages, new captures are
+dropped (and counted) rather than buffered without bound.
+"""
+
+import gzip
+import hashlib
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    digest TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    url TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    cards INTEGER NOT NULL,
+    captured_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_platform ON snapshots(platform, captured_at);
+"""
+
+
+def object_path(root: str, digest: str) -> str:
+    return os.path.join(root, "objects", digest[:2], f"{digest}.html.gz")
+
+
+def read_snapshot(path: str) -> str:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def list_snapshots(
+    root: str, platform: str | None = None, since: float | None = None, limit: int | None = None
+) -> list[dict]:
+    """
+    The latest capture of each distinct page, oldest first, as dicts with
+    digest, platform, url, engine, status, cards, captured_at and path.
+    Empty if nothing has been captured under ``root`` yet.
+    """
+    path = os.path.join(root, "snapshots.db")
+    if not os.path.exists(path):
+        return []
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    where, args = [], []
+    if platform:
+        where.append("platform = ?")
+        args.append(platform)
+    if since is not None:
+        where.append("captured_at >= ?")
+        args.append(since)
+    sql = (
+        "SELECT digest, platform, url, engine, status, cards, MAX(captured_at) AS captured_at"
+        " FROM snapshots" + (f" WHERE {' AND '.join(where)}" if where else "")
+        + " GROUP BY digest, platform ORDER BY captured_at"
+    )
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    try:
+        rows = [dict(row) for row in db.execute(sql, args)]
+    finally:
+        db.close()
+    for row in rows:
+        row["path"] = object_path(root, row["digest"])
+    return rows
+
+
+class SnapshotStore:
+    def __init__(self, root: str, max_pending: int = 256, level: int = 6):
+        self.root = root
+        self.level = level
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(root, "snapshots.db"), check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._writer = threading.Thread(target=self._write_loop, name="snapshots", daemon=True)
+        self._writer.start()
+
+        self.captured = 0
+        self.stored = 0  # new objects written; the rest were already on disk
+        self.bytes_written = 0
+        self.dropped = 0
+        self.failures = 0
+
+    def capture(
+        self, platform: str, url: str, html: str, engine: str, status: int = 200, cards: int = 0
+    ):
+        """Queue a page for writing; never blocks. Safe from any thread."""
+        try:
+            self._queue.put_nowait((platform, url, html, engine, status, cards, time.time()))
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self):
+        while (item := self._queue.get()) is not None:
+            try:
+                self._write(*item)
+            except Exception as e:
+                self.failures += 1
+                print(f"[snapshots] Write failed: {e}", file=sys.stderr)
+
+    def _write(
+        self, platform: str, url: str, html: str, engine: str, status: int, cards: int,
+        captured_at: float,
+    ):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = object_path(self.root, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # mtime=0 keeps the compressed bytes a function of the content
+            compressed = gzip.compress(data, self.level, mtime=0)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, path)
+            self.stored += 1
+            self.bytes_written += len(compressed)
+        self._db.execute(
+            "INSERT INTO snapshots (digest, platform, url, engine, status, cards, captured_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (digest, platform, url, engine, status, cards, captured_at),
+        )
+        self.captured += 1
+
+    def stats(self) -> dict:
+        return {
+            "captured": self.captured,
+            "stored": self.stored,
+            "bytes_written": self.bytes_written,
+            "pending": self._queue.qsize(),
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+    def close(self, timeout: float = 10.0):
+        """Finish writing what is queued (up to ``timeout``), then close."""
+        self._queue.put(None)
+        self._writer.join(timeout)
+        if self._writer.is_alive():
+            # Closing under a write would lose what is still queued
+            print(
+                f"[snapshots] Writer still busy after {timeout:g}s; leaving the database open",
+                file=sys.stderr,
+            )
+            return
+        self._db.close()
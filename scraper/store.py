@@ -0,0 +1,210 @@
+"""
+Persistent SQLite store of every listing the scrapers have returned.
+
+Listings are keyed by a hash of their canonical URL (scheme and host
+lowercased, tracking parameters, fragment and trailing slash dropped) and
+upserted on every live scrape, so ``first_seen`` records when a posting
+appeared and ``last_seen`` when it was last on a results page. An FTS5
+index over title, company and location (plus the canonical city names
+from dedupe.normalize_location, so Bengaluru finds Bangalore) serves
+ranked keyword searches without touching the job boards.
+
+For incremental scrapes the store also keeps a watermark per (platform,
+normalized title, normalized location): the most recent URLs returned for
+that query, the newest posted date seen, and when it last ran.
+
+Like the batch queue, all access happens on the event loop thread.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+from cache import normalize
+from dedupe import canonical_url, normalize_location
+from fields import posted_date
+
+# URLs remembered per incremental query; a run only needs to recognise the
+# listings at the top of the previous run's results.
+WATERMARK_URLS = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    url_hash TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT NOT NULL,
+    cities TEXT NOT NULL,
+    source TEXT NOT NULL,
+    posted TEXT NOT NULL DEFAULT '',
+    salary TEXT NOT NULL DEFAULT '',
+    experience TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, location, cities,
+    content='jobs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    platform TEXT NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT NOT NULL,
+    urls TEXT NOT NULL,
+    posted TEXT NOT NULL DEFAULT '',
+    updated REAL NOT NULL,
+    PRIMARY KEY (platform, title, location)
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, location, cities)
+    VALUES (new.id, new.title, new.company, new.location, new.cities);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, cities)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.cities);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company, location, cities ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, cities)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.cities);
+    INSERT INTO jobs_fts(rowid, title, company, location, cities)
+    VALUES (new.id, new.title, new.company, new.location, new.cities);
+END;
+"""
+
+_FIELDS = ("url", "title", "company", "location", "source", "posted", "salary", "experience")
+_TOKEN = re.compile(r"\w+")
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(canonical_url(url).encode()).hexdigest()
+
+
+def _match_expr(text: str, column: str = "") -> str:
+    """Quote every word so user input can't inject FTS5 query syntax."""
+    prefix = f"{column} : " if column else ""
+    terms = [f'"{token}"' for token in _TOKEN.findall(text)]
+    return f"{prefix}({' '.join(terms)})" if terms else ""
+
+
+class JobStore:
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def upsert(self, jobs: list[dict], now: float | None = None) -> int:
+        """Insert new listings and refresh known ones; returns how many were new."""
+        now = time.time() if now is None else now
+        rows = []
+        for job in jobs:
+            if not job.get("url"):
+                continue
+            cities = " ".join(sorted(normalize_location(job.get("location", ""))))
+            rows.append(
+                (url_hash(job["url"]), *(job.get(f, "") or "" for f in _FIELDS), cities, now, now)
+            )
+        if not rows:
+            return 0
+
+        with self._db:
+            self._db.execute("BEGIN")
+            before = self.count()
+            # Empty fields never overwrite what an earlier scrape found.
+            self._db.executemany(
+                "INSERT INTO jobs (url_hash, url, title, company, location, source,"
+                " posted, salary, experience, cities, first_seen, last_seen)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(url_hash) DO UPDATE SET"
+                " title = excluded.title, company = excluded.company,"
+                " location = excluded.location, cities = excluded.cities,"
+                " posted = COALESCE(NULLIF(excluded.posted, ''), posted),"
+                " salary = COALESCE(NULLIF(excluded.salary, ''), salary),"
+                " experience = COALESCE(NULLIF(excluded.experience, ''), experience),"
+                " last_seen = excluded.last_seen",
+                rows,
+            )
+            return self.count() - before
+
+    def search(
+        self,
+        query: str,
+        location: str = "",
+        sources: list[str] | None = None,
+        max_age: float | None = None,
+        limit: int = 25,
+    ) -> list[dict]:
+        """
+        BM25-ranked listings matching every word of ``query``, optionally
+        limited to a city, a set of sources, and listings seen within
+        ``max_age`` seconds.
+        """
+        match = [_match_expr(query)]
+        cities = normalize_location(location)
+        if cities:
+            match.append("(" + " OR ".join(_match_expr(c, "cities") for c in sorted(cities)) + ")")
+        match = " AND ".join(m for m in match if m)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT jobs.*, bm25(jobs_fts, 10.0, 3.0, 1.0, 1.0) AS rank"
+            " FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid"
+            " WHERE jobs_fts MATCH ?"
+        )
+        params: list = [match]
+        if sources:
+            sql += f" AND jobs.source IN ({', '.join('?' * len(sources))})"
+            params.extend(sources)
+        if max_age is not None:
+            sql += " AND jobs.last_seen >= ?"
+            params.append(time.time() - max_age)
+        sql += " ORDER BY rank, jobs.last_seen DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                **{f: row[f] for f in _FIELDS},
+                "first_seen": row["first_seen"],
+                "last_seen": row["last_seen"],
+            }
+            for row in self._db.execute(sql, params)
+        ]
+
+    def watermark(self, platform: str, title: str, location: str) -> dict | None:
+        row = self._db.execute(
+            "SELECT * FROM watermarks WHERE platform = ? AND title = ? AND location = ?",
+            (platform, normalize(title), normalize(location)),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"urls": json.loads(row["urls"]), "posted": row["posted"], "updated": row["updated"]}
+
+    def advance(self, platform: str, title: str, location: str, jobs: list[dict]) -> dict:
+        """Record ``jobs`` (newest first) as seen for the query; returns the new watermark."""
+        mark = self.watermark(platform, title, location) or {"urls": [], "posted": ""}
+        urls = [job["url"] for job in jobs if job.get("url")]
+        fresh = set(urls)
+        urls += [url for url in mark["urls"] if url not in fresh]
+        posted = max([mark["posted"], *(posted_date(job) for job in jobs)])
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO watermarks (platform, title, location, urls, posted, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                platform, normalize(title), normalize(location),
+                json.dumps(urls[:WATERMARK_URLS]), posted, now,
+            ),
+        )
+        return {"urls": urls[:WATERMARK_URLS], "posted": posted, "updated": now}
+
+    def close(self):
+        self._db.close()
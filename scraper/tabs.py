@@ -0,0 +1,320 @@
+"""
+Several concurrent scrapes in one Chromium, each in its own tab.
+
+``TabPool`` launches up to ``browsers`` drivers and leases out tabs, at most
+``tabs_per_browser`` per driver. New tabs go to the open browser with the
+fewest tabs, and another browser is only launched once every open one is
+full. A WebDriver session drives one window at a time, so each command a
+tab sends takes its browser's lock and switches to the tab's window first.
+Navigation is started from script and then polled, so several tabs load
+pages at once while the lock is only held for single commands. Browsers
+for the pool are launched with page load strategy "none" for the same
+reason.
+
+Each tab opens in its own browser context (separate cookies and storage,
+like an incognito window) where Chromium allows it, else as a plain tab.
+Either way it is closed on release. A lease has a deadline
+(``tab_timeout``), after which the tab's commands raise TabTimeout so a hung
+page cannot hold its slot. A command already stuck in the browser is ended
+by ``abandon``, which closes the tab through Chromium's DevTools endpoint
+rather than the (blocked) WebDriver session. Browsers are retired after
+``max_tabs`` leases or ``max_age`` seconds, and quit once their last tab
+closes.
+"""
+
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+_NAVIGATE_JS = "window.__tabNavigating = true; window.location.assign(arguments[0]);"
+# "loading" until the new document has replaced the one we navigated away from
+_READY_STATE_JS = "return window.__tabNavigating ? 'loading' : document.readyState;"
+
+
+class TabTimeout(TimeoutError):
+    pass
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[tabs] Quit failed: {e}", file=sys.stderr)
+
+
+class _Browser:
+    def __init__(self, driver):
+        self.driver = driver
+        # Reentrant so a tab can hold it across several of its own commands
+        self.lock = threading.RLock()
+        self.tabs = 0
+        self.served = 0
+        self.created = time.monotonic()
+        self.retired = False
+        # The first window stays open so closing every scrape tab never
+        # ends the session.
+        self.home = driver.current_window_handle
+        self.current = self.home
+        options = getattr(driver, "capabilities", {}).get("goog:chromeOptions", {})
+        self.debugger = options.get("debuggerAddress")
+
+
+class Tab:
+    """The subset of the WebDriver API the scrapers use, bound to one tab."""
+
+    def __init__(self, browser: _Browser, handle: str, context: str | None, deadline: float):
+        self._browser = browser
+        self._driver = browser.driver
+        self.browser_driver = browser.driver  # for process supervision only
+        self.handle = handle
+        self.context = context
+        self.deadline = deadline
+        self.abandoned = False
+
+    @contextmanager
+    def exclusive(self):
+        """Keep this tab current for the whole block, e.g. while using its elements."""
+        with self._browser.lock:
+            self._run(lambda: None)
+            yield
+
+    def _run(self, fn, *args):
+        if time.monotonic() >= self.deadline:
+            raise TabTimeout("tab deadline passed")
+        with self._browser.lock:
+            if self._browser.current != self.handle:
+                self._driver.switch_to.window(self.handle)
+                self._browser.current = self.handle
+            return fn(*args)
+
+    def abandon(self):
+        """
+        Close the tab from outside the WebDriver session, so a command stuck
+        on it fails instead of holding the browser's lock. Safe from any thread.
+        """
+        self.abandoned = True
+        self.deadline = 0.0
+        if not self._browser.debugger:
+            return
+        try:
+            urllib.request.urlopen(
+                f"http://{self._browser.debugger}/json/close/{self.handle}", timeout=5
+            ).close()
+        except Exception as e:
+            print(f"[tabs] Abandoning tab failed: {e}", file=sys.stderr)
+
+    def get(self, url: str, poll: float = 0.1):
+        self._run(self._driver.execute_script, _NAVIGATE_JS, url)
+        while self._run(self._driver.execute_script, _READY_STATE_JS) == "loading":
+            time.sleep(poll)
+
+    def execute_script(self, script: str, *args):
+        return self._run(self._driver.execute_script, script, *args)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        return self._run(self._driver.execute_cdp_cmd, cmd, params)
+
+    def find_elements(self, by: str, value: str):
+        # Elements are only usable while this tab is current: hold
+        # ``exclusive`` for as long as they are in use.
+        return self._run(self._driver.find_elements, by, value)
+
+    @property
+    def page_source(self) -> str:
+        return self._run(lambda: self._driver.page_source)
+
+    @property
+    def current_url(self) -> str:
+        return self._run(lambda: self._driver.current_url)
+
+
+class TabPool:
+    def __init__(
+        self,
+        launch,
+        browsers: int,
+        tabs_per_browser: int,
+        tab_timeout: float = 60.0,
+        max_tabs: int = 200,
+        max_age: float = 1800.0,
+    ):
+        self._launch = launch
+        self.browsers = browsers
+        self.tabs_per_browser = tabs_per_browser
+        self.tab_timeout = tab_timeout
+        self.max_tabs = max_tabs
+        self.max_age = max_age
+
+        self._cond = threading.Condition()
+        self._open: list[_Browser] = []
+        self._launching = 0
+        self._closed = False
+        self._contexts = True  # until Chromium refuses one
+
+        self.launches = 0
+        self.recycles = 0
+        self.leases = 0
+        self.failures = 0
+
+    # -- leasing ------------------------------------------------------------
+    @contextmanager
+    def lease(self, timeout: float | None = None):
+        """Borrow a fresh tab; it is closed on exit."""
+        browser = self._acquire(timeout)
+        try:
+            tab = self._open_tab(browser)
+        except Exception:
+            self._release(browser, failed=True)
+            raise
+        try:
+            yield tab
+        finally:
+            self._release(browser, failed=not self._close_tab(browser, tab))
+
+    def _acquire(self, timeout: float | None) -> _Browser:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("tab pool is closed")
+                self._retire_expired()
+                usable = [
+                    b for b in self._open if not b.retired and b.tabs < self.tabs_per_browser
+                ]
+                if usable:
+                    browser = min(usable, key=lambda b: b.tabs)
+                    browser.tabs += 1
+                    browser.served += 1
+                    self.leases += 1
+                    return browser
+                live = sum(not b.retired for b in self._open)
+                if live + self._launching < self.browsers:
+                    self._launching += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("no tab available")
+                self._cond.wait(remaining)
+
+        try:
+            browser = _Browser(self._launch())
+        except Exception:
+            with self._cond:
+                self._launching -= 1
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            self._launching -= 1
+            self.launches += 1
+            browser.tabs = browser.served = 1
+            self.leases += 1
+            self._open.append(browser)
+            self._cond.notify_all()
+        return browser
+
+    def _release(self, browser: _Browser, failed: bool = False):
+        with self._cond:
+            browser.tabs -= 1
+            if failed:
+                self.failures += 1
+                browser.retired = True
+            # (a closed pool has already dropped and quit its browsers)
+            done = browser.retired and browser.tabs == 0 and browser in self._open
+            if done:
+                self._open.remove(browser)
+                self.recycles += 1
+            self._cond.notify_all()
+        if done:
+            _quit(browser.driver)
+
+    def _retire_expired(self):
+        """Retire expired browsers, quitting those with no tabs open (under _cond)."""
+        for browser in list(self._open):
+            if not browser.retired and self._expired(browser):
+                browser.retired = True
+            if browser.retired and browser.tabs == 0:
+                self._open.remove(browser)
+                self.recycles += 1
+                # Quit off the lock's critical path; nothing else holds it
+                threading.Thread(target=_quit, args=(browser.driver,), daemon=True).start()
+
+    def _expired(self, browser: _Browser) -> bool:
+        return (
+            browser.served >= self.max_tabs
+            or time.monotonic() - browser.created >= self.max_age
+        )
+
+    # -- tabs -----------------------------------------------------------------
+    def _open_tab(self, browser: _Browser) -> Tab:
+        driver = browser.driver
+        with browser.lock:
+            context = None
+            if self._contexts:
+                try:
+                    context = driver.execute_cdp_cmd("Target.createBrowserContext", {})[
+                        "browserContextId"
+                    ]
+                    handle = driver.execute_cdp_cmd(
+                        "Target.createTarget",
+                        {"url": "about:blank", "browserContextId": context},
+                    )["targetId"]
+                    driver.switch_to.window(handle)
+                except Exception as e:
+                    print(f"[tabs] Browser contexts unavailable, using plain tabs: {e}", file=sys.stderr)
+                    self._contexts = False
+                    if context:
+                        self._dispose(driver, context)
+                    context = None
+            if context is None:
+                driver.switch_to.new_window("tab")
+                handle = driver.current_window_handle
+            browser.current = handle
+        return Tab(browser, handle, context, time.monotonic() + self.tab_timeout)
+
+    def _close_tab(self, browser: _Browser, tab: Tab) -> bool:
+        driver = browser.driver
+        with browser.lock:
+            try:
+                if not tab.abandoned:  # else the window is already gone
+                    driver.switch_to.window(tab.handle)
+                    driver.close()
+                driver.switch_to.window(browser.home)
+                browser.current = browser.home
+                if tab.context:
+                    self._dispose(driver, tab.context)
+                return True
+            except Exception as e:
+                print(f"[tabs] Closing tab failed: {e}", file=sys.stderr)
+                return False
+
+    @staticmethod
+    def _dispose(driver, context: str):
+        try:
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context})
+        except Exception as e:
+            print(f"[tabs] Disposing context failed: {e}", file=sys.stderr)
+
+    # -- lifecycle ------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "browsers": len(self._open),
+                "max_browsers": self.browsers,
+                "tabs_per_browser": self.tabs_per_browser,
+                "open_tabs": sum(b.tabs for b in self._open),
+                "contexts": self._contexts,
+                "leases": self.leases,
+                "launches": self.launches,
+                "recycles": self.recycles,
+                "failures": self.failures,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            browsers, self._open = self._open, []
+            self._cond.notify_all()
+        for browser in browsers:
+            _quit(browser.driver)
@@ -0,0 +1,95 @@
+"""
+Result-page walking for the platform scrapers in this directory.
+
+Selectors, wait policies, card extraction and the per-platform finishers
+live in scraper/extract.py, shared with the API, and are re-exported here.
+
+``scrape_pages`` walks numbered result pages in one browser, deduping on
+URL, until enough jobs are collected or a page adds nothing new. Given the
+URLs a previous run returned (``known``), it loads cards a few at a time
+and stops at the first known one, since results are newest first; for
+boards that can't sort by date (``newest_first=False``) it skips known
+cards instead, paging on past pages of known listings.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scraper"))
+
+from extract import (  # noqa: E402,F401
+    SELECTORS,
+    WAIT_POLICIES,
+    extract_cards,
+    extract_cards_bulk,
+    extract_cards_per_element,
+    finish_linkedin,
+    finish_naukri,
+    wait_for_cards,
+)
+
+# Cards per result page; waits on platforms without "see more" stop there.
+PAGE_SIZES = {"linkedin": 25, "naukri": 20, "indeed": 10}
+MAX_PAGES = int(os.getenv("MAX_PAGES", "20"))
+INCREMENTAL_STEP = int(os.getenv("INCREMENTAL_STEP", "5"))
+
+
+def _load_page(driver, platform: str, target: int, limit: int, finish, known, newest_first):
+    """Wait for and extract one page's cards, in small steps when stopping at ``known``."""
+    if not known or not newest_first:
+        count, waited = wait_for_cards(driver, platform, target)
+        return count, waited, finish(extract_cards(driver, platform, limit))
+
+    want, waited = 0, 0.0
+    while True:
+        want = min(target, want + INCREMENTAL_STEP)
+        count, step_waited = wait_for_cards(driver, platform, want)
+        waited += step_waited
+        jobs = finish(extract_cards(driver, platform, want))
+        if count < want or want >= target or any(j["url"] in known for j in jobs):
+            return count, waited, jobs
+
+
+def scrape_pages(
+    driver, platform: str, page_url, finish, max_jobs: int, known=None, newest_first=True
+) -> list[dict]:
+    """
+    Collect up to ``max_jobs`` unique jobs across result pages in one browser.
+    ``page_url(page, offset)`` builds each page's URL, where ``offset`` is the
+    number of unique jobs so far; ``finish`` post-processes extracted cards.
+    With ``known`` URLs, only jobs listed before the first known one are kept,
+    or, unless ``newest_first``, every job that isn't known.
+    """
+    jobs, seen = [], set()
+    known = known or set()
+    # Skipped known cards don't count towards max_jobs, so read past them
+    limit = max_jobs if newest_first else max_jobs + len(known)
+
+    for page in range(MAX_PAGES):
+        offset = len(jobs)
+        driver.get(page_url(page, offset))
+        target = limit - offset
+        if "more" not in SELECTORS[platform]:
+            target = min(target, PAGE_SIZES[platform])
+
+        count, waited, batch = _load_page(
+            driver, platform, target, limit, finish, known, newest_first
+        )
+        print(f"[{platform}] page {page + 1}: {count} cards after {waited:.1f}s wait", file=sys.stderr)
+
+        added, reached = 0, False
+        for job in batch:
+            if job["url"] in known:
+                reached = True
+                if newest_first:
+                    break
+                continue
+            if job["url"] and job["url"] not in seen:
+                seen.add(job["url"])
+                jobs.append(job)
+                added += 1
+        # Without a date sort, a page of known listings may come before new ones
+        if (reached and newest_first) or not (added or reached) or len(jobs) >= max_jobs:
+            break
+
+    return jobs[:max_jobs]
@@ -5,6 +5,18 @@ Outputs strict JSON to stdout for n8n integration.
 Usage:
     python3 scrape_all.py "AI Developer" "Bangalore"
     python3 scrape_all.py "React Engineer" "Remote" 5
+    python3 scrape_all.py "AI Developer" "Bangalore" 25 --new   # only jobs new since last --new run
+
+Batch mode — one JSONL query per line from a file or stdin, one JSONL result
+per line on stdout as each query finishes (in completion order, tagged with
+the input line's "index"). Each platform gets --query-workers workers, and
+each worker keeps one browser open across all of its queries:
+    python3 scrape_all.py --batch queries.jsonl
+    cat queries.jsonl | python3 scrape_all.py --batch - --query-workers 2 --platform-workers 1
+
+    {"title": "AI Developer", "location": "Bangalore"}
+    {"title": "Data Engineer", "location": "Pune", "max_per_platform": 20,
+     "platforms": ["linkedin", "naukri"], "new": true}
 
 Output format:
 {
@@ -16,7 +28,11 @@ Output format:
       "company": "TCS",
       "location": "Bangalore",
       "url": "https://...",
-      "source": "linkedin"
+      "source": "linkedin",
+      "sources": [
+        { "source": "linkedin", "url": "https://..." },
+        { "source": "naukri", "url": "https://..." }
+      ]
     },
     ...
   ]
@@ -26,29 +42,40 @@ Install:
     pip install seleniumbase
 """
 
+import argparse
 import json
+import os
+import queue
 import sys
+import threading
+import time
 import concurrent.futures
 
+from session import healthy, launch
+from watermarks import describe, split_flag, watermark
 from scrape_jobs import scrape_linkedin
 from scrape_indeed import scrape_indeed
 from scrape_naukri import scrape_naukri
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scraper"))
 
-def scrape_all_platforms(job_title, location, max_per_platform=10):
-    all_jobs = []
+from dedupe import dedupe_jobs  # noqa: E402
+
+SCRAPERS = {
+    "linkedin": scrape_linkedin,
+    "indeed": scrape_indeed,
+    "naukri": scrape_naukri,
+}
 
-    scrapers = [
-        ("linkedin", scrape_linkedin),
-        ("indeed", scrape_indeed),
-        ("naukri", scrape_naukri),
-    ]
+
+def scrape_all_platforms(job_title, location, max_per_platform=10, incremental=False):
+    all_jobs = []
 
     # Run scrapers in parallel for speed
     with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
         future_to_platform = {}
-        for name, func in scrapers:
-            future = executor.submit(func, job_title, location, max_per_platform)
+        for name, func in SCRAPERS.items():
+            future = executor.submit(func, job_title, location, max_per_platform, incremental)
             future_to_platform[future] = name
 
         for future in concurrent.futures.as_completed(future_to_platform):
@@ -60,22 +87,13 @@ def scrape_all_platforms(job_title, location, max_per_platform=10):
             except Exception as e:
                 print(f"[{platform}] Failed: {e}", file=sys.stderr)
 
-    return all_jobs
+    # The same posting is often on several boards; merge those into one record
+    merged = dedupe_jobs(all_jobs)
+    print(f"[dedupe] {len(all_jobs)} jobs -> {len(merged)} unique", file=sys.stderr)
+    return merged
 
 
-def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({
-            "error": "Usage: python3 scrape_all.py <job_title> <location> [max_per_platform]"
-        }))
-        sys.exit(1)
-
-    job_title = sys.argv[1]
-    location = sys.argv[2]
-    max_per_platform = int(sys.argv[3]) if len(sys.argv) > 3 else 10
-
-    jobs = scrape_all_platforms(job_title, location, max_per_platform)
-
+def build_output(job_title, location, jobs, incremental=False, platforms=SCRAPERS):
     output = {
         "query": {
             "title": job_title,
@@ -84,6 +102,187 @@ def main():
         "total_found": len(jobs),
         "jobs": jobs,
     }
+    if incremental:
+        output["watermarks"] = {
+            platform: describe(watermark(platform, job_title, location))
+            for platform in platforms
+        }
+    return output
+
+
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+class BatchQuery:
+    """One input line, fanned out to its platforms' workers."""
+
+    def __init__(self, index, spec, max_per_platform, incremental, platform_workers):
+        self.index = index
+        self.title = spec["title"]
+        self.location = spec["location"]
+        self.max_jobs = int(spec.get("max_per_platform", max_per_platform))
+        self.incremental = bool(spec.get("new", incremental))
+        self.platforms = spec.get("platforms") or list(SCRAPERS)
+        unknown = [p for p in self.platforms if p not in SCRAPERS]
+        if unknown:
+            raise ValueError(f"unknown platforms: {', '.join(unknown)}")
+
+        self.results = {}
+        self.slots = threading.Semaphore(platform_workers)
+        self._remaining = len(self.platforms)
+        self._lock = threading.Lock()
+
+    def record(self, platform, jobs, elapsed, error=""):
+        """Store one platform's result; returns True once every platform is in."""
+        with self._lock:
+            self.results[platform] = {"jobs": jobs, "elapsed": elapsed, "error": error}
+            self._remaining -= 1
+            return self._remaining == 0
+
+    def output(self):
+        jobs = dedupe_jobs([j for p in self.platforms for j in self.results[p]["jobs"]])
+        output = build_output(self.title, self.location, jobs, self.incremental, self.platforms)
+        output["index"] = self.index
+        output["platforms"] = {
+            p: {
+                "count": len(self.results[p]["jobs"]),
+                "elapsed": round(self.results[p]["elapsed"], 2),
+                "error": self.results[p]["error"],
+            }
+            for p in self.platforms
+        }
+        return output
+
+
+def _read_lines(path):
+    stream = sys.stdin if path == "-" else open(path)
+    with stream:
+        for index, line in enumerate(stream):
+            if line.strip():
+                yield index, line
+
+
+def run_batch(path, query_workers=2, platform_workers=3, max_per_platform=10,
+              incremental=False, out=sys.stdout):
+    """
+    Scrape every query in the JSONL file at ``path`` ("-" for stdin).
+    At most ``query_workers`` queries are in flight, each platform has that
+    many workers with one long-lived browser each, and at most
+    ``platform_workers`` platforms of a query scrape at the same time.
+    """
+    queues = {platform: queue.Queue() for platform in SCRAPERS}
+    in_flight = threading.BoundedSemaphore(query_workers)
+    out_lock = threading.Lock()
+
+    def emit(record):
+        with out_lock:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+    def worker(platform):
+        driver = None
+        try:
+            while True:
+                query = queues[platform].get()
+                if query is None:
+                    return
+
+                started = time.monotonic()
+                jobs, error = [], ""
+                try:
+                    if driver is None or not healthy(driver):
+                        if driver is not None:
+                            print(f"[{platform}] Browser unhealthy, relaunching", file=sys.stderr)
+                            driver.quit()
+                        driver = None
+                        driver = launch()
+                    with query.slots:
+                        jobs = SCRAPERS[platform](
+                            query.title, query.location, query.max_jobs, query.incremental, driver
+                        )
+                except Exception as e:
+                    print(f"[{platform}] Failed: {e}", file=sys.stderr)
+                    error = str(e)
+
+                print(f"[{platform}] Query {query.index}: {len(jobs)} jobs", file=sys.stderr)
+                if query.record(platform, jobs, time.monotonic() - started, error):
+                    emit(query.output())
+                    in_flight.release()
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    threads = [
+        threading.Thread(target=worker, args=(platform,), daemon=True)
+        for platform in SCRAPERS
+        for _ in range(query_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    for index, line in _read_lines(path):
+        try:
+            query = BatchQuery(
+                index, json.loads(line), max_per_platform, incremental, platform_workers
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            emit({"index": index, "error": f"Invalid query: {e}"})
+            continue
+        in_flight.acquire()
+        for platform in query.platforms:
+            queues[platform].put(query)
+
+    for platform in SCRAPERS:
+        for _ in range(query_workers):
+            queues[platform].put(None)
+    for thread in threads:
+        thread.join()
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="scrape_all.py", description="Scrape many queries with long-lived browsers."
+    )
+    parser.add_argument("--batch", required=True, metavar="FILE", help='JSONL queries, or "-" for stdin')
+    parser.add_argument(
+        "--query-workers", type=int, default=int(os.getenv("BATCH_QUERY_WORKERS", "2")),
+        help="Queries in flight at once; also browsers per platform",
+    )
+    parser.add_argument(
+        "--platform-workers", type=int, default=len(SCRAPERS),
+        help="Platforms of one query scraped at the same time",
+    )
+    parser.add_argument("--max-per-platform", type=int, default=10)
+    parser.add_argument("--new", action="store_true", help="Incremental mode for every query")
+    args = parser.parse_args(argv)
+
+    run_batch(
+        args.batch,
+        query_workers=max(1, args.query_workers),
+        platform_workers=max(1, args.platform_workers),
+        max_per_platform=args.max_per_platform,
+        incremental=args.new,
+    )
+
+
+def main():
+    if "--batch" in sys.argv:
+        batch_main(sys.argv[1:])
+        return
+
+    argv, incremental = split_flag(sys.argv)
+    if len(argv) < 3:
+        print(json.dumps({
+            "error": "Usage: python3 scrape_all.py <job_title> <location> [max_per_platform] [--new]"
+        }))
+        sys.exit(1)
+
+    job_title = argv[1]
+    location = argv[2]
+    max_per_platform = int(argv[3]) if len(argv) > 3 else 10
+
+    jobs = scrape_all_platforms(job_title, location, max_per_platform, incremental)
+    output = build_output(job_title, location, jobs, incremental)
 
     # Strict JSON to stdout
     print(json.dumps(output, indent=2, ensure_ascii=False))
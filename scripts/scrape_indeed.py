@@ -4,80 +4,68 @@ Outputs strict JSON to stdout for n8n integration.
 
 Usage:
     python3 scrape_indeed.py "AI Developer" "Bangalore"
+    python3 scrape_indeed.py "AI Developer" "Bangalore" 25 --new   # only jobs new since last --new run
 
 Install:
     pip install seleniumbase
 """
 
 import json
+import os
 import sys
 import urllib.parse
-from seleniumbase import SB
 
+from extract_cards import PAGE_SIZES, scrape_pages
+from session import browser_session
+from watermarks import advance, describe, known_urls, split_flag, watermark
 
-def build_indeed_url(job_title, location):
-    params = urllib.parse.urlencode({
+# Overridable so benchmarks can point the scraper at a local fake board.
+INDEED_URL = os.getenv("INDEED_URL", "https://www.indeed.com").rstrip("/")
+
+
+def build_indeed_url(job_title, location, page=0, newest=False):
+    query = {
         "q": job_title,
         "l": location,
-    })
-    return f"https://www.indeed.com/jobs?{params}"
+    }
+    if newest:
+        query["sort"] = "date"
+    # Indeed pages in steps of 10 regardless of how many cards it renders
+    if page:
+        query["start"] = page * PAGE_SIZES["indeed"]
+    params = urllib.parse.urlencode(query)
+    return f"{INDEED_URL}/jobs?{params}"
+
+
+def finish_indeed(cards):
+    jobs = []
+    for job in cards:
+        href = job["url"]
+        if href and not href.startswith("http"):
+            job["url"] = INDEED_URL + href
+        job["source"] = "indeed"
+
+        if job["title"]:
+            jobs.append(job)
+    return jobs
 
 
-def scrape_indeed(job_title, location, max_jobs=10):
+def scrape_indeed(job_title, location, max_jobs=10, incremental=False, driver=None):
     jobs = []
-    url = build_indeed_url(job_title, location)
+    known = known_urls("indeed", job_title, location) if incremental else None
 
     try:
-        with SB(uc=True, headless=True) as sb:
-            sb.open(url)
-            sb.sleep(3)
-
-            # Scroll to load content
-            for _ in range(3):
-                sb.execute_script("window.scrollBy(0, 600);")
-                sb.sleep(1)
-
-            cards = sb.find_elements("css selector", ".job_seen_beacon, .resultContent")
-
-            for card in cards[:max_jobs]:
-                job = {}
-                try:
-                    title_el = card.find_element("css selector", "h2.jobTitle a, .jobTitle span")
-                    job["title"] = title_el.text.strip()
-                except Exception:
-                    job["title"] = ""
-
-                try:
-                    company_el = card.find_element("css selector", "[data-testid='company-name'], .companyName")
-                    job["company"] = company_el.text.strip()
-                except Exception:
-                    job["company"] = ""
-
-                try:
-                    location_el = card.find_element("css selector", "[data-testid='text-location'], .companyLocation")
-                    job["location"] = location_el.text.strip()
-                except Exception:
-                    job["location"] = ""
-
-                try:
-                    link_el = card.find_element("css selector", "h2.jobTitle a, a.jcs-JobTitle")
-                    href = link_el.get_attribute("href")
-                    if href and not href.startswith("http"):
-                        href = "https://www.indeed.com" + href
-                    job["url"] = href
-                except Exception:
-                    job["url"] = ""
-
-                try:
-                    snippet_el = card.find_element("css selector", ".job-snippet, [data-testid='job-snippet']")
-                    job["snippet"] = snippet_el.text.strip()
-                except Exception:
-                    job["snippet"] = ""
-
-                job["source"] = "indeed"
-
-                if job["title"]:
-                    jobs.append(job)
+        with browser_session(driver) as browser:
+            jobs = scrape_pages(
+                browser,
+                "indeed",
+                lambda page, offset: build_indeed_url(job_title, location, page, incremental),
+                finish_indeed,
+                max_jobs,
+                known,
+            )
+        if incremental:
+            advance("indeed", job_title, location, jobs)
 
     except Exception as e:
         print(f"Scraper error: {e}", file=sys.stderr)
@@ -86,15 +74,19 @@ def scrape_indeed(job_title, location, max_jobs=10):
 
 
 def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: python3 scrape_indeed.py <job_title> <location>"}))
+    argv, incremental = split_flag(sys.argv)
+    if len(argv) < 3:
+        print(json.dumps({"error": "Usage: python3 scrape_indeed.py <job_title> <location> [max_jobs] [--new]"}))
         sys.exit(1)
 
-    job_title = sys.argv[1]
-    location = sys.argv[2]
-    max_jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    job_title = argv[1]
+    location = argv[2]
+    max_jobs = int(argv[3]) if len(argv) > 3 else 10
 
-    results = scrape_indeed(job_title, location, max_jobs)
+    results = scrape_indeed(job_title, location, max_jobs, incremental)
+    if incremental:
+        mark = watermark("indeed", job_title, location)
+        results = {"jobs": results, "watermark": describe(mark)}
     print(json.dumps(results, indent=2, ensure_ascii=False))
 
 
@@ -5,81 +5,55 @@ Outputs strict JSON to stdout for n8n integration.
 Usage:
     python3 scrape_jobs.py "AI Developer" "Bangalore"
     python3 scrape_jobs.py "React Engineer" "Remote"
+    python3 scrape_jobs.py "AI Developer" "Bangalore" 25 --new   # only jobs new since last --new run
 
 Install:
     pip install seleniumbase
 """
 
 import json
+import os
 import sys
-import time
 import urllib.parse
-from seleniumbase import SB
 
+from extract_cards import finish_linkedin, scrape_pages
+from session import browser_session
+from watermarks import advance, describe, known_urls, split_flag, watermark
 
-def build_linkedin_url(job_title, location):
-    params = urllib.parse.urlencode({
+# Overridable so benchmarks can point the scraper at a local fake board.
+LINKEDIN_URL = os.getenv("LINKEDIN_URL", "https://www.linkedin.com").rstrip("/")
+
+
+def build_linkedin_url(job_title, location, start=0, newest=False):
+    query = {
         "keywords": job_title,
         "location": location,
-    })
-    return f"https://www.linkedin.com/jobs/search/?{params}"
+    }
+    if newest:
+        query["sortBy"] = "DD"  # date posted, newest first
+    if start:
+        query["start"] = start
+    params = urllib.parse.urlencode(query)
+    return f"{LINKEDIN_URL}/jobs/search/?{params}"
 
 
-def scrape_linkedin(job_title, location, max_jobs=10):
+def scrape_linkedin(job_title, location, max_jobs=10, incremental=False, driver=None):
     jobs = []
-    url = build_linkedin_url(job_title, location)
+    known = known_urls("linkedin", job_title, location) if incremental else None
 
     try:
-        with SB(uc=True, headless=True) as sb:
-            sb.open(url)
-            # Wait for job cards to load
-            sb.sleep(3)
-
-            # Scroll down to load more listings
-            for _ in range(3):
-                sb.execute_script("window.scrollBy(0, 800);")
-                sb.sleep(1)
-
-            # LinkedIn public job search selectors
-            cards = sb.find_elements("css selector", ".base-card")
-
-            for card in cards[:max_jobs]:
-                job = {}
-                try:
-                    title_el = card.find_element("css selector", ".base-search-card__title")
-                    job["title"] = title_el.text.strip()
-                except Exception:
-                    job["title"] = ""
-
-                try:
-                    company_el = card.find_element("css selector", ".base-search-card__subtitle")
-                    job["company"] = company_el.text.strip()
-                except Exception:
-                    job["company"] = ""
-
-                try:
-                    location_el = card.find_element("css selector", ".job-search-card__location")
-                    job["location"] = location_el.text.strip()
-                except Exception:
-                    job["location"] = ""
-
-                try:
-                    link_el = card.find_element("css selector", "a.base-card__full-link")
-                    job["url"] = link_el.get_attribute("href").split("?")[0]
-                except Exception:
-                    job["url"] = ""
-
-                try:
-                    time_el = card.find_element("css selector", "time")
-                    job["posted"] = time_el.get_attribute("datetime") or time_el.text.strip()
-                except Exception:
-                    job["posted"] = ""
-
-                job["source"] = "linkedin"
-
-                # Only include if we got at least a title
-                if job["title"]:
-                    jobs.append(job)
+        with browser_session(driver) as browser:
+            # Pages past the first use start=<jobs so far>, all in this browser
+            jobs = scrape_pages(
+                browser,
+                "linkedin",
+                lambda page, offset: build_linkedin_url(job_title, location, offset, incremental),
+                finish_linkedin,
+                max_jobs,
+                known,
+            )
+        if incremental:
+            advance("linkedin", job_title, location, jobs)
 
     except Exception as e:
         # Log error to stderr, keep stdout clean for JSON
@@ -89,15 +63,19 @@ def scrape_linkedin(job_title, location, max_jobs=10):
 
 
 def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: python3 scrape_jobs.py <job_title> <location>"}))
+    argv, incremental = split_flag(sys.argv)
+    if len(argv) < 3:
+        print(json.dumps({"error": "Usage: python3 scrape_jobs.py <job_title> <location> [max_jobs] [--new]"}))
         sys.exit(1)
 
-    job_title = sys.argv[1]
-    location = sys.argv[2]
-    max_jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    job_title = argv[1]
+    location = argv[2]
+    max_jobs = int(argv[3]) if len(argv) > 3 else 10
 
-    results = scrape_linkedin(job_title, location, max_jobs)
+    results = scrape_linkedin(job_title, location, max_jobs, incremental)
+    if incremental:
+        mark = watermark("linkedin", job_title, location)
+        results = {"jobs": results, "watermark": describe(mark)}
 
     # Strict JSON output — nothing else to stdout
     print(json.dumps(results, indent=2, ensure_ascii=False))
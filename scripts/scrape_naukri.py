@@ -4,77 +4,49 @@ Outputs strict JSON to stdout for n8n integration.
 
 Usage:
     python3 scrape_naukri.py "AI Developer" "Bangalore"
+    python3 scrape_naukri.py "AI Developer" "Bangalore" 25 --new   # only jobs new since last --new run
 
 Install:
     pip install seleniumbase
 """
 
 import json
+import os
 import sys
-import urllib.parse
-from seleniumbase import SB
 
+from extract_cards import finish_naukri, scrape_pages
+from session import browser_session
+from watermarks import advance, describe, known_urls, split_flag, watermark
 
-def build_naukri_url(job_title, location):
-    # Naukri uses dash-separated keywords in URL
+# Overridable so benchmarks can point the scraper at a local fake board.
+NAUKRI_URL = os.getenv("NAUKRI_URL", "https://www.naukri.com").rstrip("/")
+
+
+def build_naukri_url(job_title, location, page=0):
+    # Naukri uses dash-separated keywords in URL, and "-2", "-3"... for later pages
     title_slug = job_title.lower().replace(" ", "-")
     location_slug = location.lower().replace(" ", "-")
-    return f"https://www.naukri.com/{title_slug}-jobs-in-{location_slug}"
+    suffix = f"-{page + 1}" if page else ""
+    return f"{NAUKRI_URL}/{title_slug}-jobs-in-{location_slug}{suffix}"
 
 
-def scrape_naukri(job_title, location, max_jobs=10):
+def scrape_naukri(job_title, location, max_jobs=10, incremental=False, driver=None):
     jobs = []
-    url = build_naukri_url(job_title, location)
+    known = known_urls("naukri", job_title, location) if incremental else None
 
     try:
-        with SB(uc=True, headless=True) as sb:
-            sb.open(url)
-            sb.sleep(3)
-
-            for _ in range(3):
-                sb.execute_script("window.scrollBy(0, 600);")
-                sb.sleep(1)
-
-            cards = sb.find_elements("css selector", ".srp-jobtuple-wrapper, .jobTuple")
-
-            for card in cards[:max_jobs]:
-                job = {}
-                try:
-                    title_el = card.find_element("css selector", ".title, a.title")
-                    job["title"] = title_el.text.strip()
-                    job["url"] = title_el.get_attribute("href") or ""
-                except Exception:
-                    job["title"] = ""
-                    job["url"] = ""
-
-                try:
-                    company_el = card.find_element("css selector", ".comp-name, .subTitle a")
-                    job["company"] = company_el.text.strip()
-                except Exception:
-                    job["company"] = ""
-
-                try:
-                    location_el = card.find_element("css selector", ".locWdth, .loc-wrap .loc")
-                    job["location"] = location_el.text.strip()
-                except Exception:
-                    job["location"] = ""
-
-                try:
-                    exp_el = card.find_element("css selector", ".exp-wrap .expwdth, .experience")
-                    job["experience"] = exp_el.text.strip()
-                except Exception:
-                    job["experience"] = ""
-
-                try:
-                    salary_el = card.find_element("css selector", ".sal-wrap .salwdth, .salary")
-                    job["salary"] = salary_el.text.strip()
-                except Exception:
-                    job["salary"] = ""
-
-                job["source"] = "naukri"
-
-                if job["title"]:
-                    jobs.append(job)
+        with browser_session(driver) as browser:
+            jobs = scrape_pages(
+                browser,
+                "naukri",
+                lambda page, offset: build_naukri_url(job_title, location, page),
+                finish_naukri,
+                max_jobs,
+                known,
+                newest_first=False,  # Naukri's URLs can't sort by date
+            )
+        if incremental:
+            advance("naukri", job_title, location, jobs)
 
     except Exception as e:
         print(f"Scraper error: {e}", file=sys.stderr)
@@ -83,15 +55,19 @@ def scrape_naukri(job_title, location, max_jobs=10):
 
 
 def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({"error": "Usage: python3 scrape_naukri.py <job_title> <location>"}))
+    argv, incremental = split_flag(sys.argv)
+    if len(argv) < 3:
+        print(json.dumps({"error": "Usage: python3 scrape_naukri.py <job_title> <location> [max_jobs] [--new]"}))
         sys.exit(1)
 
-    job_title = sys.argv[1]
-    location = sys.argv[2]
-    max_jobs = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    job_title = argv[1]
+    location = argv[2]
+    max_jobs = int(argv[3]) if len(argv) > 3 else 10
 
-    results = scrape_naukri(job_title, location, max_jobs)
+    results = scrape_naukri(job_title, location, max_jobs, incremental)
+    if incremental:
+        mark = watermark("naukri", job_title, location)
+        results = {"jobs": results, "watermark": describe(mark)}
     print(json.dumps(results, indent=2, ensure_ascii=False))
 
 
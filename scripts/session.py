@@ -0,0 +1,34 @@
+"""
+Browser sessions for the scrapers in this directory.
+
+A single run opens a fresh SeleniumBase UC browser per scrape. Batch runs
+(scrape_all.py --batch) launch one long-lived driver per worker instead and
+pass it in, so each worker pays the Chromium cold start once for all of its
+queries.
+"""
+
+from contextlib import contextmanager
+
+
+def launch():
+    from seleniumbase import Driver
+    return Driver(uc=True, headless=True)
+
+
+def healthy(driver):
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+@contextmanager
+def browser_session(driver=None):
+    """Yield ``driver`` if given, else a fresh browser closed on exit."""
+    if driver is not None:
+        yield driver
+        return
+
+    from seleniumbase import SB
+    with SB(uc=True, headless=True) as sb:
+        yield sb.driver
@@ -0,0 +1,83 @@
+"""
+"New since last run" state for the scrapers in this directory.
+
+A JSON file (SCRAPER_STATE, default .scraper_state.json) remembers, per
+platform and query, the most recent URLs a run returned and the newest
+posted date seen (as YYYY-MM-DD, so "3 Days Ago" and ISO dates compare).
+Incremental runs stop at the first remembered URL (or, on boards without a
+date sort, skip remembered URLs) and then record what they found, so the
+next run only pays for the delta.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scraper"))
+
+from fields import posted_date  # noqa: E402
+
+STATE_PATH = os.getenv("SCRAPER_STATE", ".scraper_state.json")
+KNOWN_URLS = 200
+
+_lock = threading.Lock()  # scrape_all.py runs platforms in threads
+
+
+def _key(platform, job_title, location):
+    return "|".join([platform, " ".join(job_title.lower().split()), " ".join(location.lower().split())])
+
+
+def _load():
+    try:
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def watermark(platform, job_title, location):
+    with _lock:
+        return _load().get(_key(platform, job_title, location))
+
+
+def known_urls(platform, job_title, location):
+    mark = watermark(platform, job_title, location)
+    return set(mark["urls"]) if mark else set()
+
+
+def advance(platform, job_title, location, jobs):
+    """Remember ``jobs`` (newest first) for the query and return the new watermark."""
+    key = _key(platform, job_title, location)
+    with _lock:
+        state = _load()
+        mark = state.get(key) or {"urls": [], "posted": ""}
+        urls = [job["url"] for job in jobs if job.get("url")]
+        fresh = set(urls)
+        urls += [url for url in mark["urls"] if url not in fresh]
+        state[key] = {
+            "urls": urls[:KNOWN_URLS],
+            "posted": max([
+                posted_date({"posted": mark["posted"]}), *(posted_date(job) for job in jobs)
+            ]),
+            "updated": time.time(),
+        }
+        tmp = f"{STATE_PATH}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, STATE_PATH)
+        return state[key]
+
+
+def describe(mark):
+    """The watermark as reported in script output, without the URL list."""
+    if not mark:
+        return None
+    return {"updated": mark["updated"], "posted": mark["posted"], "known": len(mark["urls"])}
+
+
+def split_flag(argv, flag="--new"):
+    """Return (argv without ``flag``, whether it was present)."""
+    args = [a for a in argv if a != flag]
+    return args, len(args) != len(argv)
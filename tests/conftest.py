@@ -0,0 +1,16 @@
+"""
+Tests for the scraper API and the standalone scripts.
+
+Both import their modules flat (``from reaper import Reaper``), so their
+directories go on sys.path here. Run from the repository root:
+
+    pip install -r scraper/requirements-dev.txt
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "..", "scripts"))
+sys.path.insert(0, os.path.join(ROOT, "..", "scraper"))
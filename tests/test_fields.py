@@ -0,0 +1,25 @@
+"""
+Filter parsing in scraper/fields.py.
+"""
+
+import math
+
+import pytest
+
+from fields import parse_exp_range
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2-5", (2.0, 5.0)),
+    ("3", (3.0, 3.0)),
+    ("3-", (3.0, math.inf)),
+    ("-4", (0.0, 4.0)),
+])
+def test_exp_range(text, expected):
+    assert parse_exp_range(text) == expected
+
+
+@pytest.mark.parametrize("text", ["nan", "inf", "2-inf", "nan-3", "1-NaN", "5-2", "x"])
+def test_exp_range_rejects(text):
+    with pytest.raises(ValueError):
+        parse_exp_range(text)
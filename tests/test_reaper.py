@@ -0,0 +1,118 @@
+"""
+Reaper sweeps over a fake /proc.
+"""
+
+import types
+
+import pytest
+
+import reaper
+from reaper import Reaper, driver_pids
+
+API, CHROMEDRIVER, CHROME, RENDERER, OTHER = 100, 200, 300, 301, 400
+UPTIME = 1000.0  # seconds; every fake process started at boot, long past orphan_grace
+
+
+def _uc_driver():
+    """A SeleniumBase UC driver: Chrome launched by the API process, not by chromedriver."""
+    return types.SimpleNamespace(
+        service=types.SimpleNamespace(process=types.SimpleNamespace(pid=CHROMEDRIVER)),
+        browser_pid=CHROME,
+    )
+
+
+@pytest.fixture
+def procs(monkeypatch):
+    """pid -> (ppid, name, state, start ticks, rss MB), as reaper._scan returns."""
+    table = {
+        API: (1, "uvicorn", "S", 0, 80.0),
+        CHROMEDRIVER: (API, "chromedriver", "S", 0, 20.0),
+        CHROME: (API, "chrome", "S", 0, 150.0),
+        RENDERER: (CHROME, "chrome", "S", 0, 100.0),
+        OTHER: (API, "python", "S", 0, 10.0),
+    }
+    monkeypatch.setattr(reaper, "_scan", lambda: dict(table))
+    monkeypatch.setattr(reaper, "_uptime", lambda: UPTIME)
+    return table
+
+
+@pytest.fixture
+def killed(monkeypatch):
+    pids = []
+
+    def kill(pid, sig):
+        pids.append(pid)
+
+    monkeypatch.setattr(reaper.os, "kill", kill)
+    return pids
+
+
+@pytest.fixture
+def supervisor():
+    r = Reaper(orphan_grace=60.0)
+    r.pid = API
+    return r
+
+
+def test_driver_pids_include_uc_browser():
+    assert driver_pids(_uc_driver()) == (CHROMEDRIVER, CHROME)
+    tab = types.SimpleNamespace(browser_driver=_uc_driver())
+    assert driver_pids(tab) == (CHROMEDRIVER, CHROME)
+    assert driver_pids(object()) == ()
+
+
+def test_uc_browser_under_api_is_owned(procs, killed, supervisor):
+    supervisor.track(_uc_driver())
+    assert supervisor.sweep() == []
+    assert killed == []
+    # chromedriver plus the whole Chrome tree
+    assert supervisor.browser_mb == 270.0
+    assert supervisor.rss_mb == 360.0
+
+
+def test_untracked_browser_under_api_is_orphaned(procs, killed, supervisor):
+    events = supervisor.sweep()
+    assert sorted(killed) == [CHROMEDRIVER, CHROME, RENDERER]
+    assert events == [{"reason": "orphan", "pids": killed}]
+
+
+def test_browser_outlives_chromedriver_while_alive(procs, killed, supervisor):
+    supervisor.track(_uc_driver())
+    supervisor.sweep()
+    del procs[CHROMEDRIVER]
+    supervisor.sweep()
+    assert killed == []
+
+
+def test_tree_killed_once_every_root_exits(procs, killed, supervisor):
+    supervisor.track(_uc_driver())
+    supervisor.sweep()
+    del procs[CHROMEDRIVER]
+    del procs[CHROME]
+    procs[RENDERER] = (1, "chrome", "S", 0, 100.0)  # reparented to init
+    events = supervisor.sweep()
+    assert killed == [RENDERER]
+    assert events == [{"reason": "orphan", "pids": [RENDERER]}]
+    assert supervisor.stats()["browsers"] == 0
+
+
+def test_deadline_kills_both_trees(procs, killed, supervisor):
+    supervisor.deadline = 0.0
+    driver = _uc_driver()
+    supervisor.track(driver)
+    with supervisor.lease(driver):
+        events = supervisor.sweep()
+    assert sorted(killed) == [CHROMEDRIVER, CHROME, RENDERER]
+    assert events[0]["reason"] == "deadline"
+
+
+def test_overdue_lease_with_callback_is_not_killed(procs, killed, supervisor):
+    supervisor.deadline = 0.0
+    driver = _uc_driver()
+    supervisor.track(driver)
+    abandoned = []
+    with supervisor.lease(driver, on_overdue=lambda: abandoned.append(1)):
+        supervisor.sweep()
+        supervisor.sweep()
+    assert killed == []
+    assert abandoned == [1]
@@ -0,0 +1,53 @@
+"""
+Watermark dates in scripts/watermarks.py with mixed posted formats.
+"""
+
+import time
+
+import pytest
+
+import watermarks
+
+
+def _day(seconds_ago: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(time.time() - seconds_ago))
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(watermarks, "STATE_PATH", str(tmp_path / "state.json"))
+
+
+def _job(url: str, posted: str) -> dict:
+    return {"url": url, "posted": posted}
+
+
+def test_newest_of_relative_and_iso_dates():
+    mark = watermarks.advance("naukri", "AI Developer", "Bangalore", [
+        _job("https://n/1", "3 Days Ago"),
+        _job("https://n/2", "Just now"),
+        _job("https://n/3", "2020-01-15"),
+        _job("https://n/4", "Few Hours Ago"),
+    ])
+    assert mark["posted"] == _day(0)
+
+
+def test_watermark_never_moves_back():
+    watermarks.advance("linkedin", "AI Developer", "Bangalore", [
+        _job("https://l/1", _day(86400)),
+    ])
+    # Older listings, as text that sorts above an ISO date
+    mark = watermarks.advance("linkedin", "AI Developer", "Bangalore", [
+        _job("https://l/2", "9 Days Ago"),
+        _job("https://l/3", "Posted 30+ days ago"),
+    ])
+    assert mark["posted"] == _day(86400)
+
+
+def test_unparseable_dates_are_ignored():
+    mark = watermarks.advance("indeed", "AI Developer", "Bangalore", [
+        _job("https://i/1", "2020-01-15T10:00:00Z"),
+        _job("https://i/2", "Hiring ongoing"),
+        _job("https://i/3", ""),
+    ])
+    assert mark["posted"] == "2020-01-15"